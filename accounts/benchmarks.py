@@ -0,0 +1,133 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from auditlog.models import LogEntry
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from accounts.serializers import LogsSerializer
+from core.helpers.benchmark import benchmark
+from core.helpers.row_renderer import compile_row_renderer
+from core.renderers import MessagePackRenderer, ORJSONRenderer, msgpack
+
+PAGE_ROWS = 100
+# Run the export benchmarks with a few iterations, e.g. --iterations 5
+EXPORT_ROWS = 100_000
+
+
+def log_entries(count):
+    now = timezone.now()
+    return [
+        LogEntry(
+            id=index,
+            content_type_id=1,
+            object_pk=str(index),
+            object_id=index,
+            object_repr=f"user{index}@test.com",
+            action=LogEntry.Action.UPDATE,
+            changes='{"last_login": ["None", "2024-01-01 00:00:00"]}',
+            actor_id=1,
+            remote_addr="127.0.0.1",
+            timestamp=now,
+        )
+        for index in range(count)
+    ]
+
+
+def log_rows(count):
+    """
+    The entries as the `.values_list()` rows the compiled renderer reads.
+    """
+    renderer = compile_row_renderer(LogsSerializer())
+    attnames = [LogEntry._meta.get_field(lookup).attname for lookup in renderer.lookups]
+    return renderer, [
+        tuple(getattr(entry, attname) for attname in attnames)
+        for entry in log_entries(count)
+    ]
+
+
+@benchmark("logs.render_page")
+def logs_render_page():
+    entries = log_entries(PAGE_ROWS)
+    return lambda: LogsSerializer(entries, many=True).data
+
+
+@benchmark("logs.render_page_compiled")
+def logs_render_page_compiled():
+    renderer, rows = log_rows(PAGE_ROWS)
+    return lambda: renderer.render_rows(rows)
+
+
+@benchmark("logs.render_export")
+def logs_render_export():
+    entries = log_entries(EXPORT_ROWS)
+    return lambda: LogsSerializer(entries, many=True).data
+
+
+@benchmark("logs.render_export_compiled")
+def logs_render_export_compiled():
+    renderer, rows = log_rows(EXPORT_ROWS)
+    return lambda: renderer.render_rows(rows)
+
+
+def user_list_payload(count=PAGE_ROWS):
+    """
+    A users list page as UserSerializer renders it.
+    """
+    return {
+        "count": 25000,
+        "count_strategy": "exact",
+        "next": "https://api.example.com/accounts/users/?page=2&page_size=100",
+        "previous": None,
+        "results": [
+            {
+                "id": index,
+                "groups": [1, 2],
+                "user_permissions": ["view_user", "view_group", "view_logentry"],
+                "otp_devices": ["email", "sms"],
+                "last_login": "2024-01-01T12:00:00.123456Z",
+                "is_superuser": False,
+                "first_name": "Rakan",
+                "last_name": "Farhouda",
+                "is_active": True,
+                "date_joined": "2023-06-01T09:30:00Z",
+                "email": f"user{index}@test.com",
+                "phone_number": f"+90500{index:07}",
+                "avatar": "https://api.example.com/media/avatars/default.png",
+                "enabled_2fa": True,
+                "default_2fa_method": "email",
+                "token_version": 0,
+            }
+            for index in range(count)
+        ],
+    }
+
+
+@benchmark("render.user_list_json")
+def render_user_list_json():
+    """
+    The stock DRF JSON renderer, kept as a baseline.
+    """
+    payload = user_list_payload()
+    return lambda: JSONRenderer().render(payload)
+
+
+@benchmark("render.user_list_orjson")
+def render_user_list_orjson():
+    payload = user_list_payload()
+    return lambda: ORJSONRenderer().render(payload)
+
+
+if msgpack is not None:
+
+    @benchmark("render.user_list_msgpack")
+    def render_user_list_msgpack():
+        payload = user_list_payload()
+        return lambda: MessagePackRenderer().render(payload)
@@ -9,30 +9,51 @@
 
 from auditlog.models import LogEntry
 from django.contrib.auth import get_user_model, password_validation
-from django.contrib.auth.models import BaseUserManager, Group, Permission
+from django.contrib.auth.models import Group, Permission
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
-from core.helpers.email_utils import EmailHelper
-from authentication.helpers.device_helper import get_device_classes
+from core.helpers.permission_utils import (
+    get_group_permission_codenames,
+    get_user_permission_codenames,
+)
+from authentication.helpers.device_helper import device_registry, get_user_otp_devices
 from core.models import UserDevice
 from accounts.models import Profile
 from core.serializers import DynamicFieldsSerializer
 
 
+class UserListSerializer(serializers.ListSerializer):
+    """
+    Loads the permissions and confirmed OTP devices of every listed user with
+    a fixed number of queries, whatever the page size.
+    """
+
+    def to_representation(self, data):
+        users = list(data.all() if hasattr(data, "all") else data)
+        user_ids = [user.pk for user in users]
+        if "user_permissions" in self.child.fields:
+            permissions = get_user_permission_codenames(user_ids)
+            for user in users:
+                user._permission_codenames = permissions[user.pk]
+        if "otp_devices" in self.child.fields:
+            devices = device_registry.get_users_devices(user_ids, confirmed=True)
+            for user in users:
+                user._confirmed_otp_devices = devices.get(user.pk, [])
+        return super().to_representation(users)
+
+
 class UserSerializer(DynamicFieldsSerializer):
     groups = serializers.PrimaryKeyRelatedField(
         many=True, queryset=Group.objects.all(), required=True
     )
-    user_permissions = serializers.ListSerializer(
-        read_only=True, required=False, child=serializers.CharField()
-    )
-    otp_devices = serializers.ListSerializer(
-        read_only=True, required=False, child=serializers.CharField()
-    )
+    user_permissions = serializers.SerializerMethodField()
+    otp_devices = serializers.SerializerMethodField()
 
     class Meta:
         model = get_user_model()
         fields = "__all__"
+        list_serializer_class = UserListSerializer
         extra_kwargs = {
             "password": {"write_only": True, "required": False},
             "is_superuser": {"read_only": True},
@@ -55,48 +76,35 @@ class UserSerializer(DynamicFieldsSerializer):
                     )
         return data
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        all_permissions = self.get_all_permissions(instance)
-        representation["user_permissions"] = list(all_permissions)
-
-        # Retrieve device classes from settings
-        device_classes = get_device_classes()
-
-        # Iterate over device classes and check if the user has a confirmed device
-        confirmed_devices = []
-        for device_type, model in device_classes.items():
-            if model.objects.filter(user=instance, confirmed=True).exists():
-                confirmed_devices.append(device_type)
+    @extend_schema_field(serializers.ListField(child=serializers.CharField()))
+    def get_user_permissions(self, instance):
+        return sorted(self.get_all_permissions(instance))
 
-        # Add confirmed devices to the representation
-        representation["otp_devices"] = confirmed_devices
-        return representation
+    @extend_schema_field(serializers.ListField(child=serializers.CharField()))
+    def get_otp_devices(self, instance):
+        # Loaded for the whole page by UserListSerializer, or in a single
+        # query for this user
+        devices = getattr(instance, "_confirmed_otp_devices", None)
+        if devices is None:
+            devices = get_user_otp_devices(instance, confirmed=True)
+        # The types of the user's confirmed devices
+        return list(dict.fromkeys(device.type for device in devices))
 
     def get_all_permissions(self, instance):
-        # Get permissions directly assigned to the user
-        user_permissions = {
-            permission.codename for permission in instance.user_permissions.all()
-        }
-        # Get permissions assigned to the user via their groups
-        group_permissions = {
-            permission.codename
-            for group in instance.groups.all()
-            for permission in group.permissions.all()
-        }
-        # Merge the two sets to get all unique permissions
-        all_permissions = user_permissions | group_permissions
-        return all_permissions
+        """
+        Returns the codenames of the user's own and group permissions.
+        """
+        codenames = getattr(instance, "_permission_codenames", None)
+        if codenames is None:
+            codenames = get_user_permission_codenames([instance.pk])[instance.pk]
+        return codenames
 
     def create(self, validated_data):
-        auto_password = BaseUserManager.make_random_password(self, length=8)
         groups = validated_data.pop("groups")
-        user = get_user_model().objects.create_user(
-            password=auto_password, **validated_data
-        )
+        # The password is generated when the welcome email is sent
+        user = get_user_model().objects.create_user(password=None, **validated_data)
         user.groups.set(groups)
-        # Assuming you have your email utility function defined somewhere
-        self.send_welcome_email(user, auto_password)
+        self.send_welcome_email(user)
         return user
 
     def update(self, instance, validated_data):
@@ -108,17 +116,10 @@ class UserSerializer(DynamicFieldsSerializer):
         instance.save()
         return instance
 
-    def send_welcome_email(self, user, password):
-        EmailHelper(
-            subject="Welcome to the platform",
-            template_name="emails/welcome.html",
-            context={
-                "name": user.first_name + " " + user.last_name,
-                "email": user.email,
-                "phone_number": user.phone_number,
-                "password": password,
-            },
-        ).send_email(user.email)
+    def send_welcome_email(self, user):
+        from accounts.tasks import send_welcome_email
+
+        send_welcome_email.delay(user.pk)
 
 
 class ChangePasswordSerializer(serializers.Serializer):
@@ -134,17 +135,36 @@ class ChangePasswordSerializer(serializers.Serializer):
         return value
 
 
+class GroupListSerializer(serializers.ListSerializer):
+    """
+    Loads the permission codenames of every listed group in a single query.
+    """
+
+    def to_representation(self, data):
+        groups = list(data.all() if hasattr(data, "all") else data)
+        if "permissions" in self.child.fields:
+            permissions = get_group_permission_codenames([group.pk for group in groups])
+            for group in groups:
+                group._permission_codenames = permissions[group.pk]
+        return super().to_representation(groups)
+
+
 class GroupSerializer(DynamicFieldsSerializer):
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation["permissions"] = [
-            permission.codename for permission in instance.permissions.all()
-        ]
+        if "permissions" in self.fields:
+            codenames = getattr(instance, "_permission_codenames", None)
+            if codenames is None:
+                codenames = get_group_permission_codenames([instance.pk])[instance.pk]
+            representation["permissions"] = codenames
         return representation
 
     class Meta:
         model = Group
         fields = "__all__"
+        list_serializer_class = GroupListSerializer
+        # Written as ids, represented as codenames
+        extra_kwargs = {"permissions": {"write_only": True}}
 
 
 class PermissionSerializer(DynamicFieldsSerializer):
@@ -154,9 +174,11 @@ class PermissionSerializer(DynamicFieldsSerializer):
 
 
 class UserDeviceSerializer(DynamicFieldsSerializer):
+    user_agent = serializers.CharField(source="user_agent_string.value", read_only=True)
+
     class Meta:
         model = UserDevice
-        fields = "__all__"
+        exclude = ("user_agent_string",)
 
     def validate(self, data):
         if self.instance:
@@ -0,0 +1,44 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from django.contrib.auth import get_user_model
+from django.utils.crypto import get_random_string
+
+from core.helpers.email_utils import EmailHelper
+from core.helpers.task_queue import task
+
+# Characters of generated passwords, without the look-alikes (i, l, I, O, 0, 1)
+PASSWORD_ALLOWED_CHARS = "abcdefghjkmnpqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+
+
+@task
+def send_welcome_email(user_pk):
+    """
+    Generates the new user's password and emails it to them. The password is
+    only created here, so it never lands in the task queue.
+    """
+    user = get_user_model().objects.filter(pk=user_pk).first()
+    # Skip users that were removed or already got a password meanwhile
+    if user is None or user.has_usable_password():
+        return
+
+    password = get_random_string(8, PASSWORD_ALLOWED_CHARS)
+    user.set_password(password)
+    user.save(update_fields=["password"])
+    EmailHelper(
+        subject="Welcome to the platform",
+        template_name="emails/welcome.html",
+        context={
+            "name": user.first_name + " " + user.last_name,
+            "email": user.email,
+            "phone_number": user.phone_number,
+            "password": password,
+        },
+    ).send_email(user.email)
@@ -0,0 +1,78 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+User = get_user_model()
+
+
+class ListQueryCountTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            email="admin@test.com",
+            password="testpassword",
+            phone_number="+905000000000",
+            is_superuser=True,
+        )
+        permissions = list(Permission.objects.order_by("pk")[:6])
+        for index in range(20):
+            group = Group.objects.create(name=f"group{index}")
+            group.permissions.set(permissions[index % 3 : index % 3 + 3])
+            user = User.objects.create_user(
+                email=f"user{index}@test.com",
+                password="testpassword",
+                phone_number=f"+9050000001{index:02}",
+            )
+            user.groups.add(group)
+            user.user_permissions.add(permissions[5])
+        refresh = RefreshToken.for_user(self.admin)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+    def count_queries(self, url, page_size):
+        # Warm up the per-process caches (authenticated user, content types)
+        self.client.get(url, {"page_size": 1})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"page_size": page_size})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), page_size)
+        return len(queries), response.data["results"]
+
+    def test_users_list_query_count_is_constant(self):
+        url = reverse("accounts:users-list")
+        small, _ = self.count_queries(url, 2)
+        large, results = self.count_queries(url, 20)
+        self.assertEqual(small, large)
+
+        user = User.objects.get(email=results[-1]["email"])
+        expected = {
+            permission.codename
+            for permission in Permission.objects.filter(group__user=user)
+        } | {permission.codename for permission in user.user_permissions.all()}
+        self.assertEqual(set(results[-1]["user_permissions"]), expected)
+        self.assertEqual(results[-1]["groups"], [user.groups.get().pk])
+
+    def test_groups_list_query_count_is_constant(self):
+        url = reverse("accounts:groups-list")
+        small, _ = self.count_queries(url, 2)
+        large, results = self.count_queries(url, 20)
+        self.assertEqual(small, large)
+
+        group = Group.objects.get(pk=results[0]["id"])
+        self.assertEqual(
+            sorted(results[0]["permissions"]),
+            sorted(group.permissions.values_list("codename", flat=True)),
+        )
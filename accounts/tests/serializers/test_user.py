@@ -9,10 +9,11 @@
 
 
 from django.contrib.auth.models import Group
+from django.core import mail
 from rest_framework.test import APITestCase, APIClient
-from unittest.mock import patch
 from accounts.serializers import UserSerializer
-from core.models import User
+from core.helpers.task_queue import Worker
+from core.models import Task, User
 from rest_framework import serializers
 
 
@@ -49,8 +50,7 @@ class TestUserSerializer(APITestCase):
         with self.assertRaises(serializers.ValidationError):
             serializer.is_valid(raise_exception=True)
 
-    @patch("core.helpers.email_utils.EmailHelper.send_email")
-    def test_create_with_group(self, MockEmailHelper):
+    def test_create_with_group(self):
         data = {
             "email": "testuser@test.com",
             "phone_number": "+905123456718",
@@ -61,7 +61,18 @@ class TestUserSerializer(APITestCase):
         self.assertTrue(serializer.is_valid(raise_exception=True))
         user = serializer.save()
         self.assertEqual(user.groups.first(), self.group)
-        MockEmailHelper.assert_called()
+        # The welcome email is queued with the user's pk only, its password
+        # is generated by the task worker
+        self.assertFalse(user.has_usable_password())
+        task = Task.objects.get(name="accounts.tasks.send_welcome_email")
+        self.assertEqual(task.payload, {"args": [user.pk], "kwargs": {}})
+        with self.settings(EMAIL_HOST_USER="noreply@test.com"):
+            Worker().run_pending()
+
+        self.assertEqual(mail.outbox[0].to, [user.email])
+        password = mail.outbox[0].body.split()[-1]
+        user.refresh_from_db()
+        self.assertTrue(user.check_password(password))
 
     def test_update(self):
         another_group = Group.objects.create(name="Another Test Group")
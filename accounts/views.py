@@ -12,12 +12,11 @@ from auditlog.models import LogEntry
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group, Permission
 from django.utils import timezone
-from django_user_agents.utils import get_user_agent
+from drf_spectacular.utils import extend_schema
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from accounts.serializers import (
     ChangePasswordSerializer,
@@ -29,12 +28,19 @@ from accounts.serializers import (
     ProfileSerializer,
 )
 from accounts.models import Profile
+from authentication.backends import JWTAuthentication
 from authentication.helpers.ip_utils import get_client_ip
+from authentication.helpers.user_agent import get_user_agent
 from core.helpers.email_utils import EmailHelper
 from core.models import UserDevice
 from core.pagination import GlobalPagination
 from core.permissions import DynamicAccessPermission
-from core.views import DynamicFieldsModelViewSet, ListUpdateViewSet
+from core.views import (
+    CompiledListMixin,
+    DynamicFieldsModelViewSet,
+    ExportMixin,
+    ListUpdateViewSet,
+)
 
 from django.db.models import Q
 from django.contrib.contenttypes.models import ContentType
@@ -48,6 +54,7 @@ class UsersViewSet(DynamicFieldsModelViewSet):
     Endpoint:
     =========
     GET /users
+    GET /users/export
     GET /users/me
     POST /users/
     POST /users/change_password/
@@ -56,7 +63,8 @@ class UsersViewSet(DynamicFieldsModelViewSet):
     DELETE /users/<id>/
     """
 
-    queryset = get_user_model().objects.all()
+    # Permissions and OTP devices are loaded per page by UserListSerializer
+    queryset = get_user_model().objects.prefetch_related("groups")
     serializer_class = UserSerializer
     filterset_fields = ["first_name", "last_name", "email", "phone_number", "is_active"]
     search_fields = ["first_name", "last_name", "email", "phone_number"]
@@ -69,14 +77,29 @@ class UsersViewSet(DynamicFieldsModelViewSet):
         serializer = super().get_serializer(request.user)
         return Response(serializer.data)
 
+    @extend_schema(
+        description=(
+            "Changes the requester's password and signs out every session, "
+            "including the current one. No new tokens are returned, the client "
+            "has to log in again with the new password."
+        ),
+        request=ChangePasswordSerializer,
+        responses={status.HTTP_204_NO_CONTENT: None},
+    )
     @action(detail=False, methods=["post"])
     def change_password(self, request):
         """
         This custom action updates the password for the requester.
+
+        Every session of the requester is signed out, including the current
+        one: the tokens used for this request are revoked too and no new ones
+        are returned, so the client has to log in again with the new password.
         """
         serializer = ChangePasswordSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = request.user
+        # The cached user snapshot doesn't carry the password hash
+        user.refresh_from_db(fields=["password"])
         if not user.check_password(serializer.data.get("old_password")):
             return Response(
                 {"old_password": ["Wrong password."]},
@@ -84,6 +107,8 @@ class UsersViewSet(DynamicFieldsModelViewSet):
             )
         user.set_password(serializer.data["new_password"])
         user.save()
+        # Sign out every session, the current one included
+        user.revoke_tokens()
         EmailHelper(
             subject="Password changed",
             template_name="emails/password_changed.html",
@@ -93,7 +118,7 @@ class UsersViewSet(DynamicFieldsModelViewSet):
                 "user_agent": get_user_agent(request),
                 "date": timezone.now().strftime("%Y-%m-%d %H:%M:%S"),
             },
-        ).send_email(user.email)
+        ).queue_email(user.email)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -103,6 +128,7 @@ class GroupsViewSet(DynamicFieldsModelViewSet):
     Endpoint:
     =========
     GET /groups
+    GET /groups/export
     GET /groups/me
     POST /groups/
     PUT /groups/<id>/
@@ -170,6 +196,7 @@ class UserDeviceViewSet(ListUpdateViewSet):
     Endpoint:
     =========
     GET /devices
+    GET /devices/export
     GET /devices/me
     PUT /devices/<id>/
     PATCH /devices/<id>/
@@ -177,7 +204,7 @@ class UserDeviceViewSet(ListUpdateViewSet):
     """
 
     serializer_class = UserDeviceSerializer
-    queryset = UserDevice.objects.all()
+    queryset = UserDevice.objects.select_related("user_agent_string")
     drf_tag = "Devices"
 
     @action(detail=False, methods=["get"])
@@ -185,17 +212,18 @@ class UserDeviceViewSet(ListUpdateViewSet):
         """
         This custom action returns the user data for the requester.
         """
-        user_devices = UserDevice.objects.filter(user=request.user)
+        user_devices = self.get_queryset().filter(user=request.user)
         serializer = self.get_serializer(user_devices, many=True)
         return Response(serializer.data)
 
 
-class LogsViewSet(viewsets.ReadOnlyModelViewSet):
+class LogsViewSet(ExportMixin, CompiledListMixin, viewsets.ReadOnlyModelViewSet):
     """
     *Endpoint for managing Logs.*
     Endpoint:
     =========
     GET /logs
+    GET /logs/export
     GET /logs/me
     """
 
@@ -204,6 +232,10 @@ class LogsViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = LogEntry.objects.all().order_by("-timestamp")
     pagination_class = GlobalPagination
     serializer_class = LogsSerializer
+    # Backed by the composite index of core.0008_logentry_timestamp_id_index
+    cursor_ordering = ("-timestamp", "-id")
+    # Counted exactly until the table outgrows COUNTING["ESTIMATE_THRESHOLD"]
+    count_strategy = "estimate"
 
     @action(detail=False, methods=["get"])
     def me(self, request):
@@ -221,6 +253,7 @@ class ProfilesViewSet(DynamicFieldsModelViewSet):
     Endpoint:
     =========
     GET /profiles
+    GET /profiles/export
     GET /profiles/me
     POST /profiles/
     PUT /profiles/<id>/
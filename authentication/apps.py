@@ -17,3 +17,6 @@ class AuthenticationConfig(AppConfig):
 
     def ready(self):
         import authentication.signals
+        from authentication.helpers.device_helper import device_registry
+
+        device_registry.load()
@@ -8,11 +8,15 @@
 #
 
 
+import hashlib
+from collections import namedtuple
 from datetime import datetime, timedelta
 
 import jwt
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from rest_framework import exceptions
 from rest_framework.authentication import BaseAuthentication, get_authorization_header
@@ -20,21 +24,174 @@ from rest_framework.exceptions import AuthenticationFailed, ParseError
 from drf_spectacular.extensions import OpenApiAuthenticationExtension
 from drf_spectacular.plumbing import build_bearer_security_scheme_object
 
-from core.models import ExpiringToken
+from authentication.helpers.token_store import get_temporary_token_store
+from authentication.helpers.user_cache import get_cached_user, get_cached_user_by_pk
+from authentication.tokens import TOKEN_VERSION_CLAIM, get_token_version
+from core.helpers.cache_utils import LRUCache
+from core.helpers.permission_utils import get_effective_permissions
+from core.models import TEMPORARY_TOKEN_PREFIX
 
 User = get_user_model()
 
+TOKEN_KIND_ACCESS = "access"
+TOKEN_KIND_TEMPORARY = "temporary"
+
+# Per-process LRU of already verified JWT payloads, keyed by a digest of the raw token.
+verified_token_cache = LRUCache(
+    maxsize=settings.SIMPLE_JWT.get("VERIFIED_TOKEN_CACHE_SIZE", 1024)
+)
+
+# Marks a request whose bearer token has already been looked at and was absent.
+_NO_CREDENTIALS = object()
+
+AuthenticationResult = namedtuple("AuthenticationResult", ["kind", "user", "auth"])
+
+
+def get_bearer_token(request):
+    """
+    Returns the bearer token from the Authorization header, or None if the
+    request carries no bearer credentials.
+    """
+    auth = get_authorization_header(request).split()
+    if not auth or auth[0].lower() != b"bearer":
+        return None
+
+    if len(auth) == 1:
+        msg = _("Invalid token header. No credentials provided.")
+        raise exceptions.AuthenticationFailed(msg)
+    elif len(auth) > 2:
+        msg = _("Invalid token header. Token string should not contain spaces.")
+        raise exceptions.AuthenticationFailed(msg)
+    try:
+        return auth[1].decode()
+    except UnicodeError:
+        msg = _(
+            "Invalid token header. Token string should not contain invalid characters."
+        )
+        raise exceptions.AuthenticationFailed(msg)
+
+
+def get_token_kind(token):
+    """
+    Tells temporary 2FA tokens apart from access JWTs by their explicit prefix.
+    """
+    if token.startswith(TEMPORARY_TOKEN_PREFIX):
+        return TOKEN_KIND_TEMPORARY
+    return TOKEN_KIND_ACCESS
+
+
+def peek_token_kind(request):
+    """
+    Returns the kind of the request's bearer token without authenticating it,
+    or None if there is no usable bearer token.
+    """
+    try:
+        token = get_bearer_token(request)
+    except exceptions.AuthenticationFailed:
+        return None
+    return get_token_kind(token) if token else None
+
+
+def authenticate_bearer_token(request):
+    """
+    Runs the single authentication pass for the request's bearer token.
+
+    The token is sent to exactly one authenticator according to its kind, and
+    the outcome (result or error) is memoized on the underlying HttpRequest so
+    the middleware and every DRF authenticator reuse it.
+
+    Returns:
+        An AuthenticationResult, or None if the request has no bearer token.
+    """
+    http_request = getattr(request, "_request", request)
+    outcome = getattr(http_request, "_bearer_authentication", None)
+    if outcome is None:
+        try:
+            outcome = _authenticate_bearer_token(http_request) or _NO_CREDENTIALS
+        except exceptions.APIException as exc:
+            outcome = exc
+        http_request._bearer_authentication = outcome
+
+    if isinstance(outcome, exceptions.APIException):
+        raise outcome
+    return None if outcome is _NO_CREDENTIALS else outcome
+
+
+def _authenticate_bearer_token(request):
+    token = get_bearer_token(request)
+    if token is None:
+        return None
+
+    kind = get_token_kind(token)
+    authenticator = TOKEN_AUTHENTICATORS[kind]()
+    user, auth = authenticator.authenticate_credentials(token)
+    return AuthenticationResult(kind, user, auth)
+
+
+class BearerTokenAuthentication(BaseAuthentication):
+    """
+    Base class for the bearer token authenticators. Authentication itself goes
+    through `authenticate_bearer_token`; each subclass only accepts the result
+    for its own token kind.
+    """
+
+    token_kind = None
 
-class JWTAuthentication(BaseAuthentication):
     def authenticate(self, request):
-        # Extract the JWT from the Authorization header
-        jwt_token = request.META.get("HTTP_AUTHORIZATION")
-        if jwt_token is None:
+        result = authenticate_bearer_token(request)
+        if result is None or result.kind != self.token_kind:
             return None
+        return result.user, result.auth
+
+    def authenticate_header(self, request):
+        return "Bearer"
+
+    def authenticate_credentials(self, token):
+        raise NotImplementedError()
+
+
+class JWTAuthentication(BearerTokenAuthentication):
+    token_kind = TOKEN_KIND_ACCESS
+
+    def authenticate_credentials(self, jwt_token):
+        payload = JWTAuthentication.decode_jwt(jwt_token)
+
+        # Refresh tokens issued by simplejwt must not be usable as access tokens
+        token_type_claim = settings.SIMPLE_JWT.get("TOKEN_TYPE_CLAIM", "token_type")
+        token_type = payload.get(token_type_claim)
+        if token_type is not None and token_type != "access":
+            raise AuthenticationFailed("Token has wrong type")
+
+        # Get the user from the snapshot cache, or the database on a miss
+        user_id = payload.get(settings.SIMPLE_JWT.get("USER_ID_CLAIM", "user_id"))
+        email_or_phone_number = payload.get("user_identifier")
+        if user_id is not None:
+            user = get_cached_user_by_pk(user_id)
+        elif email_or_phone_number is not None:
+            user = get_cached_user(email_or_phone_number)
+        else:
+            raise AuthenticationFailed("User identifier not found in JWT")
+
+        if user is None:
+            raise AuthenticationFailed("User not found")
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive")
+        if get_token_version(payload) != user.token_version:
+            raise AuthenticationFailed("Token has been revoked")
+
+        # Return the user and token payload
+        return user, payload
 
-        jwt_token = JWTAuthentication.get_the_token_from_header(
-            jwt_token
-        )  # clean the token
+    @classmethod
+    def decode_jwt(cls, jwt_token):
+        """
+        Decodes and verifies the JWT, reusing the payload of a previously
+        verified token until it expires.
+        """
+        cache_key = hashlib.sha256(jwt_token.encode()).digest()
+        payload = verified_token_cache.get(cache_key)
+        if payload is not None:
+            return dict(payload)
 
         # Decode the JWT and verify its signature
         try:
@@ -48,28 +205,19 @@ class JWTAuthentication(BaseAuthentication):
         except Exception:
             raise ParseError()
 
-        # Get the user from the database
-        email_or_phone_number = payload.get("user_identifier")
-        if email_or_phone_number is None:
-            raise AuthenticationFailed("User identifier not found in JWT")
-
-        user = User.objects.filter(email=email_or_phone_number).first()
-        if user is None:
-            user = User.objects.filter(phone_number=email_or_phone_number).first()
-            if user is None:
-                raise AuthenticationFailed("User not found")
-
-        # Return the user and token payload
-        return user, payload
-
-    def authenticate_header(self, request):
-        return "Bearer"
+        # Only tokens with an expiry are cached, so an entry never outlives its token
+        expires_at = payload.get("exp")
+        if isinstance(expires_at, (int, float)):
+            verified_token_cache.set(cache_key, dict(payload), expires_at=expires_at)
+        return payload
 
     @classmethod
     def create_jwt(cls, user):
         # Create the JWT payload
         payload = {
+            settings.SIMPLE_JWT.get("USER_ID_CLAIM", "user_id"): user.pk,
             "user_identifier": user.email,
+            TOKEN_VERSION_CLAIM: user.token_version,
             "exp": int(
                 (
                     datetime.now()
@@ -78,8 +226,6 @@ class JWTAuthentication(BaseAuthentication):
             ),
             # set the expiration time for 5 hour from now
             "iat": datetime.now().timestamp(),
-            "email": user.email,
-            "phone_number": user.phone_number,
         }
 
         # Encode the JWT with your secret key
@@ -95,26 +241,8 @@ class JWTAuthentication(BaseAuthentication):
         return token
 
 
-class TemporaryTokenAuthentication(BaseAuthentication):
-    def authenticate(self, request):
-        auth = get_authorization_header(request).split()
-        if not auth or auth[0].lower() != b"bearer":
-            return None
-
-        if len(auth) == 1:
-            msg = _("Invalid token header. No credentials provided.")
-            raise exceptions.AuthenticationFailed(msg)
-        elif len(auth) > 2:
-            msg = _("Invalid token header. Token string should not contain spaces.")
-            raise exceptions.AuthenticationFailed(msg)
-        try:
-            token = auth[1].decode()
-        except UnicodeError:
-            msg = _(
-                "Invalid token header. Token string should not contain invalid characters."
-            )
-            raise exceptions.AuthenticationFailed(msg)
-        return self.authenticate_credentials(token)
+class TemporaryTokenAuthentication(BearerTokenAuthentication):
+    token_kind = TOKEN_KIND_TEMPORARY
 
     def authenticate_credentials(self, key):
         token = self.get_token(key)
@@ -122,16 +250,70 @@ class TemporaryTokenAuthentication(BaseAuthentication):
         return (token.user, token)
 
     def get_token(self, key):
-        try:
-            return ExpiringToken.objects.select_related("user").get(key=key)
-        except ExpiringToken.DoesNotExist:
+        token = get_temporary_token_store().get(key)
+        if token is None:
             raise exceptions.AuthenticationFailed(_("Invalid token."))
+        return token
 
     def check_expiration(self, token):
         if token.is_expired:
             raise exceptions.AuthenticationFailed(_("Token has expired."))
 
 
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend reading the user's effective permissions from the shared
+    permission cache, so permission checks don't query the database once it
+    is warm. Superusers and object permissions are left to ModelBackend.
+
+    Users authenticate with either their email or their phone number.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        user = (
+            User.objects.filter(Q(email=username) | Q(phone_number=username))
+            .order_by()
+            .first()
+        )
+        if user is None:
+            # Run the hasher anyway, so response times don't reveal whether
+            # the account exists
+            User().set_password(password)
+        elif user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if user_obj.is_superuser:
+            return super().get_all_permissions(user_obj, obj)
+        if not hasattr(user_obj, "_perm_cache"):
+            user_obj._perm_cache = get_effective_permissions(user_obj)
+        return user_obj._perm_cache
+
+
+TOKEN_AUTHENTICATORS = {
+    TOKEN_KIND_ACCESS: JWTAuthentication,
+    TOKEN_KIND_TEMPORARY: TemporaryTokenAuthentication,
+}
+
+
+class JWTAuthenticationExtension(OpenApiAuthenticationExtension):
+    target_class = JWTAuthentication
+    name = "jwtAuth"
+
+    def get_security_definition(self, auto_schema):
+        return build_bearer_security_scheme_object(
+            header_name="Authorization", token_prefix="Bearer", bearer_format="JWT"
+        )
+
+
 class TemporaryTokenAuthenticationExtension(OpenApiAuthenticationExtension):
     target_class = TemporaryTokenAuthentication  # replace with your import path
     name = 'TemporaryTokenAuth'
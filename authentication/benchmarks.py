@@ -0,0 +1,74 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from django.conf import settings
+from twilio.rest import Client
+from user_agents import parse
+
+from authentication.gateways import (
+    CustomTwilioGateWay,
+    RedirectingTwilioHttpClient,
+)
+from authentication.helpers.fake_twilio import FakeTwilioServer
+from authentication.helpers.user_agent import parse_user_agent
+from core.helpers.benchmark import benchmark
+
+
+def fake_twilio_client(pool_connections):
+    server = FakeTwilioServer().start()
+    return Client(
+        settings.TWILIO_ACCOUNT_SID,
+        settings.TWILIO_AUTH_TOKEN,
+        http_client=RedirectingTwilioHttpClient(
+            server.url, pool_connections=pool_connections
+        ),
+    )
+
+
+@benchmark("sms.send_keepalive")
+def sms_send_keepalive():
+    """
+    Sends through a local fake Twilio API over the shared keep-alive session.
+    """
+    gateway = CustomTwilioGateWay()
+    gateway.client = fake_twilio_client(pool_connections=True)
+    return lambda: gateway.deliver_sms("+905000000000", "Your code is 123456")
+
+
+@benchmark("sms.send_new_connection")
+def sms_send_new_connection():
+    """
+    Sends through a local fake Twilio API opening a connection per message.
+    """
+    gateway = CustomTwilioGateWay()
+    gateway.client = fake_twilio_client(pool_connections=False)
+    return lambda: gateway.deliver_sms("+905000000000", "Your code is 123456")
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.1 Safari/605.1.15"
+)
+
+
+@benchmark("ua.parse")
+def ua_parse():
+    """
+    Parses a user agent through the process-wide user agent cache.
+    """
+    return lambda: str(parse_user_agent(USER_AGENT))
+
+
+@benchmark("ua.parse_uncached")
+def ua_parse_uncached():
+    """
+    Parses a user agent from scratch on every call.
+    """
+    return lambda: str(parse(USER_AGENT))
@@ -8,18 +8,84 @@
 #
 
 
+from functools import lru_cache
+
 from django.conf import settings
-from django.template.loader import render_to_string
+from django.utils import timezone
+from django_otp.oath import totp
+from twilio.http.http_client import TwilioHttpClient
+from twilio.rest import Client
 from two_factor.gateways.twilio.gateway import Twilio
+from two_factor.utils import totp_digits
+
+from core.helpers.email_utils import render_template
+
+TWILIO_API_URL = "https://api.twilio.com"
+
+
+class RedirectingTwilioHttpClient(TwilioHttpClient):
+    """
+    Twilio HTTP client that sends API requests to `base_url` instead of
+    api.twilio.com, e.g. to the local fake Twilio server.
+    """
+
+    def __init__(self, base_url, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip("/")
+
+    def request(self, method, url, *args, **kwargs):
+        if url.startswith(TWILIO_API_URL):
+            url = self.base_url + url[len(TWILIO_API_URL) :]
+        return super().request(method, url, *args, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def get_twilio_client():
+    """
+    Returns the process-wide Twilio client, whose HTTP session keeps
+    connections to the API alive between messages.
+    """
+    timeout = getattr(settings, "TWILIO_HTTP_TIMEOUT", None)
+    base_url = getattr(settings, "TWILIO_API_BASE_URL", None)
+    if base_url:
+        http_client = RedirectingTwilioHttpClient(base_url, timeout=timeout)
+    else:
+        http_client = TwilioHttpClient(timeout=timeout)
+    return Client(
+        settings.TWILIO_ACCOUNT_SID,
+        settings.TWILIO_AUTH_TOKEN,
+        http_client=http_client,
+    )
 
 
 class CustomTwilioGateWay(Twilio):
+    def __init__(self):
+        # Reuse the shared client rather than opening a new session per message
+        self.client = get_twilio_client()
+
     def send_sms(self, device, token):
         """
-        send sms using template from settings OTP_SMS_BODY_TEMPLATE
+        queue the challenge sms, it is sent by the task worker through
+        `send_otp_sms`, which renders the token again from the device key
+        unless the challenge is older than the temporary token lifetime
+        """
+        from authentication.tasks import send_otp_sms
+
+        send_otp_sms.delay(device.pk, timezone.now().timestamp())
+
+    def render_sms(self, device):
+        """
+        render the device's current token with the OTP_SMS_BODY_TEMPLATE
+        """
+        digits = totp_digits()
+        token = str(totp(device.bin_key, digits=digits)).zfill(digits)
+        return render_template(settings.OTP_SMS_BODY_TEMPLATE, {"token": token})
+
+    def deliver_sms(self, to, body):
+        """
+        send an sms through the Twilio API
         """
-        body = render_to_string(settings.OTP_SMS_BODY_TEMPLATE, {"token": token})
-        send_kwargs = {"to": device.number.as_e164, "body": body}
+        send_kwargs = {"to": to, "body": body}
         messaging_service_sid = getattr(settings, "TWILIO_MESSAGING_SERVICE_SID", None)
         if messaging_service_sid is not None:
             send_kwargs["messaging_service_sid"] = messaging_service_sid
@@ -7,28 +7,137 @@
 #           Rakan Farhouda
 #
 
+from collections import namedtuple
+from collections.abc import Mapping
+
 from django.apps import apps
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.models import CharField, Value
+from django.dispatch import receiver
+
+DeviceSummary = namedtuple("DeviceSummary", ["type", "id", "name", "confirmed"])
+
+
+class DeviceRegistry(Mapping):
+    """
+    The OTP device models configured in OTP_DEVICE_CLASSES, keyed by device
+    type, e.g. {"sms": PhoneDevice}.
+
+    The models are resolved once, when the authentication app is ready, and
+    again if the setting changes. Entries whose model can't be found are
+    skipped, as is everything when the setting is missing.
+    """
+
+    def __init__(self):
+        self._classes = None
+
+    def load(self):
+        classes = {}
+        for device_type, model in getattr(settings, "OTP_DEVICE_CLASSES", {}).items():
+            try:
+                classes[device_type] = apps.get_model(model)
+            except (LookupError, ValueError):
+                continue
+        self._classes = classes
+
+    def reset(self):
+        self._classes = None
+
+    @property
+    def classes(self):
+        if self._classes is None:
+            self.load()
+        return self._classes
+
+    def __getitem__(self, device_type):
+        return self.classes[device_type]
+
+    def __iter__(self):
+        return iter(self.classes)
+
+    def __len__(self):
+        return len(self.classes)
+
+    def get_summaries(self, users, confirmed=None):
+        """
+        Returns one UNION ALL query listing the devices of the given users
+        across all device types, as (type, id, name, confirmed, user_id) rows.
+        """
+        querysets = []
+        for device_type, model in self.items():
+            queryset = model.objects.filter(user__in=users)
+            if confirmed is not None:
+                queryset = queryset.filter(confirmed=confirmed)
+            querysets.append(
+                queryset.annotate(
+                    device_type=Value(device_type, output_field=CharField())
+                )
+                .values_list("device_type", "id", "name", "confirmed", "user_id")
+                .order_by()
+            )
+        if not querysets:
+            return None
+        return querysets[0].union(*querysets[1:], all=True)
+
+    def get_user_devices(self, user, confirmed=None):
+        """
+        Returns the DeviceSummary of each OTP device of the user, in a single
+        query, ordered by device type as configured.
+        """
+        return self.get_users_devices([user.pk], confirmed).get(user.pk, [])
+
+    def get_users_devices(self, user_ids, confirmed=None):
+        """
+        Batched variant of `get_user_devices`, returns {user id: summaries}
+        for many users in a single query.
+        """
+        summaries = self.get_summaries(user_ids, confirmed)
+        devices = {}
+        if summaries is None:
+            return devices
+        order = {device_type: index for index, device_type in enumerate(self)}
+        rows = sorted(summaries, key=lambda row: (order[row[0]], row[1]))
+        for device_type, device_id, name, is_confirmed, user_id in rows:
+            devices.setdefault(user_id, []).append(
+                DeviceSummary(device_type, device_id, name, is_confirmed)
+            )
+        return devices
+
+    def user_has_devices(self, user):
+        summaries = self.get_summaries([user.pk])
+        return summaries is not None and bool(summaries[:1])
+
+
+device_registry = DeviceRegistry()
+
+
+@receiver(setting_changed)
+def reset_device_registry(setting, **kwargs):
+    if setting == "OTP_DEVICE_CLASSES":
+        device_registry.reset()
 
 
 def get_device_classes():
     """
     Retrieves configured device classes for OTP (One-Time Passwords).
 
-    Handles the potential absence of the 'OTP_DEVICE_CLASSES' setting in
-    Django settings, providing an empty dictionary as a default. Also
-    catches and suppresses errors from 'apps.get_model', treating any
-    problematic entries as None.
-
     Returns:
-        dict: A dictionary mapping device class names to their corresponding models.
+        DeviceRegistry: A mapping of device class names to their models.
+    """
+    return device_registry
+
+
+def get_user_otp_devices(user, confirmed=None):
     """
+    Retrieves the OTP devices of a user across all configured device classes
+    in a single UNION query.
 
-    try:
-        return {
-            key: apps.get_model(val) for key, val in settings.OTP_DEVICE_CLASSES.items()
-        }
-    except AttributeError:
-        return {}  # Default if OTP_DEVICE_CLASSES is missing
-    except LookupError as error:
-        return {}
+    Args:
+        user: The user whose devices are listed.
+        confirmed: If given, only devices with this confirmed state are listed.
+
+    Returns:
+        list: DeviceSummary (type, id, name, confirmed) tuples.
+    """
+    return device_registry.get_user_devices(user, confirmed)
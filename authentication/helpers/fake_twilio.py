@@ -0,0 +1,119 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+MESSAGES_PATH = re.compile(r"^/2010-04-01/Accounts/(?P<account>\w+)/Messages\.json$")
+
+
+class FakeTwilioHandler(BaseHTTPRequestHandler):
+    """
+    Answers the Twilio "create message" endpoint like the real API would,
+    after the configured latency, failing the configured share of requests.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, don't let them wait for ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        form = {
+            key: values[0]
+            for key, values in parse_qs(self.rfile.read(length).decode()).items()
+        }
+        self.server.connections.add(self.client_address)
+
+        match = MESSAGES_PATH.match(self.path)
+        if not match:
+            self.send_json(404, {"code": 20404, "message": "Not found", "status": 404})
+            return
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if random.random() < self.server.error_rate:
+            self.server.errors += 1
+            self.send_json(
+                500, {"code": 20500, "message": "Internal Server Error", "status": 500}
+            )
+            return
+
+        message = {
+            "sid": f"SM{uuid.uuid4().hex}",
+            "account_sid": match["account"],
+            "to": form.get("To"),
+            "from": form.get("From"),
+            "messaging_service_sid": form.get("MessagingServiceSid"),
+            "body": form.get("Body"),
+            "status": "queued",
+            "num_segments": "1",
+            "direction": "outbound-api",
+            "api_version": "2010-04-01",
+        }
+        with self.server.lock:
+            self.server.messages.append(message)
+        self.send_json(201, message)
+
+
+class FakeTwilioServer(ThreadingHTTPServer):
+    """
+    A local stand-in for the Twilio REST API, to benchmark and test the SMS
+    path without network access. Binds to a free port unless one is given.
+
+    :param latency: Seconds each request waits before being answered.
+    :param error_rate: Share of requests (0 to 1) answered with a 500 error.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, host="127.0.0.1", port=0, latency=0, error_rate=0, verbose=False
+    ):
+        super().__init__((host, port), FakeTwilioHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.messages = []
+        self.errors = 0
+        self.connections = set()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -8,10 +8,12 @@
 #
 
 
+from django.contrib.auth import get_user_model
 from django.utils import timezone
-from django_user_agents.utils import get_user_agent
 
 from authentication.helpers.ip_utils import get_client_ip
+from authentication.helpers.user_agent import get_user_agent
+from core.helpers.device_fingerprint import get_device_fingerprint
 from core.helpers.email_utils import EmailHelper
 from core.models import UserDevice
 
@@ -24,26 +26,39 @@ class LogUserDevice:
         self.ip_address = get_client_ip(request)
 
     def log_device_on_login(self):
+        """
+        Records the device the user logs in from and returns it, emailing the
+        user when the device wasn't seen before.
+
+        Timestamps are written with single UPDATE statements rather than full
+        saves, so a login doesn't re-read and audit-log the rows.
+        """
+        now = timezone.now()
         user_device, created = UserDevice.objects.get_or_create(
             user=self.user,
-            user_agent=str(self.user_agent),
-            ip_address=self.ip_address,
+            fingerprint=get_device_fingerprint(str(self.user_agent), self.ip_address),
+            defaults={
+                "user_agent": str(self.user_agent),
+                "ip_address": self.ip_address,
+            },
         )
 
         if created:
-            self.user.last_login = timezone.now()
-            self.user.save()
+            self.user.last_login = now
+            get_user_model().objects.filter(pk=self.user.pk).update(last_login=now)
             # Send a notification email to the user
             EmailHelper(
                 subject="Unrecognized device login",
                 template_name="emails/unrecognized_device_login.html",
                 context={
                     "name": self.user.first_name + " " + self.user.last_name,
-                    "date": timezone.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "date": now.strftime("%Y-%m-%d %H:%M:%S"),
                     "user_agent": self.user_agent,
                     "ip": self.ip_address,
                 },
-            ).send_email(self.user.email)
+            ).queue_email(self.user.email)
         else:
-            user_device.last_login = timezone.now()
-            user_device.save()
+            user_device.last_login = now
+            UserDevice.objects.filter(pk=user_device.pk).update(last_login=now)
+
+        return user_device
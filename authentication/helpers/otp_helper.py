@@ -8,15 +8,15 @@
 #
 
 
-from django_user_agents.utils import get_user_agent
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
-from authentication.helpers.ip_utils import get_client_ip
 from authentication.helpers.login_helper import LogUserDevice
-from authentication.helpers.device_helper import get_device_classes
-from core.models import UserDevice
+from authentication.helpers.device_helper import (
+    get_device_classes,
+    get_user_otp_devices,
+)
 
 
 class OTPLoginFlowHelper:
@@ -25,6 +25,7 @@ class OTPLoginFlowHelper:
 
     This class provides methods to start the OTP flow and handle an OTP request.
     It is initialized with a request, a user instance, and an optional method parameter.
+    The device logged by `start_otp_flow` is kept on `user_device`.
     """
 
     def __init__(self, request, user, method=None):
@@ -32,6 +33,7 @@ class OTPLoginFlowHelper:
         self.user = user
         self.device_classes = get_device_classes()
         self.method = method
+        self.user_device = None
 
     def start_otp_flow(self):
         """
@@ -53,25 +55,19 @@ class OTPLoginFlowHelper:
             or does not have a default OTP method, it returns None.
         """
 
-        LogUserDevice(self.user, self.request).log_device_on_login()
+        self.user_device = LogUserDevice(self.user, self.request).log_device_on_login()
         if not self.user.enabled_2fa or not self.user.default_2fa_method:
             return None
 
-        if UserDevice.objects.filter(
-            user=self.user,
-            user_agent=get_user_agent(self.request),
-            ip_address=get_client_ip(self.request),
-            trusted=True,
-        ).exists():
+        # The logged device is the row for this user, user agent and IP
+        if self.user_device.trusted:
             return None
 
         temp_token = self.user.generate_temporary_token()
 
-        devices = {
-            method: cls.objects.get(user=self.user).id
-            for method, cls in self.device_classes.items()
-            if cls.objects.filter(user=self.user).exists()
-        }
+        devices = {}
+        for device in get_user_otp_devices(self.user):
+            devices.setdefault(device.type, device.id)
 
         return Response(
             {
@@ -0,0 +1,153 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, get_random_string
+from django.utils.module_loading import import_string
+
+from authentication.helpers.user_cache import cache_user, get_cached_user_by_pk
+from core.models import TEMPORARY_TOKEN_PREFIX, ExpiringToken
+
+
+def get_temporary_token_store():
+    """
+    Returns an instance of the store configured by TEMPORARY_TOKEN_STORE.
+    """
+    store_path = getattr(
+        settings,
+        "TEMPORARY_TOKEN_STORE",
+        "authentication.helpers.token_store.DatabaseTemporaryTokenStore",
+    )
+    return import_string(store_path)()
+
+
+class TemporaryToken:
+    """
+    A temporary 2FA token held by a non-database store.
+    """
+
+    def __init__(self, key, user, expires_at):
+        self.key = key
+        self.user = user
+        self.expires_at = expires_at
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+
+class BaseTemporaryTokenStore:
+    """
+    Interface of the temporary 2FA token stores.
+    """
+
+    def issue(self, user):
+        """
+        Issues a new token for the user, replacing any previous one, and
+        returns its key.
+        """
+        raise NotImplementedError()
+
+    def get(self, key):
+        """
+        Returns the token object (with `user`, `expires_at` and `is_expired`)
+        for the key, or None if there is none.
+        """
+        raise NotImplementedError()
+
+    def revoke(self, user):
+        """
+        Deletes the user's token, if any.
+        """
+        raise NotImplementedError()
+
+
+class DatabaseTemporaryTokenStore(BaseTemporaryTokenStore):
+    """
+    Keeps temporary tokens in the ExpiringToken table.
+    """
+
+    def issue(self, user):
+        now = timezone.now()
+        fields = {
+            "key": ExpiringToken.generate_key(),
+            "created_at": now,
+            "expires_at": now + settings.TOKEN_EXPIRATION_TIME,
+        }
+        # The key is the primary key, so it can't be part of an upsert; rotate
+        # it in place with a single UPDATE and only INSERT the first token.
+        if not ExpiringToken.objects.filter(user=user).update(**fields):
+            try:
+                with transaction.atomic():
+                    ExpiringToken.objects.bulk_create(
+                        [ExpiringToken(user=user, **fields)]
+                    )
+            except IntegrityError:
+                # Another request issued the first token concurrently
+                ExpiringToken.objects.filter(user=user).update(**fields)
+        return fields["key"]
+
+    def get(self, key):
+        return ExpiringToken.objects.select_related("user").filter(key=key).first()
+
+    def revoke(self, user):
+        ExpiringToken.objects.filter(user=user).delete()
+
+
+class CacheTemporaryTokenStore(BaseTemporaryTokenStore):
+    """
+    Keeps temporary tokens in the cache, relying on its native TTLs for expiry.
+
+    Keys have the form ``tmp_<user pk>.<secret>`` and only the secret is
+    stored, under one cache key per user, so issuing a token is a single
+    cache write that also replaces the previous one. Lookups resolve the user
+    through the user snapshot cache and don't touch the database.
+    """
+
+    def __init__(self):
+        self.cache = caches[getattr(settings, "TEMPORARY_TOKEN_CACHE", "default")]
+
+    def _cache_key(self, user_pk):
+        return f"temporary-token:{user_pk}"
+
+    def issue(self, user):
+        lifetime = settings.TOKEN_EXPIRATION_TIME
+        secret = get_random_string(length=32)
+        expires_at = (timezone.now() + lifetime).timestamp()
+        self.cache.set(
+            self._cache_key(user.pk),
+            (secret, expires_at),
+            timeout=lifetime.total_seconds(),
+        )
+        cache_user(user)
+        return f"{TEMPORARY_TOKEN_PREFIX}{user.pk}.{secret}"
+
+    def get(self, key):
+        user_pk, _, secret = key[len(TEMPORARY_TOKEN_PREFIX) :].partition(".")
+        if not user_pk.isdigit() or not secret:
+            return None
+
+        entry = self.cache.get(self._cache_key(user_pk))
+        if entry is None or not constant_time_compare(entry[0], secret):
+            return None
+
+        user = get_cached_user_by_pk(int(user_pk))
+        if user is None:
+            return None
+        expires_at = datetime.fromtimestamp(entry[1], tz=dt_timezone.utc)
+        return TemporaryToken(key, user, expires_at)
+
+    def revoke(self, user):
+        self.cache.delete(self._cache_key(user.pk))
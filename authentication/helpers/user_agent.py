@@ -0,0 +1,51 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import hashlib
+
+from django.conf import settings
+from user_agents import parse
+
+from core.helpers.cache_utils import LRUCache
+
+# Per-process LRU of parsed user agents, keyed by a digest of the raw header.
+# Parsed UserAgent objects are read-only and shared between requests.
+user_agent_cache = LRUCache(maxsize=getattr(settings, "USER_AGENT_CACHE_SIZE", 1024))
+
+
+def get_user_agent_string(request):
+    ua_string = getattr(request, "META", {}).get("HTTP_USER_AGENT", "")
+    if isinstance(ua_string, bytes):
+        ua_string = ua_string.decode("utf-8", "ignore")
+    return ua_string
+
+
+def parse_user_agent(ua_string):
+    """
+    Parses a user agent string, at most once per distinct string and process
+    while it stays in the cache.
+    """
+    cache_key = hashlib.blake2b(ua_string.encode(), digest_size=16).digest()
+    user_agent = user_agent_cache.get(cache_key)
+    if user_agent is None:
+        user_agent = parse(ua_string)
+        user_agent_cache.set(cache_key, user_agent)
+    return user_agent
+
+
+def get_user_agent(request):
+    """
+    Returns the parsed user agent of the request, reusing the one attached by
+    UserAgentMiddleware when there is one.
+    """
+    user_agent = getattr(request, "user_agent", None)
+    if user_agent is not None:
+        return user_agent
+    return parse_user_agent(get_user_agent_string(request))
@@ -0,0 +1,130 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+User = get_user_model()
+
+
+def get_user_cache_timeout():
+    return settings.SIMPLE_JWT.get("USER_CACHE_TIMEOUT", 300)
+
+
+def _pk_key(pk):
+    return f"user-snapshot:pk:{pk}"
+
+
+def _identifier_key(identifier):
+    digest = hashlib.sha1(str(identifier).encode()).hexdigest()
+    return f"user-snapshot:identifier:{digest}"
+
+
+def _identifiers(user):
+    return [str(value) for value in (user.email, user.phone_number) if value]
+
+
+# Kept out of the shared cache, read from the database when needed
+SNAPSHOT_EXCLUDED_FIELDS = {"password"}
+
+
+def build_snapshot(user):
+    """
+    Returns a lightweight, picklable snapshot of the user's concrete fields,
+    without the password hash.
+    """
+    return {
+        field.attname: field.get_prep_value(getattr(user, field.attname))
+        for field in User._meta.concrete_fields
+        if field.attname not in SNAPSHOT_EXCLUDED_FIELDS
+    }
+
+
+def user_from_snapshot(snapshot):
+    """
+    Rebuilds a User instance from a snapshot without touching the database.
+    The password is left deferred, so reading it loads it from the database.
+    """
+    field_names = list(snapshot.keys())
+    return User.from_db("default", field_names, [snapshot[f] for f in field_names])
+
+
+def cache_user(user):
+    """
+    Stores the user's snapshot by pk, and maps its identifiers (email and
+    phone number) to that pk.
+    """
+    timeout = get_user_cache_timeout()
+    entries = {
+        _identifier_key(identifier): user.pk for identifier in _identifiers(user)
+    }
+    entries[_pk_key(user.pk)] = build_snapshot(user)
+    cache.set_many(entries, timeout)
+
+
+def invalidate_user(user):
+    """
+    Drops the cached snapshot of a user (instance or pk) and, when an
+    instance is given, the identifier mappings that point to it.
+    """
+    if isinstance(user, User):
+        keys = [_pk_key(user.pk)]
+        keys += [_identifier_key(identifier) for identifier in _identifiers(user)]
+    else:
+        keys = [_pk_key(user)]
+
+    cache.delete_many(keys)
+    # Drop again once the transaction commits, so a concurrent request can't
+    # repopulate the cache with rows from before the change.
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def get_cached_user_by_pk(pk):
+    """
+    Resolves a user by primary key from the cache, falling back to the database.
+    """
+    snapshot = cache.get(_pk_key(pk))
+    if snapshot is not None:
+        return user_from_snapshot(snapshot)
+
+    user = User.objects.filter(pk=pk).first()
+    if user is not None:
+        cache_user(user)
+    return user
+
+
+def get_cached_user(identifier):
+    """
+    Resolves a user by email or phone number from the cache, falling back to
+    a single database query.
+    """
+    pk = cache.get(_identifier_key(identifier))
+    if pk is not None:
+        snapshot = cache.get(_pk_key(pk))
+        # The identifier mapping is only trusted if the snapshot still matches it
+        if snapshot is not None and identifier in (
+            snapshot["email"],
+            str(snapshot["phone_number"]),
+        ):
+            return user_from_snapshot(snapshot)
+
+    user = (
+        User.objects.filter(Q(email=identifier) | Q(phone_number=identifier))
+        .order_by()
+        .first()
+    )
+    if user is not None:
+        cache_user(user)
+    return user
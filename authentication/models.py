@@ -11,8 +11,6 @@
 from django.conf import settings
 from django_otp.plugins.otp_email.models import EmailDevice as DefaultEmailDevice
 
-from core.helpers.email_utils import EmailHelper
-
 
 class CustomEmailDevice(DefaultEmailDevice):
     def generate_challenge(self, extra_context=None):
@@ -26,12 +24,10 @@ class CustomEmailDevice(DefaultEmailDevice):
         """
         self.generate_token(valid_secs=settings.OTP_EMAIL_TOKEN_VALIDITY)
 
-        subject = settings.OTP_EMAIL_SUBJECT
-        template_name = settings.OTP_EMAIL_BODY_TEMPLATE
-        context = {"token": self.token}
-        to_email = self.user.email
-        email_helper = EmailHelper(subject, template_name, context)
-        email_helper.send_email(to_email)
+        # Only the device is queued, the token is read back when sending
+        from authentication.tasks import send_otp_email
+
+        send_otp_email.delay(self.pk)
 
         message = "sent by email"
 
@@ -9,38 +9,93 @@
 
 
 from django.conf import settings
-from django.contrib.auth import get_user_model
-from django.db.models import Q
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from django.contrib.auth import authenticate, get_user_model
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework import serializers
 
 from accounts.serializers import UserSerializer
+from authentication.helpers.user_cache import get_cached_user_by_pk
+from authentication.tokens import RefreshToken, get_token_version
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RefreshToken
+
     def validate(self, attrs):
-        email_or_phone_number = attrs.get("email")
-        user = (
-            get_user_model()
-            .objects.filter(
-                Q(email=email_or_phone_number) | Q(phone_number=email_or_phone_number)
-            )
-            .first()
+        """
+        Authenticates the user by email or phone number through `authenticate()`
+        with a single lookup, and signs a single refresh token, whose access
+        token is derived from it.
+
+        The serialized user is left out, so the 2FA flow doesn't pay for it;
+        add it with `get_user_data` once the tokens are actually handed out.
+        """
+        # Goes through the authentication backends, which resolve the email or
+        # phone number and send `user_login_failed` when it doesn't match
+        user = authenticate(
+            self.context.get("request"),
+            **{
+                self.username_field: attrs.get(self.username_field),
+                "password": attrs["password"],
+            },
         )
 
-        if user:
-            attrs["email"] = user.email
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise exceptions.AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+        self.user = user
+
+        refresh = self.get_token(user)
+        access = refresh.access_token
+        data = {"refresh": str(refresh), "access": str(access)}
 
-        data = super().validate(attrs)
+        if api_settings.UPDATE_LAST_LOGIN:
+            user.last_login = timezone.now()
+            get_user_model().objects.filter(pk=user.pk).update(
+                last_login=user.last_login
+            )
 
-        refresh = self.get_token(self.user)
         data["header_types"] = settings.SIMPLE_JWT["AUTH_HEADER_TYPES"]
-        data["refresh_expires"] = refresh.access_token.payload["exp"]
+        data["refresh_expires"] = access.payload["exp"]
         data["access_expires"] = refresh.payload["exp"]
-        data["user"] = UserSerializer(self.user).data
 
         return data
 
+    def get_user_data(self):
+        """
+        Serializes the authenticated user, its permission codenames are
+        loaded with two queries.
+        """
+        return UserSerializer(self.user).data
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refuses to refresh tokens of users that were deactivated or whose tokens
+    were revoked after the refresh token was issued.
+    """
+
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user = get_cached_user_by_pk(refresh.payload.get(api_settings.USER_ID_CLAIM))
+        if (
+            user is None
+            or not user.is_active
+            or get_token_version(refresh.payload) != user.token_version
+        ):
+            raise InvalidToken("Token has been revoked")
+        return super().validate(attrs)
+
 
 class CustomTokenObtainPairResponseSerializer(serializers.Serializer):
     refresh = serializers.CharField()
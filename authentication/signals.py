@@ -8,22 +8,103 @@
 #
 
 
-from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+)
 from django.dispatch import receiver
-from django_rest_passwordreset.signals import reset_password_token_created
+from django_rest_passwordreset.signals import (
+    post_password_reset,
+    reset_password_token_created,
+)
 
-from core.helpers.email_utils import EmailHelper
+from authentication.helpers.user_cache import invalidate_user
+from core.helpers.permission_utils import (
+    invalidate_group_permissions,
+    invalidate_permissions,
+    reset_permission_catalog,
+)
+
+User = get_user_model()
 
 
 @receiver(reset_password_token_created)
 def password_reset_token_created(
     sender, instance, reset_password_token, *args, **kwargs
 ):
-    email_plaintext_message = settings.RESET_PASSWORD_URL + reset_password_token.key
-    EmailHelper(
-        subject="Reset Password",
-        template_name="emails/password_reset.html",
-        context={
-            "reset_password_url": email_plaintext_message,
-        },
-    ).send_email(to_email=reset_password_token.user.email)
+    # Only the token's pk is queued, the reset URL is built when sending
+    from authentication.tasks import send_password_reset_email
+
+    send_password_reset_email.delay(reset_password_token.pk)
+
+
+@receiver(post_password_reset)
+def revoke_tokens_on_password_reset(sender, user, *args, **kwargs):
+    user.revoke_tokens()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    invalidate_user(instance)
+    invalidate_permissions([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_user_snapshot_on_access_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    Drops cached snapshots and permissions when a user's groups or
+    permissions change, from either side of the relation.
+    """
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate_user(instance)
+            invalidate_permissions([instance.pk])
+    elif action in ("post_add", "post_remove"):
+        for user_pk in pk_set:
+            invalidate_user(user_pk)
+        invalidate_permissions(pk_set)
+    elif action == "pre_clear":
+        user_pks = list(instance.user_set.values_list("pk", flat=True))
+        for user_pk in user_pks:
+            invalidate_user(user_pk)
+        invalidate_permissions(user_pks)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_permissions_on_group_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    Drops the cached permissions of a group's members when the group's
+    permissions change, from either side of the relation.
+    """
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate_group_permissions([instance.pk])
+    elif action in ("post_add", "post_remove"):
+        invalidate_group_permissions(pk_set)
+    elif action == "pre_clear":
+        invalidate_group_permissions(instance.group_set.values_list("pk", flat=True))
+
+
+@receiver(pre_delete, sender=Group)
+def invalidate_permissions_on_group_delete(sender, instance, **kwargs):
+    # Memberships are deleted without m2m_changed signals
+    invalidate_group_permissions([instance.pk])
+
+
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+@receiver(post_migrate)
+def reset_permission_catalog_on_change(**kwargs):
+    # Tokens minted against the previous catalog fall back to the backends
+    reset_permission_catalog()
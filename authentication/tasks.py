@@ -0,0 +1,67 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+# Tasks carrying a secret only receive the pk of the row holding it, the secret
+# is read back when the task runs so it is never stored in the task queue.
+
+from django.conf import settings
+from django.utils import timezone
+from django_rest_passwordreset.models import ResetPasswordToken
+from two_factor.plugins.phonenumber.models import PhoneDevice
+
+from authentication.gateways import CustomTwilioGateWay
+from authentication.models import CustomEmailDevice
+from core.helpers.email_utils import EmailHelper
+from core.helpers.task_queue import task
+
+
+@task
+def send_otp_email(device_pk):
+    device = CustomEmailDevice.objects.select_related("user").filter(pk=device_pk)
+    device = device.first()
+    # Skip challenges that were used or expired before they could be sent
+    if device is None or device.token is None or device.valid_until < timezone.now():
+        return
+
+    EmailHelper(
+        settings.OTP_EMAIL_SUBJECT,
+        settings.OTP_EMAIL_BODY_TEMPLATE,
+        {"token": device.token},
+    ).send_email(device.user.email)
+
+
+@task
+def send_otp_sms(device_pk, challenged_at):
+    # Skip challenges whose temporary token expired while the task was waiting
+    # or retrying, rather than paying for an SMS nobody can use
+    age = timezone.now().timestamp() - challenged_at
+    if age > settings.TOKEN_EXPIRATION_TIME.total_seconds():
+        return
+
+    device = PhoneDevice.objects.filter(pk=device_pk).first()
+    if device is None:
+        return
+
+    gateway = CustomTwilioGateWay()
+    gateway.deliver_sms(device.number.as_e164, gateway.render_sms(device))
+
+
+@task
+def send_password_reset_email(reset_password_token_pk):
+    token = ResetPasswordToken.objects.select_related("user")
+    token = token.filter(pk=reset_password_token_pk).first()
+    # The token was used or reaped meanwhile
+    if token is None:
+        return
+
+    EmailHelper(
+        subject="Reset Password",
+        template_name="emails/password_reset.html",
+        context={"reset_password_url": settings.RESET_PASSWORD_URL + token.key},
+    ).send_email(token.user.email)
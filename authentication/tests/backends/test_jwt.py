@@ -10,10 +10,11 @@
 
 from django.test import TestCase, RequestFactory
 from django.contrib.auth import get_user_model
-from authentication.backends import JWTAuthentication
+from authentication.backends import JWTAuthentication, verified_token_cache
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.exceptions import ParseError
 from datetime import datetime, timedelta
+from unittest import mock
 import jwt
 from django.conf import settings
 
@@ -28,6 +29,7 @@ class JWTAuthenticationTest(TestCase):
             email="testuser@test.com", password="password"
         )
         self.auth = JWTAuthentication()
+        verified_token_cache.clear()
 
     def test_authenticate_valid_token(self):
         jwt_token = self.auth.create_jwt(self.user)
@@ -113,3 +115,35 @@ class JWTAuthenticationTest(TestCase):
         request = self.factory.get("/")
         result = self.auth.authenticate_header(request)
         self.assertEqual(result, "Bearer")
+
+    def test_repeated_token_skips_verification(self):
+        jwt_token = self.auth.create_jwt(self.user)
+        self.auth.authenticate(
+            self.factory.get("/", HTTP_AUTHORIZATION="Bearer " + jwt_token)
+        )
+        request = self.factory.get("/", HTTP_AUTHORIZATION="Bearer " + jwt_token)
+        with mock.patch("authentication.backends.jwt.decode") as mock_decode:
+            user, payload = self.auth.authenticate(request)
+
+        mock_decode.assert_not_called()
+        self.assertEqual(user, self.user)
+        self.assertEqual(payload["user_identifier"], self.user.email)
+        stats = verified_token_cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_expired_token_is_not_served_from_cache(self):
+        jwt_token = self.auth.create_jwt(self.user)
+        self.auth.authenticate(
+            self.factory.get("/", HTTP_AUTHORIZATION="Bearer " + jwt_token)
+        )
+        request = self.factory.get("/", HTTP_AUTHORIZATION="Bearer " + jwt_token)
+
+        with mock.patch("core.helpers.cache_utils.time.time") as mock_time, mock.patch(
+            "authentication.backends.jwt.decode", side_effect=jwt.ExpiredSignatureError
+        ) as mock_decode:
+            mock_time.return_value = datetime.now().timestamp() + 10 * 3600
+            with self.assertRaises(ParseError):
+                self.auth.authenticate(request)
+
+        mock_decode.assert_called_once()
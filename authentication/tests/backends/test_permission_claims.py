@@ -0,0 +1,132 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import jwt
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from accounts.views import UsersViewSet
+from authentication.tokens import (
+    PERMISSION_CATALOG_CLAIM,
+    PERMISSIONS_CLAIM,
+    RefreshToken,
+    get_claimed_permissions,
+)
+from core.helpers.permission_utils import (
+    decode_permission_mask,
+    encode_permission_mask,
+    get_permission_catalog,
+)
+from core.permissions import IsSuperUserOrDjangoModelPermissions
+
+User = get_user_model()
+
+
+def decode(token):
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+
+
+@override_settings(SIMPLE_JWT={**settings.SIMPLE_JWT, "PERMISSION_CLAIMS": True})
+class PermissionClaimsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="user@test.com", password="password", phone_number="+905000000001"
+        )
+        self.group = Group.objects.create(name="viewers")
+        self.group.permissions.add(Permission.objects.get(codename="view_user"))
+        self.user.groups.add(self.group)
+
+    def check_list_permission(self, payload):
+        request = Request(APIRequestFactory().get("/accounts/users/"))
+        request.user = User.objects.get(pk=self.user.pk)
+        request.auth = payload
+        view = UsersViewSet(action="list", request=request, format_kwarg=None)
+        return IsSuperUserOrDjangoModelPermissions().has_permission(request, view)
+
+    def test_mask_round_trip(self):
+        catalog = get_permission_catalog()
+        permissions = {"core.view_user", "auth.add_group", "unknown.permission"}
+        encoded = encode_permission_mask(permissions, catalog)
+
+        self.assertEqual(
+            decode_permission_mask(encoded, catalog.version),
+            {"core.view_user", "auth.add_group"},
+        )
+        self.assertIsNone(decode_permission_mask(encoded, "stale"))
+        self.assertIsNone(decode_permission_mask("!!", catalog.version))
+
+    def test_login_access_token_carries_permissions(self):
+        response = APIClient().post(
+            reverse("authentication:token_obtain_pair"),
+            {"email": "user@test.com", "password": "password"},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        access = decode(response.data["access"])
+        self.assertEqual(get_claimed_permissions(access), {"core.view_user"})
+        self.assertNotIn(PERMISSIONS_CLAIM, decode(response.data["refresh"]))
+
+    def test_authorizes_from_claims_without_cache_or_database(self):
+        payload = dict(RefreshToken.for_user(self.user).access_token.payload)
+        request_user = User.objects.get(pk=self.user.pk)
+        cache.clear()
+
+        request = Request(APIRequestFactory().get("/accounts/users/"))
+        request.user = request_user
+        request.auth = payload
+        view = UsersViewSet(action="list", request=request, format_kwarg=None)
+        with self.assertNumQueries(0):
+            self.assertTrue(
+                IsSuperUserOrDjangoModelPermissions().has_permission(request, view)
+            )
+
+        request = Request(APIRequestFactory().post("/accounts/users/"))
+        request.user = request_user
+        request.auth = payload
+        view = UsersViewSet(action="create", request=request, format_kwarg=None)
+        with self.assertNumQueries(0):
+            self.assertFalse(
+                IsSuperUserOrDjangoModelPermissions().has_permission(request, view)
+            )
+
+    def test_older_catalog_falls_back(self):
+        payload = dict(RefreshToken.for_user(self.user).access_token.payload)
+        payload[PERMISSION_CATALOG_CLAIM] = "stale"
+        self.assertIsNone(get_claimed_permissions(payload))
+
+        # Checked against the permission backends instead
+        self.assertTrue(self.check_list_permission(payload))
+        self.group.permissions.clear()
+        self.assertFalse(self.check_list_permission(payload))
+
+    def test_refresh_picks_up_permission_changes(self):
+        refresh = RefreshToken.for_user(self.user)
+        self.group.permissions.add(Permission.objects.get(codename="add_user"))
+
+        response = APIClient().post(
+            reverse("authentication:token_refresh"), {"refresh": str(refresh)}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            get_claimed_permissions(decode(response.data["access"])),
+            {"core.view_user", "core.add_user"},
+        )
+
+    @override_settings(SIMPLE_JWT={**settings.SIMPLE_JWT, "PERMISSION_CLAIMS": False})
+    def test_disabled_by_default(self):
+        access = RefreshToken.for_user(self.user).access_token
+        self.assertNotIn(PERMISSIONS_CLAIM, access.payload)
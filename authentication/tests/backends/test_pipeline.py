@@ -0,0 +1,97 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from unittest import mock
+
+import jwt
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication.backends import (
+    JWTAuthentication,
+    TemporaryTokenAuthentication,
+    verified_token_cache,
+)
+from core.models import ExpiringToken
+
+User = get_user_model()
+
+
+class AuthenticationPipelineTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        verified_token_cache.clear()
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(
+            email="testuser@test.com", password="password", phone_number="+905000000000"
+        )
+        self.access = str(RefreshToken.for_user(self.user).access_token)
+
+    def test_request_decodes_token_and_loads_user_once(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+        with mock.patch(
+            "authentication.backends.jwt.decode", wraps=jwt.decode
+        ) as mock_decode, CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse("accounts:users-me"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_decode.call_count, 1)
+        user_lookups = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith('SELECT "core_user"."id"')
+            and 'WHERE "core_user"."id" =' in query["sql"]
+        ]
+        self.assertEqual(len(user_lookups), 1)
+
+    def test_authentication_is_memoized_on_request(self):
+        request = self.factory.get("/", HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        with mock.patch(
+            "authentication.backends.jwt.decode", wraps=jwt.decode
+        ) as mock_decode:
+            JWTAuthentication().authenticate(request)
+            JWTAuthentication().authenticate(request)
+            TemporaryTokenAuthentication().authenticate(request)
+        self.assertEqual(mock_decode.call_count, 1)
+
+    def test_token_kinds_are_routed_to_one_authenticator(self):
+        token = ExpiringToken.objects.create(user=self.user)
+        temp_request = self.factory.get("/", HTTP_AUTHORIZATION=f"Bearer {token.key}")
+        self.assertIsNone(JWTAuthentication().authenticate(temp_request))
+        self.assertEqual(
+            TemporaryTokenAuthentication().authenticate(temp_request)[0], self.user
+        )
+
+        access_request = self.factory.get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {self.access}"
+        )
+        self.assertIsNone(TemporaryTokenAuthentication().authenticate(access_request))
+        self.assertEqual(JWTAuthentication().authenticate(access_request)[0], self.user)
+
+    def test_refresh_token_is_rejected_as_access_token(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh}")
+        response = client.get(reverse("accounts:users-me"))
+        self.assertEqual(response.status_code, 401)
+
+    def test_invalid_access_token_is_rejected_by_middleware(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+        response = client.get(reverse("accounts:users-me"))
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,99 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from unittest.mock import patch
+
+import jwt
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+
+from authentication.backends import JWTAuthentication
+from authentication.tokens import TOKEN_VERSION_CLAIM, RefreshToken
+
+User = get_user_model()
+
+
+class TokenRevocationTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="testuser@test.com",
+            password="testpassword",
+            phone_number="+905000000000",
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}"
+        )
+
+    def test_tokens_carry_user_and_version(self):
+        self.assertEqual(self.refresh.access_token["user_id"], self.user.pk)
+        self.assertEqual(self.refresh.access_token[TOKEN_VERSION_CLAIM], 0)
+
+        payload = jwt.decode(
+            JWTAuthentication.create_jwt(self.user),
+            settings.SECRET_KEY,
+            algorithms=[settings.SIMPLE_JWT["ALGORITHM"]],
+        )
+        self.assertEqual(payload["user_id"], self.user.pk)
+        self.assertEqual(payload[TOKEN_VERSION_CLAIM], 0)
+        self.assertNotIn("email", payload)
+        self.assertNotIn("phone_number", payload)
+
+    def test_revoked_access_token_is_rejected(self):
+        self.assertEqual(self.client.get(reverse("accounts:users-me")).status_code, 200)
+        self.user.revoke_tokens()
+        self.assertEqual(self.client.get(reverse("accounts:users-me")).status_code, 401)
+
+    def test_revoked_refresh_token_is_rejected(self):
+        self.user.revoke_tokens()
+        response = self.client.post(
+            reverse("authentication:token_refresh"),
+            {"refresh": str(self.refresh)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_keeps_token_version(self):
+        response = self.client.post(
+            reverse("authentication:token_refresh"),
+            {"refresh": str(self.refresh)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.assertEqual(client.get(reverse("accounts:users-me")).status_code, 200)
+
+    def test_logout_all_revokes_tokens(self):
+        response = self.client.post(reverse("authentication:logout_all"))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.client.get(reverse("accounts:users-me")).status_code, 401)
+
+    @patch("core.helpers.email_utils.EmailHelper.send_email")
+    def test_password_change_revokes_tokens(self, mock_send_email):
+        response = self.client.post(
+            reverse("accounts:users-change-password"),
+            {"old_password": "testpassword", "new_password": "N3w_pa55word!"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.client.get(reverse("accounts:users-me")).status_code, 401)
+
+    def test_deactivation_bumps_token_version(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+        user.refresh_from_db()
+        self.assertEqual(user.token_version, 1)
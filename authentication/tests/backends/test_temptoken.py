@@ -56,7 +56,7 @@ class TemporaryTokenAuthenticationTest(TestCase):
             self.auth.authenticate(request)
 
     def test_authenticate_invalid_token(self):
-        request = self.factory.get("/", HTTP_AUTHORIZATION="Bearer invalidtoken")
+        request = self.factory.get("/", HTTP_AUTHORIZATION="Bearer tmp_invalidtoken")
 
         with self.assertRaises(AuthenticationFailed):
             self.auth.authenticate(request)
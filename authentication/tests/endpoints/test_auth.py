@@ -11,10 +11,11 @@
 from django.test import TestCase
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_login_failed
 from django.urls import reverse
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework import status
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 from rest_framework_simplejwt.exceptions import TokenError
 from authentication.models import CustomEmailDevice
 from core.models import UserDevice
@@ -56,6 +57,27 @@ class CustomTokenObtainPairViewTestCase(TestCase):
         response = self.client.post(reverse("authentication:token_obtain_pair"), data)
         self.assertEqual(response.status_code, 401)
 
+    def test_authenticate_with_phone_number(self):
+        data = {"email": "+905555555550", "password": "testpass"}
+        response = self.client.post(reverse("authentication:token_obtain_pair"), data)
+        self.assertEqual(response.status_code, 200)
+
+    def test_authenticate_fail_sends_login_failed_signal(self):
+        handler = Mock()
+        user_login_failed.connect(handler)
+        self.addCleanup(user_login_failed.disconnect, handler)
+
+        data = {"email": "testuser@test.com", "password": "wrongpass"}
+        response = self.client.post(reverse("authentication:token_obtain_pair"), data)
+        self.assertEqual(response.status_code, 401)
+        handler.assert_called_once()
+        self.assertEqual(
+            handler.call_args.kwargs["credentials"]["email"], "testuser@test.com"
+        )
+        self.assertNotEqual(
+            handler.call_args.kwargs["credentials"]["password"], "wrongpass"
+        )
+
     @patch("authentication.helpers.otp_helper.OTPLoginFlowHelper.start_otp_flow")
     def test_start_otp_flow(self, start_otp_flow_mock):
         start_otp_flow_mock.return_value = None
@@ -0,0 +1,173 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import statistics
+import time
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from authentication.models import CustomEmailDevice
+from authentication.tokens import (
+    PERMISSIONS_CLAIM,
+    AccessToken,
+    add_permission_claims,
+)
+from core.models import UserDevice
+
+User = get_user_model()
+
+# Statements a login may issue once the device is known, savepoints excluded
+MAX_LOGIN_QUERIES = 8
+MAX_2FA_LOGIN_QUERIES = 6
+MAX_2FA_COMPLETION_QUERIES = 12
+MAX_P95_SECONDS = 0.25
+ROUNDS = 20
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class LoginBudgetTest(TestCase):
+    def setUp(self):
+        self.client = APIClient(HTTP_USER_AGENT="Other / Other / Other")
+        self.url = reverse("authentication:token_obtain_pair")
+        group = Group.objects.create(name="support")
+        group.permissions.set(Permission.objects.all()[:10])
+
+        self.user = User.objects.create_user(
+            email="testuser@test.com", password="testpass", phone_number="+905555555550"
+        )
+        self.user.groups.add(group)
+        self.user.user_permissions.set(Permission.objects.all()[10:15])
+
+        self.user_otp = User.objects.create_user(
+            email="testuser2@test.com",
+            password="testpass",
+            phone_number="+905555555551",
+            enabled_2fa=True,
+            default_2fa_method="email",
+        )
+        self.user_otp.groups.add(group)
+        CustomEmailDevice.objects.create(
+            user=self.user_otp, name="email", confirmed=True
+        )
+
+    def _measure(self, client, url, data):
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            response = client.post(url, data, format="json")
+            elapsed = time.perf_counter() - started
+        queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if "SAVEPOINT" not in query["sql"]
+        ]
+        return response, queries, elapsed
+
+    def _login(self, email):
+        return self._measure(
+            self.client, self.url, {"email": email, "password": "testpass"}
+        )
+
+    def _start_2fa(self):
+        """
+        Logs in the 2FA user and returns the client and data completing it.
+        """
+        response, _, _ = self._login("testuser2@test.com")
+        self.assertEqual(response.status_code, 202)
+        device = CustomEmailDevice.objects.get(user=self.user_otp)
+        device.generate_token()
+        client = APIClient(
+            HTTP_USER_AGENT="Other / Other / Other",
+            HTTP_AUTHORIZATION=f"Bearer {response.data['token']}",
+        )
+        return client, {"type": "email", "token": device.token, "device_id": device.id}
+
+    def _complete_2fa(self):
+        client, data = self._start_2fa()
+        return self._measure(
+            client, reverse("authentication:token_otp_obtain_pair"), data
+        )
+
+    def _assert_budget(self, email, status_code, max_queries):
+        # The first login registers the device, later ones are the steady state
+        response, _, _ = self._login(email)
+        self.assertEqual(response.status_code, status_code)
+
+        timings = []
+        for _ in range(ROUNDS):
+            response, queries, elapsed = self._login(email)
+            self.assertEqual(response.status_code, status_code)
+            self.assertLessEqual(len(queries), max_queries, "\n".join(queries))
+            timings.append(elapsed)
+
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        self.assertLess(p95, MAX_P95_SECONDS)
+        return response
+
+    def test_login_budget(self):
+        response = self._assert_budget("testuser@test.com", 200, MAX_LOGIN_QUERIES)
+
+        self.assertEqual(
+            set(response.data["user"]["user_permissions"]),
+            set(Permission.objects.values_list("codename", flat=True)[:15]),
+        )
+        self.assertEqual(
+            response.data["user_device_id"],
+            UserDevice.objects.get(user=self.user).id,
+        )
+
+    def test_2fa_login_budget(self):
+        response = self._assert_budget("testuser2@test.com", 202, MAX_2FA_LOGIN_QUERIES)
+
+        self.assertEqual(response.data["default"], "email")
+        self.assertEqual(
+            response.data["devices"],
+            {"email": CustomEmailDevice.objects.get(user=self.user_otp).id},
+        )
+
+    def test_2fa_completion_budget(self):
+        # The first login registers the device, later ones are the steady state
+        self._complete_2fa()
+
+        timings = []
+        for _ in range(ROUNDS):
+            response, queries, elapsed = self._complete_2fa()
+            self.assertEqual(response.status_code, 200, response.data)
+            self.assertLessEqual(
+                len(queries), MAX_2FA_COMPLETION_QUERIES, "\n".join(queries)
+            )
+            timings.append(elapsed)
+
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        self.assertLess(p95, MAX_P95_SECONDS)
+
+    @override_settings(SIMPLE_JWT={**settings.SIMPLE_JWT, "PERMISSION_CLAIMS": True})
+    def test_2fa_completion_mints_one_access_token(self):
+        client, data = self._start_2fa()
+        with patch(
+            "authentication.tokens.add_permission_claims",
+            wraps=add_permission_claims,
+        ) as mock_add_claims:
+            response = client.post(
+                reverse("authentication:token_otp_obtain_pair"), data, format="json"
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        mock_add_claims.assert_called_once()
+
+        access = AccessToken(response.data["access"])
+        self.assertEqual(response.data["refresh_expires"], access.payload["exp"])
+        self.assertIn(PERMISSIONS_CLAIM, access.payload)
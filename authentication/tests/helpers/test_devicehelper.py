@@ -0,0 +1,105 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django_otp.plugins.otp_totp.models import TOTPDevice
+from two_factor.plugins.phonenumber.models import PhoneDevice
+
+from accounts.serializers import UserSerializer
+from authentication.helpers.device_helper import DeviceSummary, device_registry
+from authentication.models import CustomEmailDevice
+
+User = get_user_model()
+
+
+class DeviceRegistryTest(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                email=f"user{index}@test.com",
+                password="password",
+                phone_number=f"+90500000000{index}",
+            )
+            for index in range(3)
+        ]
+        user = self.users[0]
+        self.email = CustomEmailDevice.objects.create(
+            user=user, name="email", confirmed=True
+        )
+        self.totp = TOTPDevice.objects.create(user=user, name="totp", confirmed=False)
+        self.sms = PhoneDevice.objects.create(
+            user=self.users[1], name="sms", number="+905000000001", confirmed=True
+        )
+
+    def test_models_are_resolved_once(self):
+        with patch("authentication.helpers.device_helper.apps.get_model") as get_model:
+            self.assertIs(device_registry["email"], CustomEmailDevice)
+            self.assertEqual(list(device_registry), ["sms", "totp", "email"])
+        get_model.assert_not_called()
+
+    @override_settings(OTP_DEVICE_CLASSES={"totp": "otp_totp.TOTPDevice"})
+    def test_reloaded_when_the_setting_changes(self):
+        self.assertEqual(dict(device_registry), {"totp": TOTPDevice})
+
+    def test_user_devices_in_one_query(self):
+        with self.assertNumQueries(1):
+            devices = device_registry.get_user_devices(self.users[0])
+        self.assertEqual(
+            devices,
+            [
+                DeviceSummary("totp", self.totp.id, "totp", False),
+                DeviceSummary("email", self.email.id, "email", True),
+            ],
+        )
+        self.assertEqual(
+            device_registry.get_user_devices(self.users[0], confirmed=True),
+            [DeviceSummary("email", self.email.id, "email", True)],
+        )
+
+    def test_users_devices_in_one_query(self):
+        with self.assertNumQueries(1):
+            devices = device_registry.get_users_devices(
+                [user.pk for user in self.users], confirmed=True
+            )
+        self.assertEqual(
+            devices,
+            {
+                self.users[0].pk: [
+                    DeviceSummary("email", self.email.id, "email", True)
+                ],
+                self.users[1].pk: [DeviceSummary("sms", self.sms.id, "sms", True)],
+            },
+        )
+
+    def test_user_has_devices(self):
+        self.assertTrue(device_registry.user_has_devices(self.users[0]))
+        self.assertFalse(device_registry.user_has_devices(self.users[2]))
+
+    def test_user_list_loads_devices_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = UserSerializer(User.objects.all(), many=True).data
+
+        device_queries = [
+            query for query in queries.captured_queries if "UNION" in query["sql"]
+        ]
+        self.assertEqual(len(device_queries), 1)
+        self.assertEqual(
+            {user["email"]: user["otp_devices"] for user in data},
+            {
+                "user0@test.com": ["email"],
+                "user1@test.com": ["sms"],
+                "user2@test.com": [],
+            },
+        )
@@ -0,0 +1,94 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import re
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from twilio.base.exceptions import TwilioRestException
+from two_factor.plugins.phonenumber.models import PhoneDevice
+
+from authentication.gateways import CustomTwilioGateWay, get_twilio_client
+from authentication.helpers.fake_twilio import FakeTwilioServer
+from core.helpers.task_queue import Worker
+from core.models import DeadLetterTask, Task
+
+User = get_user_model()
+
+
+class CustomTwilioGateWayTest(TestCase):
+    def setUp(self):
+        self.server = FakeTwilioServer().start()
+        self.settings_override = override_settings(
+            TWILIO_API_BASE_URL=self.server.url,
+            TWILIO_CALLER_ID="+905000000001",
+            TWILIO_MESSAGING_SERVICE_SID=None,
+            TASK_QUEUE={"MAX_ATTEMPTS": 1},
+        )
+        self.settings_override.enable()
+        get_twilio_client.cache_clear()
+        user = User.objects.create_user(
+            email="testuser@test.com", password="testpass", phone_number="+905000000000"
+        )
+        self.device = PhoneDevice.objects.create(
+            user=user, name="sms", number=user.phone_number, method="sms"
+        )
+
+    def tearDown(self):
+        get_twilio_client.cache_clear()
+        self.settings_override.disable()
+        self.server.stop()
+
+    def test_otp_sms_is_sent_by_worker_over_one_connection(self):
+        for _ in range(2):
+            self.device.generate_challenge()
+        self.assertEqual(self.server.messages, [])
+        # Only the device and the challenge time are queued, never the token
+        self.assertEqual(
+            [task.payload["args"][0] for task in Task.objects.all()],
+            [self.device.pk, self.device.pk],
+        )
+
+        Worker().run_pending()
+
+        self.assertEqual(len(self.server.messages), 2)
+        self.assertEqual(self.server.messages[0]["to"], "+905000000000")
+        self.assertEqual(self.server.messages[0]["from"], "+905000000001")
+        token = re.search(r"\d{6}", self.server.messages[0]["body"]).group()
+        self.assertTrue(self.device.validate_token(token))
+        self.assertEqual(len(self.server.connections), 1)
+        self.assertFalse(Task.objects.exists())
+
+    def test_expired_challenges_are_not_sent(self):
+        self.device.generate_challenge()
+
+        later = timezone.now() + settings.TOKEN_EXPIRATION_TIME + timedelta(seconds=1)
+        with patch("django.utils.timezone.now", return_value=later):
+            Worker().run_pending()
+
+        self.assertEqual(self.server.messages, [])
+        self.assertFalse(Task.objects.exists())
+        self.assertFalse(DeadLetterTask.objects.exists())
+
+    def test_gateways_share_the_client(self):
+        self.assertIs(CustomTwilioGateWay().client, CustomTwilioGateWay().client)
+
+    def test_api_errors_fail_the_task(self):
+        self.server.error_rate = 1
+        with self.assertRaises(TwilioRestException):
+            CustomTwilioGateWay().deliver_sms("+905000000000", "123456")
+
+        CustomTwilioGateWay().send_sms(self.device, "123456")
+        Worker().run_pending()
+        self.assertIn("TwilioRestException", DeadLetterTask.objects.get().last_error)
@@ -12,6 +12,7 @@ from unittest.mock import patch, Mock
 from django.test import TestCase, RequestFactory
 from django.contrib.auth import get_user_model
 from authentication.helpers.login_helper import LogUserDevice
+from core.helpers.device_fingerprint import get_device_fingerprint
 
 
 class LogUserDeviceTest(TestCase):
@@ -44,6 +45,6 @@ class LogUserDeviceTest(TestCase):
         # Check if get_or_create was called on UserDevice
         mock_get_or_create.assert_called_once_with(
             user=user,
-            user_agent="Other / Other / Other",
-            ip_address="127.0.0.1",
+            fingerprint=get_device_fingerprint("Other / Other / Other", "127.0.0.1"),
+            defaults={"user_agent": "Other / Other / Other", "ip_address": "127.0.0.1"},
         )
@@ -0,0 +1,155 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from authentication.throttling import (
+    FIXED_WINDOW,
+    SLIDING_WINDOW,
+    DefaultRateThrottle,
+    LoginThrottle,
+)
+
+RATES = {
+    "DEFAULT_THROTTLE_RATES": {"user": "5/minute", "login": "3/minute"},
+}
+
+
+class FakeRedisPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def set(self, key, value, ex=None, nx=False):
+        self.commands.append(("set", key, value, nx))
+
+    def incr(self, key):
+        self.commands.append(("incr", key))
+
+    def get(self, key):
+        self.commands.append(("get", key))
+
+    def execute(self):
+        self.client.round_trips += 1
+        results = []
+        for command, key, *args in self.commands:
+            if command == "set":
+                value, nx = args
+                if nx and key in self.client.data:
+                    results.append(None)
+                    continue
+                self.client.data[key] = value
+                results.append(True)
+            elif command == "incr":
+                self.client.data[key] += 1
+                results.append(self.client.data[key])
+            else:
+                value = self.client.data.get(key)
+                results.append(None if value is None else str(value).encode())
+        return results
+
+
+class FakeRedisClient:
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return FakeRedisPipeline(self)
+
+
+class FakeRedisCache:
+    """
+    Looks like django.core.cache.backends.redis.RedisCache to the throttles.
+    """
+
+    def __init__(self):
+        self.client = FakeRedisClient()
+        self._cache = self
+
+    def get_client(self, write=False):
+        return self.client
+
+    def make_key(self, key):
+        return f":1:{key}"
+
+
+def make_throttle(throttle_class, cache, now, algorithm=SLIDING_WINDOW):
+    return type(
+        "TestThrottle",
+        (throttle_class,),
+        {"cache": cache, "algorithm": algorithm, "timer": lambda self: now},
+    )()
+
+
+@override_settings(REST_FRAMEWORK=RATES)
+class CounterRateThrottleTest(SimpleTestCase):
+    def setUp(self):
+        self.cache = LocMemCache("throttling", {})
+        self.cache.clear()
+        self.request = APIRequestFactory().post("/login/")
+        self.request.user = None
+
+    def hit(self, throttle_class, now, times=1, algorithm=SLIDING_WINDOW):
+        allowed = []
+        for _ in range(times):
+            throttle = make_throttle(throttle_class, self.cache, now, algorithm)
+            allowed.append(throttle.allow_request(self.request, None))
+        return allowed, throttle
+
+    def test_fixed_window_limits_and_resets(self):
+        allowed, throttle = self.hit(LoginThrottle, 60, times=4, algorithm=FIXED_WINDOW)
+        self.assertEqual(allowed, [True, True, True, False])
+        self.assertEqual(throttle.wait(), 60)
+
+        allowed, _ = self.hit(LoginThrottle, 120, algorithm=FIXED_WINDOW)
+        self.assertEqual(allowed, [True])
+
+    def test_memory_per_key_is_constant(self):
+        self.hit(LoginThrottle, 60, times=50)
+        # A single integer counter, however many requests were made
+        self.assertEqual(len(self.cache._cache), 1)
+        self.assertEqual(self.cache.get("throttle:login:127.0.0.1:60:1"), 50)
+
+    def test_sliding_window_weights_previous_window(self):
+        self.hit(LoginThrottle, 60, times=3)
+
+        # Halfway through the next window, 3 * 0.5 of the previous window
+        # still counts: one more request fits, the second does not
+        allowed, throttle = self.hit(LoginThrottle, 150, times=2)
+        self.assertEqual(allowed, [True, False])
+        self.assertEqual(throttle.wait(), 20)
+
+        # Once the previous window no longer overlaps, the limit is back
+        allowed, _ = self.hit(LoginThrottle, 240, times=3)
+        self.assertEqual(allowed, [True, True, True])
+
+    def test_default_throttle_checks_every_scope(self):
+        allowed, throttle = self.hit(DefaultRateThrottle, 60, times=4)
+        # The login scope (3/minute) is exceeded before the user scope
+        self.assertEqual(allowed, [True, True, True, False])
+        self.assertEqual(self.cache.get("throttle:user:127.0.0.1:60:1"), 4)
+        self.assertEqual(throttle.wait(), 60)
+
+    def test_redis_uses_one_round_trip_for_all_scopes(self):
+        cache = FakeRedisCache()
+        for expected in (True, True, True, False):
+            throttle = make_throttle(DefaultRateThrottle, cache, 60)
+            self.assertEqual(throttle.allow_request(self.request, None), expected)
+
+        self.assertEqual(cache.client.round_trips, 4)
+        self.assertEqual(cache.client.data[":1:throttle:login:127.0.0.1:60:1"], 4)
+
+        # The previous window is read back in the same round trip
+        throttle = make_throttle(DefaultRateThrottle, cache, 130)
+        self.assertFalse(throttle.allow_request(self.request, None))
+        self.assertEqual(cache.client.round_trips, 5)
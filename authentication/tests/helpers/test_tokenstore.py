@@ -0,0 +1,82 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+
+from authentication.backends import TemporaryTokenAuthentication
+from authentication.helpers.token_store import (
+    CacheTemporaryTokenStore,
+    DatabaseTemporaryTokenStore,
+)
+from core.models import TEMPORARY_TOKEN_PREFIX, ExpiringToken
+
+User = get_user_model()
+
+
+class DatabaseTemporaryTokenStoreTest(TestCase):
+    def setUp(self):
+        self.store = DatabaseTemporaryTokenStore()
+        self.user = User.objects.create_user(
+            email="testuser@test.com", password="password"
+        )
+
+    def test_reissue_is_a_single_query(self):
+        first_key = self.store.issue(self.user)
+        with self.assertNumQueries(1):
+            second_key = self.store.issue(self.user)
+
+        self.assertTrue(second_key.startswith(TEMPORARY_TOKEN_PREFIX))
+        self.assertNotEqual(first_key, second_key)
+        self.assertEqual(ExpiringToken.objects.filter(user=self.user).count(), 1)
+        self.assertIsNone(self.store.get(first_key))
+        self.assertEqual(self.store.get(second_key).user, self.user)
+
+    def test_revoke(self):
+        key = self.store.issue(self.user)
+        self.store.revoke(self.user)
+        self.assertIsNone(self.store.get(key))
+
+
+@override_settings(
+    TEMPORARY_TOKEN_STORE="authentication.helpers.token_store.CacheTemporaryTokenStore"
+)
+class CacheTemporaryTokenStoreTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.store = CacheTemporaryTokenStore()
+        self.user = User.objects.create_user(
+            email="testuser@test.com", password="password"
+        )
+
+    def test_lookup_does_not_touch_database(self):
+        key = self.user.generate_temporary_token()
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {key}")
+
+        with self.assertNumQueries(0):
+            user, token = TemporaryTokenAuthentication().authenticate(request)
+
+        self.assertEqual(user, self.user)
+        self.assertFalse(token.is_expired)
+        self.assertFalse(ExpiringToken.objects.exists())
+
+    def test_issue_replaces_previous_token(self):
+        first_key = self.store.issue(self.user)
+        second_key = self.store.issue(self.user)
+        self.assertIsNone(self.store.get(first_key))
+        self.assertEqual(self.store.get(second_key).user, self.user)
+
+    def test_revoke_and_malformed_keys(self):
+        key = self.store.issue(self.user)
+        self.user.delete_temporary_token()
+        self.assertIsNone(self.store.get(key))
+        self.assertIsNone(self.store.get(TEMPORARY_TOKEN_PREFIX + "garbage"))
+        self.assertIsNone(self.store.get(f"{TEMPORARY_TOKEN_PREFIX}{self.user.pk}."))
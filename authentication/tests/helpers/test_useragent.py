@@ -0,0 +1,71 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from user_agents import parse
+
+from authentication.helpers.user_agent import (
+    get_user_agent,
+    parse_user_agent,
+    user_agent_cache,
+)
+from core.middleware import UserAgentMiddleware
+
+FIREFOX = "Mozilla/5.0 (X11; Linux x86_64; rv:120.0) Gecko/20100101 Firefox/120.0"
+SAFARI = (
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_1 like Mac OS X) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.1 Mobile/15E148 Safari/604.1"
+)
+
+
+class UserAgentCacheTest(TestCase):
+    def setUp(self):
+        user_agent_cache.clear()
+
+    @patch("authentication.helpers.user_agent.parse", wraps=parse)
+    def test_parses_each_string_once(self, mock_parse):
+        for ua_string in (FIREFOX, SAFARI, FIREFOX, SAFARI, FIREFOX):
+            parse_user_agent(ua_string)
+
+        self.assertEqual(mock_parse.call_count, 2)
+        stats = user_agent_cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (3, 2))
+        self.assertEqual(stats["hit_rate"], 0.6)
+        self.assertEqual(str(parse_user_agent(FIREFOX)), str(parse(FIREFOX)))
+
+    @patch("authentication.helpers.user_agent.parse", wraps=parse)
+    def test_middleware_shares_the_parsed_user_agent(self, mock_parse):
+        request = RequestFactory().get("/", HTTP_USER_AGENT=FIREFOX)
+        UserAgentMiddleware(lambda request: None)(request)
+        mock_parse.assert_not_called()
+
+        self.assertEqual(get_user_agent(request).browser.family, "Firefox")
+        self.assertIs(get_user_agent(request), request.user_agent)
+        self.assertEqual(mock_parse.call_count, 1)
+
+    @patch("authentication.helpers.user_agent.parse", wraps=parse)
+    def test_login_parses_once(self, mock_parse):
+        get_user_model().objects.create_user(
+            email="testuser@test.com", password="password"
+        )
+        client = APIClient(HTTP_USER_AGENT=SAFARI)
+        for _ in range(3):
+            response = client.post(
+                reverse("authentication:token_obtain_pair"),
+                {"email": "testuser@test.com", "password": "password"},
+            )
+            self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(mock_parse.call_count, 1)
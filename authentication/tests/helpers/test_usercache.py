@@ -0,0 +1,96 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import time
+
+import jwt
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from authentication.backends import JWTAuthentication
+from authentication.helpers.user_cache import (
+    get_cached_user,
+    get_cached_user_by_pk,
+)
+
+User = get_user_model()
+
+
+class UserCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="testuser@test.com", password="password", phone_number="+905000000000"
+        )
+
+    def test_resolves_by_email_and_phone(self):
+        self.assertEqual(get_cached_user("testuser@test.com"), self.user)
+        self.assertEqual(get_cached_user("+905000000000"), self.user)
+        self.assertIsNone(get_cached_user("missing@test.com"))
+
+    def test_second_lookup_hits_no_database(self):
+        get_cached_user("testuser@test.com")
+        with self.assertNumQueries(0):
+            user = get_cached_user("testuser@test.com")
+            user_by_pk = get_cached_user_by_pk(self.user.pk)
+        self.assertEqual(user.email, self.user.email)
+        self.assertEqual(user_by_pk.pk, self.user.pk)
+        self.assertEqual(str(user.phone_number), "+905000000000")
+
+    def test_save_invalidates_snapshot(self):
+        get_cached_user("testuser@test.com")
+        self.user.first_name = "Changed"
+        self.user.save()
+        with self.assertNumQueries(1):
+            user = get_cached_user("testuser@test.com")
+        self.assertEqual(user.first_name, "Changed")
+
+    def test_changed_email_is_not_resolved_from_stale_mapping(self):
+        get_cached_user("testuser@test.com")
+        self.user.email = "renamed@test.com"
+        self.user.save()
+        self.assertIsNone(get_cached_user("testuser@test.com"))
+        self.assertEqual(get_cached_user("renamed@test.com"), self.user)
+
+    def test_group_change_invalidates_snapshot(self):
+        get_cached_user_by_pk(self.user.pk)
+        group = Group.objects.create(name="testgroup")
+        group.user_set.add(self.user)
+        with self.assertNumQueries(1):
+            get_cached_user_by_pk(self.user.pk)
+
+    def test_jwt_authentication_uses_cache(self):
+        auth = JWTAuthentication()
+        token = jwt.encode(
+            {"user_identifier": self.user.email, "exp": time.time() + 60},
+            settings.SECRET_KEY,
+            algorithm=settings.SIMPLE_JWT["ALGORITHM"],
+        )
+        factory = RequestFactory()
+        auth.authenticate(factory.get("/", HTTP_AUTHORIZATION="Bearer " + token))
+        request = factory.get("/", HTTP_AUTHORIZATION="Bearer " + token)
+        with self.assertNumQueries(0):
+            user, _ = auth.authenticate(request)
+        self.assertEqual(user, self.user)
+
+    def test_snapshot_leaves_out_the_password(self):
+        get_cached_user_by_pk(self.user.pk)
+        snapshot = cache.get(f"user-snapshot:pk:{self.user.pk}")
+        self.assertNotIn("password", snapshot)
+        self.assertNotIn(self.user.password, snapshot.values())
+
+        user = get_cached_user_by_pk(self.user.pk)
+        self.assertIn("password", user.get_deferred_fields())
+        # Loaded from the database when needed
+        with self.assertNumQueries(1):
+            self.assertTrue(user.check_password("password"))
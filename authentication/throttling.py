@@ -8,16 +8,221 @@
 #
 
 
-from rest_framework.throttling import SimpleRateThrottle
+import math
+import time
 
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
 
-class LoginThrottle(SimpleRateThrottle):
+FIXED_WINDOW = "fixed_window"
+SLIDING_WINDOW = "sliding_window"
+
+THROTTLING_DEFAULTS = {
+    # Use a cache shared by every worker (e.g. Redis) for global limits
+    "CACHE": "default",
+    "ALGORITHM": SLIDING_WINDOW,
+}
+
+
+def get_throttling_settings():
+    return {**THROTTLING_DEFAULTS, **getattr(settings, "THROTTLING", {})}
+
+
+def parse_rate(rate):
+    """
+    Parses a rate such as "100/minute" into (number of requests, seconds).
+    """
+    if rate is None:
+        return None, None
+    num, period = rate.split("/")
+    return int(num), {"s": 1, "m": 60, "h": 3600, "d": 86400}[period[0]]
+
+
+def get_redis_client(cache):
+    """
+    Returns the redis client behind a Django or django-redis cache backend,
+    or None for other backends.
+    """
+    backend = getattr(cache, "_cache", None)
+    if hasattr(backend, "get_client"):
+        return backend.get_client(write=True)
+    client = getattr(cache, "client", None)
+    if hasattr(client, "get_client"):
+        return client.get_client(write=True)
+    return None
+
+
+class CounterStore:
+    """
+    Keeps one integer counter per (scope, ident, window) in a cache.
+
+    With a redis cache every counter of a request is created, incremented and
+    read in a single pipelined round trip; other backends fall back to
+    `add` and `incr` per counter.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.redis = get_redis_client(cache)
+
+    def hit(self, increments, reads):
+        """
+        Increments the `increments` counters, given as (key, timeout) pairs,
+        and reads the `reads` counters. Returns both lists of values.
+        """
+        if self.redis is not None:
+            pipeline = self.redis.pipeline(transaction=False)
+            for key, timeout in increments:
+                key = self.cache.make_key(key)
+                pipeline.set(key, 0, ex=timeout, nx=True)
+                pipeline.incr(key)
+            for key in reads:
+                pipeline.get(self.cache.make_key(key))
+            results = pipeline.execute()
+            counts = results[1 : 2 * len(increments) : 2]
+            values = results[2 * len(increments) :]
+            return counts, [int(value or 0) for value in values]
+
+        counts = []
+        for key, timeout in increments:
+            self.cache.add(key, 0, timeout)
+            try:
+                counts.append(self.cache.incr(key))
+            except ValueError:
+                # The counter expired between add and incr
+                self.cache.set(key, 1, timeout)
+                counts.append(1)
+        values = self.cache.get_many(reads)
+        return counts, [values.get(key, 0) for key in reads]
+
+
+class CounterRateThrottle(BaseThrottle):
+    """
+    Rate throttle counting requests in fixed or sliding windows.
+
+    Unlike SimpleRateThrottle, which stores the timestamp of every request,
+    each (scope, ident) uses at most two integer counters, and all scopes of
+    a throttle are checked in one cache round trip. Subclasses return the
+    scopes that apply to a request from `get_scopes`.
+
+    The sliding window estimates the count over the last period by weighting
+    the previous window's counter by how much of it still overlaps. Every
+    request counts, including throttled ones.
+    """
+
+    timer = time.time
+    algorithm = None
+    cache = None
+
+    def __init__(self):
+        config = get_throttling_settings()
+        self.algorithm = self.algorithm or config["ALGORITHM"]
+        if self.algorithm not in (FIXED_WINDOW, SLIDING_WINDOW):
+            raise ImproperlyConfigured(
+                f"Unknown throttling algorithm '{self.algorithm}'"
+            )
+        self.store = CounterStore(self.cache or caches[config["CACHE"]])
+        self.waits = []
+
+    def get_scopes(self, request, view):
+        """
+        Returns (scope, ident) pairs to count the request against.
+        """
+        raise NotImplementedError(".get_scopes() must be overridden")
+
+    def get_rate(self, scope):
+        try:
+            return parse_rate(api_settings.DEFAULT_THROTTLE_RATES[scope])
+        except KeyError:
+            raise ImproperlyConfigured(
+                f"No default throttle rate set for '{scope}' scope"
+            )
+
+    def get_user_ident(self, request):
+        if request.user and request.user.is_authenticated:
+            return f"user:{request.user.pk}"
+        return self.get_ident(request)
+
+    def allow_request(self, request, view):
+        now = self.timer()
+        checks = []
+        for scope, ident in self.get_scopes(request, view):
+            num_requests, duration = self.get_rate(scope)
+            if num_requests is None or ident is None:
+                continue
+            window = int(now // duration)
+            key = f"throttle:{scope}:{ident}:{duration}"
+            checks.append((num_requests, duration, window, key))
+        if not checks:
+            return True
+
+        sliding = self.algorithm == SLIDING_WINDOW
+        increments = [
+            (f"{key}:{window}", duration * (2 if sliding else 1))
+            for _, duration, window, key in checks
+        ]
+        reads = (
+            [f"{key}:{window - 1}" for _, _, window, key in checks] if sliding else []
+        )
+        counts, previous_counts = self.store.hit(increments, reads)
+
+        self.waits = []
+        for index, (num_requests, duration, window, _) in enumerate(checks):
+            elapsed = now - window * duration
+            count = counts[index]
+            if sliding:
+                overlap = 1 - elapsed / duration
+                count += previous_counts[index] * overlap
+            if count > num_requests:
+                self.waits.append(
+                    self.get_wait(num_requests, duration, elapsed, counts[index])
+                )
+        return not self.waits
+
+    def get_wait(self, num_requests, duration, elapsed, current_count):
+        remaining = duration - elapsed
+        if self.algorithm == FIXED_WINDOW or current_count > num_requests:
+            return remaining
+        # Only the previous window's weight is over the limit, it fades out
+        # before the current window ends
+        return min(remaining, duration / max(num_requests, 1))
+
+    def wait(self):
+        return math.ceil(max(self.waits)) if self.waits else None
+
+
+class UserRateThrottle(CounterRateThrottle):
+    """
+    Limits requests per user, or per client IP for anonymous requests.
+    """
+
+    scope = "user"
+
+    def get_scopes(self, request, view):
+        return [(self.scope, self.get_user_ident(request))]
+
+
+class LoginThrottle(CounterRateThrottle):
     """
     Custom rate throttle for login attempts to mitigate brute-force attacks.
     """
 
     scope = "login"
 
-    def get_cache_key(self, request, view):
-        ident = self.get_ident(request)
-        return self.cache_format % {"scope": self.scope, "ident": ident}
+    def get_scopes(self, request, view):
+        return [(self.scope, self.get_ident(request))]
+
+
+class DefaultRateThrottle(CounterRateThrottle):
+    """
+    Applies the user and login scopes together, in one cache round trip.
+    """
+
+    def get_scopes(self, request, view):
+        return [
+            (UserRateThrottle.scope, self.get_user_ident(request)),
+            (LoginThrottle.scope, self.get_ident(request)),
+        ]
@@ -0,0 +1,116 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from django.conf import settings
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken as BaseAccessToken
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from authentication.helpers.user_cache import get_cached_user_by_pk
+from core.helpers.permission_utils import (
+    decode_permission_mask,
+    encode_permission_mask,
+    get_effective_permissions,
+    get_permission_catalog,
+)
+
+# Claim holding the user's token version at the time the token was issued
+TOKEN_VERSION_CLAIM = "ver"
+# Claims holding the user's permissions as a bitmask, and the version of the
+# permission catalog the bitmask is indexed against
+PERMISSIONS_CLAIM = "perms"
+PERMISSION_CATALOG_CLAIM = "pcv"
+
+
+def get_token_version(payload):
+    """
+    Returns the token version a payload was issued with. Tokens issued before
+    versioning count as version 0.
+    """
+    return payload.get(TOKEN_VERSION_CLAIM, 0)
+
+
+def permission_claims_enabled():
+    return settings.SIMPLE_JWT.get("PERMISSION_CLAIMS", False)
+
+
+def add_permission_claims(token, user):
+    """
+    Embeds the user's effective permissions in the token. Superusers don't
+    need them, they are allowed everything.
+    """
+    if user.is_superuser:
+        return
+    catalog = get_permission_catalog()
+    token[PERMISSIONS_CLAIM] = encode_permission_mask(
+        get_effective_permissions(user), catalog
+    )
+    token[PERMISSION_CATALOG_CLAIM] = catalog.version
+
+
+def get_claimed_permissions(payload):
+    """
+    Returns the permissions carried by an access token payload, or None if
+    it carries none or was minted against another permission catalog.
+    """
+    if not isinstance(payload, dict) or PERMISSIONS_CLAIM not in payload:
+        return None
+    return decode_permission_mask(
+        payload[PERMISSIONS_CLAIM], payload.get(PERMISSION_CATALOG_CLAIM)
+    )
+
+
+class VersionedTokenMixin:
+    """
+    Embeds the user's token version in tokens issued for them, so that bumping
+    the version (`User.revoke_tokens`) revokes the token.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+
+class AccessToken(VersionedTokenMixin, BaseAccessToken):
+    pass
+
+
+class RefreshToken(VersionedTokenMixin, BaseRefreshToken):
+    """
+    When SIMPLE_JWT["PERMISSION_CLAIMS"] is on, access tokens minted from this
+    token carry the user's current permissions. The refresh token itself
+    never does, so refreshing picks up permission changes.
+    """
+
+    access_token_class = AccessToken
+    no_copy_claims = BaseRefreshToken.no_copy_claims + (
+        PERMISSIONS_CLAIM,
+        PERMISSION_CATALOG_CLAIM,
+    )
+    user = None
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.user = user
+        return token
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        if permission_claims_enabled():
+            user = self.user or get_cached_user_by_pk(
+                self.payload.get(api_settings.USER_ID_CLAIM)
+            )
+            if user is not None:
+                add_permission_claims(access, user)
+        return access
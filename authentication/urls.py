@@ -14,6 +14,7 @@ from rest_framework_simplejwt.views import TokenRefreshView, TokenVerifyView
 
 from authentication.views import (
     CustomTokenObtainPairView,
+    LogoutAllView,
     OTPDisableView,
     OTPHandleRequestView,
     OTPResendView,
@@ -35,6 +36,7 @@ urlpatterns = [
         tag_view(TokenVerifyView, "Token").as_view(),
         name="token_verify",
     ),
+    path("logout/all/", LogoutAllView.as_view(), name="logout_all"),
     path("2fa/activate/", OTPSetupView.as_view(), name="2fa_activate"),
     path("2fa/disable/", OTPDisableView.as_view(), name="2fa_disable"),
     path("2fa/verify/", OTPVerifyView.as_view(), name="2fa_verify"),
@@ -9,24 +9,22 @@
 
 
 from django.conf import settings
-from django.contrib.auth import get_user_model
-from django_user_agents.utils import get_user_agent
 from rest_framework import generics, status
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.throttling import UserRateThrottle
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from accounts.serializers import UserSerializer
-from authentication.backends import TemporaryTokenAuthentication
+from authentication.backends import JWTAuthentication, TemporaryTokenAuthentication
 from authentication.helpers.ip_utils import get_client_ip
 from authentication.helpers.otp_helper import OTPLoginFlowHelper
+from authentication.helpers.user_agent import get_user_agent
 from authentication.helpers.device_helper import get_device_classes
-from authentication.throttling import LoginThrottle
+from authentication.throttling import LoginThrottle, UserRateThrottle
+from authentication.tokens import RefreshToken
+from core.helpers.device_fingerprint import get_device_fingerprint
 from core.models import UserDevice
 from drf_spectacular.utils import extend_schema
 from accounts.serializers import UserSerializer
@@ -66,30 +64,19 @@ class CustomTokenObtainPairView(TokenObtainPairView):
         serializer = self.get_serializer(data=request.data)
         try:
             serializer.is_valid(raise_exception=True)
-            user = get_user_model().objects.get(
-                pk=serializer.validated_data["user"]["id"]
-            )
-            response = OTPLoginFlowHelper(request, user).start_otp_flow()
+            otp_flow = OTPLoginFlowHelper(request, serializer.user)
+            response = otp_flow.start_otp_flow()
             if response:
                 return response
         except TokenError as e:
             raise InvalidToken(e.args[0])
 
-        user_device_id = (
-            UserDevice.objects.filter(
-                user=user,
-                user_agent=get_user_agent(request),
-                ip_address=get_client_ip(request),
-                trusted=False,
-            )
-            .order_by("-last_login")
-            .values_list("id", flat=True)
-            .first()
-        )
-
-        if user_device_id:
-            serializer.validated_data["user_device_id"] = user_device_id
+        # The device logged by the OTP flow is the one this request came from
+        user_device = otp_flow.user_device
+        if user_device and not user_device.trusted:
+            serializer.validated_data["user_device_id"] = user_device.id
 
+        serializer.validated_data["user"] = serializer.get_user_data()
         return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
 
@@ -173,20 +160,22 @@ class TokenOTPObtainPairView(OTPBaseView):
         user_device_id = (
             UserDevice.objects.filter(
                 user=user,
-                user_agent=get_user_agent(request),
-                ip_address=get_client_ip(request),
+                fingerprint=get_device_fingerprint(
+                    str(get_user_agent(request)), get_client_ip(request)
+                ),
                 trusted=False,
             )
-            .order_by("-last_login")
             .values_list("id", flat=True)
             .first()
         )
+        # Minted once, each access token derivation computes the permission claims
+        access = refresh.access_token
         # return the access and refresh token and the user object using UserSerializer
         data = {
             "refresh": str(refresh),
-            "access": str(refresh.access_token),
+            "access": str(access),
             "header_types": settings.SIMPLE_JWT["AUTH_HEADER_TYPES"],
-            "refresh_expires": refresh.access_token.payload["exp"],
+            "refresh_expires": access.payload["exp"],
             "access_expires": refresh.payload["exp"],
             "user": UserSerializer(user).data,
         }
@@ -447,10 +436,26 @@ class OTPDisableView(OTPBaseView):
             user.save()
 
     def user_has_devices(self, user):
-        for device_class in self.device_classes.values():
-            if device_class.objects.filter(user=user).exists():
-                return True
-        return False
+        return self.device_classes.user_has_devices(user)
+
+
+class LogoutAllView(generics.GenericAPIView):
+    """
+    *Handles token operations for API authentication.*
+    Custom view for logging the user out of every session.
+
+    Revokes all access and refresh tokens issued to the user so far.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [UserRateThrottle]
+    drf_tag = "Auth"
+
+    @extend_schema(request=None, responses={status.HTTP_204_NO_CONTENT: None})
+    def post(self, request, *args, **kwargs):
+        request.user.revoke_tokens()
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class OTPDeviceView(generics.GenericAPIView):
@@ -469,19 +474,6 @@ class OTPDeviceView(generics.GenericAPIView):
     http_method_names = ["get"]
     drf_tag = "Two Factor Authentication"
 
-    def get_device(self, user, otp_type):
-        device_class = self.device_classes.get(otp_type)
-
-        if not device_class:
-            raise ValidationError({"error": "Invalid 2FA type."})
-
-        try:
-            device = device_class.objects.get(user=user)
-        except device_class.DoesNotExist:
-            return None
-
-        return device
-
     @extend_schema(
         responses={
             status.HTTP_200_OK: OTPDeviceSerializer(),
@@ -492,16 +484,14 @@ class OTPDeviceView(generics.GenericAPIView):
         return self.list_devices(user)
 
     def list_devices(self, user):
-        devices = []
-        for otp_type in self.device_classes.keys():
-            device = self.get_device(user, otp_type)
-            if device:
-                devices.append(
-                    {
-                        "id": device.id,
-                        "type": otp_type,
-                        "name": device.name,
-                        "confirmed": device.confirmed,
-                    }
-                )
+        # One query across every device type
+        devices = [
+            {
+                "id": device.id,
+                "type": device.type,
+                "name": device.name,
+                "confirmed": device.confirmed,
+            }
+            for device in self.device_classes.get_user_devices(user)
+        ]
         return Response(devices, status=status.HTTP_200_OK)
@@ -10,7 +10,7 @@
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from core.models import User, UserDevice
+from core.models import DeadLetterTask, Task, User, UserDevice
 
 
 class UserAdmin(BaseUserAdmin):
@@ -34,11 +34,30 @@ class UserAdmin(BaseUserAdmin):
 
 class UserDeviceAdmin(admin.ModelAdmin):
     list_display = ('user', 'user_agent', 'ip_address', 'last_login', 'trusted')
-    search_fields = ('user__email', 'user_agent', 'ip_address')
+    search_fields = ('user__email', 'user_agent_string__value', 'ip_address')
     list_filter = ('trusted',)
-    readonly_fields = ('user', 'user_agent', 'ip_address', 'last_login')
+    list_select_related = ('user', 'user_agent_string')
+    exclude = ('user_agent_string',)
+    readonly_fields = ('user', 'user_agent', 'ip_address', 'fingerprint', 'last_login')
 
 
 # Register models
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'attempts', 'max_attempts', 'run_at', 'created_at')
+    search_fields = ('name',)
+    readonly_fields = ('attempts', 'last_error', 'created_at')
+    # Task arguments may carry personal data, keep them out of the admin
+    exclude = ('payload',)
+
+
+class DeadLetterTaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'attempts', 'created_at', 'failed_at')
+    search_fields = ('name',)
+    readonly_fields = ('name', 'attempts', 'last_error', 'created_at', 'failed_at')
+    exclude = ('payload',)
+
+
 admin.site.register(User, UserAdmin)
 admin.site.register(UserDevice, UserDeviceAdmin)
+admin.site.register(Task, TaskAdmin)
+admin.site.register(DeadLetterTask, DeadLetterTaskAdmin)
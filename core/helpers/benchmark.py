@@ -0,0 +1,71 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import statistics
+import time
+from collections import namedtuple
+
+from django.utils.module_loading import autodiscover_modules
+
+registry = {}
+
+BenchmarkResult = namedtuple(
+    "BenchmarkResult", ["name", "iterations", "mean", "p50", "p95", "ops_per_second"]
+)
+
+
+def benchmark(name):
+    """
+    Registers a micro-benchmark under `name` for the `benchmark` command.
+
+    The decorated function takes no arguments and returns the callable to
+    time, so any setup it does is left out of the measurement.
+    """
+
+    def decorator(func):
+        registry[name] = func
+        return func
+
+    return decorator
+
+
+def get_benchmarks():
+    """
+    Returns the registered benchmarks, importing every app's `benchmarks`
+    module first.
+    """
+    autodiscover_modules("benchmarks")
+    return dict(sorted(registry.items()))
+
+
+def measure(name, operation, iterations=1000, warmup=10):
+    """
+    Times `iterations` calls of `operation` and returns a BenchmarkResult,
+    with timings in seconds per call.
+    """
+    for _ in range(warmup):
+        operation()
+
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - started)
+
+    total = sum(timings)
+    quantiles = statistics.quantiles(timings, n=20) if iterations > 1 else timings
+    return BenchmarkResult(
+        name=name,
+        iterations=iterations,
+        mean=total / iterations,
+        p50=statistics.median(timings),
+        p95=quantiles[-1],
+        ops_per_second=iterations / total if total else float("inf"),
+    )
@@ -0,0 +1,132 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+
+EXACT = "exact"
+ESTIMATE = "estimate"
+CAPPED = "capped"
+CACHED = "cached"
+
+COUNTING_DEFAULTS = {
+    "STRATEGY": EXACT,
+    # Counted exactly below this many estimated rows, estimates are rough
+    # on small tables
+    "ESTIMATE_THRESHOLD": 10000,
+    "CAP": 10000,
+    "CACHE": "default",
+    "CACHE_TIMEOUT": 60,
+}
+
+registry = {}
+
+
+def get_counting_settings():
+    return {**COUNTING_DEFAULTS, **getattr(settings, "COUNTING", {})}
+
+
+def count_strategy(name):
+    """
+    Registers a count strategy under `name`. The decorated function takes a
+    queryset and the counting settings, and returns (count, strategy), the
+    strategy being the name of the one that produced the number.
+    """
+
+    def decorator(func):
+        registry[name] = func
+        return func
+
+    return decorator
+
+
+def count_queryset(queryset, strategy=None, options=None):
+    """
+    Counts the queryset with the named strategy. Returns (count, strategy).
+    """
+    options = {**get_counting_settings(), **(options or {})}
+    strategy = strategy or options["STRATEGY"]
+    try:
+        func = registry[strategy]
+    except KeyError:
+        raise ValueError(f"Unknown count strategy: {strategy}")
+    try:
+        return func(queryset, options)
+    except EmptyResultSet:
+        # A filter that can't match anything, e.g. pk__in=[]
+        return 0, EXACT
+
+
+@count_strategy(EXACT)
+def exact_count(queryset, options):
+    return queryset.count(), EXACT
+
+
+def get_planner_estimate(queryset):
+    """
+    Returns the PostgreSQL planner's row estimate for the queryset: the
+    table statistics when it isn't filtered, EXPLAIN's estimate otherwise.
+    """
+    query = queryset.query
+    with connections[queryset.db].cursor() as cursor:
+        if not query.has_filters() and not query.distinct:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+        else:
+            sql, params = queryset.order_by().query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        row = cursor.fetchone()
+
+    if isinstance(row[0], int):
+        return row[0]
+    plan = row[0] if isinstance(row[0], list) else json.loads(row[0])
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+@count_strategy(ESTIMATE)
+def estimated_count(queryset, options):
+    if connections[queryset.db].vendor != "postgresql":
+        return exact_count(queryset, options)
+    # Tables never analyzed report -1
+    estimate = get_planner_estimate(queryset)
+    if estimate < options["ESTIMATE_THRESHOLD"]:
+        return exact_count(queryset, options)
+    return estimate, ESTIMATE
+
+
+@count_strategy(CAPPED)
+def capped_count(queryset, options):
+    cap = options["CAP"]
+    # SELECT COUNT(*) FROM (... LIMIT cap + 1), stops scanning past the cap
+    count = queryset.order_by()[: cap + 1].count()
+    if count > cap:
+        return cap, CAPPED
+    return count, EXACT
+
+
+@count_strategy(CACHED)
+def cached_count(queryset, options):
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.sha256(f"{queryset.db}:{sql}:{params!r}".encode()).hexdigest()
+    key = f"count:{digest}"
+
+    cache = caches[options["CACHE"]]
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, options["CACHE_TIMEOUT"])
+    return count, CACHED
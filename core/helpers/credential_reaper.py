@@ -0,0 +1,169 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+from auditlog.context import disable_auditlog
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django_otp.models import SideChannelDevice
+from django_rest_passwordreset.models import (
+    ResetPasswordToken,
+    get_password_reset_token_expiry_time,
+)
+
+from core.models import ExpiringToken, UserDevice
+
+REAPER_DEFAULTS = {
+    "BATCH_SIZE": 1000,
+    # Seconds to sleep between batches, to leave room for other writers
+    "BATCH_PAUSE": 0,
+    "DEVICE_IDLE_DAYS": 90,
+}
+
+
+class ReapResult(namedtuple("ReapResult", ["name", "rows", "batches", "seconds"])):
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else float(self.rows)
+
+
+def get_reaper_settings():
+    return {**REAPER_DEFAULTS, **getattr(settings, "CREDENTIAL_REAPER", {})}
+
+
+def _delete(queryset):
+    return queryset.delete()[1].get(queryset.model._meta.label, 0)
+
+
+def _clear_challenge(queryset):
+    return queryset.update(token=None)
+
+
+def reap_in_batches(queryset, action, batch_size, dry_run=False, pause=0):
+    """
+    Applies `action` to the rows of `queryset` in primary-key ordered batches.
+
+    Each batch reads the next `batch_size` primary keys after the previous
+    batch, then runs the action in its own short transaction on that key
+    range (the original filter still applies), so locks are only ever held on
+    a bounded slice of the table. Returns the number of rows and batches.
+    """
+    rows = batches = 0
+    last_pk = None
+    while True:
+        page = queryset.order_by("pk")
+        if last_pk is not None:
+            page = page.filter(pk__gt=last_pk)
+        pks = list(page.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            break
+
+        last_pk = pks[-1]
+        batches += 1
+        if dry_run:
+            rows += len(pks)
+        else:
+            with transaction.atomic(using=queryset.db):
+                rows += action(queryset.filter(pk__gte=pks[0], pk__lte=last_pk))
+            if pause:
+                time.sleep(pause)
+
+        if len(pks) < batch_size:
+            break
+    return rows, batches
+
+
+def get_challenge_device_models():
+    """
+    Returns the OTP device models that store side-channel challenges, each
+    counted once even when subclassed through multi-table inheritance.
+    """
+    return [
+        model
+        for model in apps.get_models()
+        if issubclass(model, SideChannelDevice)
+        and model._meta.get_field("token").model is model
+    ]
+
+
+def get_reap_targets(now=None):
+    """
+    Returns (name, queryset, action) for everything the reaper cleans up.
+    """
+    now = now or timezone.now()
+    config = get_reaper_settings()
+    reset_expiry = now - timedelta(hours=get_password_reset_token_expiry_time())
+    device_expiry = now - timedelta(days=config["DEVICE_IDLE_DAYS"])
+
+    targets = [
+        (
+            "expiring_tokens",
+            ExpiringToken.objects.filter(expires_at__lte=now),
+            _delete,
+        ),
+        (
+            "password_reset_tokens",
+            ResetPasswordToken.objects.filter(created_at__lte=reset_expiry),
+            _delete,
+        ),
+    ]
+    for model in get_challenge_device_models():
+        targets.append(
+            (
+                f"otp_challenges:{model._meta.label_lower}",
+                model.objects.filter(token__isnull=False, valid_until__lte=now),
+                _clear_challenge,
+            )
+        )
+    targets.append(
+        (
+            "idle_devices",
+            UserDevice.objects.filter(last_login__lte=device_expiry),
+            _delete,
+        )
+    )
+    return targets
+
+
+def reap_credentials(dry_run=False, batch_size=None, only=None, now=None):
+    """
+    Deletes expired temporary tokens, password reset tokens and long-idle user
+    devices, and clears expired OTP challenges. Meant to be run periodically
+    from the `reap_credentials` command or a scheduler.
+
+    :param dry_run: Count the rows that would be reaped without changing them.
+    :param batch_size: Rows per batch, defaults to CREDENTIAL_REAPER["BATCH_SIZE"].
+    :param only: Optional iterable of target names to restrict the run to.
+    :return: A list of ReapResult, one per target.
+    """
+    config = get_reaper_settings()
+    batch_size = batch_size or config["BATCH_SIZE"]
+    results = []
+
+    # Housekeeping deletes are not user actions, keep them out of the audit log
+    with disable_auditlog():
+        for name, queryset, action in get_reap_targets(now):
+            if only and name.split(":")[0] not in only and name not in only:
+                continue
+            started = time.monotonic()
+            rows, batches = reap_in_batches(
+                queryset,
+                action,
+                batch_size,
+                dry_run=dry_run,
+                pause=config["BATCH_PAUSE"],
+            )
+            results.append(ReapResult(name, rows, batches, time.monotonic() - started))
+    return results
@@ -0,0 +1,49 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import hashlib
+import ipaddress
+
+USER_AGENT_MAX_LENGTH = 255
+
+
+def _digest(value):
+    return hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
+
+
+def normalize_user_agent(user_agent):
+    """
+    Collapses whitespace and truncates the user agent to the stored length.
+    """
+    return " ".join(str(user_agent or "").split())[:USER_AGENT_MAX_LENGTH]
+
+
+def normalize_ip_address(ip_address):
+    try:
+        return ipaddress.ip_address(ip_address).compressed
+    except ValueError:
+        return str(ip_address or "")
+
+
+def get_user_agent_digest(user_agent):
+    """
+    Returns the 32 character hex key of a user agent in the dictionary table.
+    """
+    return _digest(normalize_user_agent(user_agent))
+
+
+def get_device_fingerprint(user_agent, ip_address):
+    """
+    Returns the 32 character hex fingerprint identifying a user's device,
+    a hash of the normalized user agent and IP address.
+    """
+    return _digest(
+        f"{normalize_user_agent(user_agent)}\0{normalize_ip_address(ip_address)}"
+    )
@@ -10,12 +10,54 @@
 
 import os
 from email.mime.image import MIMEImage
+from functools import lru_cache
 
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
 from django.utils.html import strip_tags
 
+from core.helpers.smtp_pool import send_messages
+
+INLINE_IMAGES_DIR = os.path.join(settings.BASE_DIR, "core/templates/emails/images")
+INLINE_IMAGE_FILES = ["logo.png"]
+
+
+@lru_cache(maxsize=None)
+def get_cached_template(template_name):
+    """
+    Returns the compiled template, loading it only once per process.
+    Returns None if the template doesn't exist.
+    """
+    try:
+        return get_template(template_name)
+    except TemplateDoesNotExist:
+        return None
+
+
+def render_template(template_name, context):
+    template = get_cached_template(template_name)
+    if template is None:
+        raise TemplateDoesNotExist(template_name)
+    return template.render(context)
+
+
+@lru_cache(maxsize=None)
+def get_inline_images():
+    """
+    Builds the inline image parts once per process. The parts are never
+    modified when a message is serialized, so every message shares them.
+    """
+    images = []
+    for image_file in INLINE_IMAGE_FILES:
+        with open(os.path.join(INLINE_IMAGES_DIR, image_file), "rb") as img:
+            image = MIMEImage(img.read())
+        image_name = os.path.splitext(image_file)[0]
+        image.add_header("Content-ID", f"<{image_name}>")
+        images.append(image)
+    return tuple(images)
+
 
 class EmailHelper:
     def __init__(self, subject, template_name, context=None, bcc=None):
@@ -24,9 +66,22 @@ class EmailHelper:
         self.context = context or {}
         self.bcc = bcc or []
 
-    def send_email(self, to_email):
-        html_content = render_to_string(self.template_name, self.context)
-        text_content = strip_tags(html_content)
+    @property
+    def text_template_name(self):
+        return os.path.splitext(self.template_name)[0] + ".txt"
+
+    def render_text(self, html_content):
+        """
+        Renders the plain text part from the `.txt` template next to the HTML
+        one, falling back to stripping the tags of the HTML part.
+        """
+        if get_cached_template(self.text_template_name) is not None:
+            return render_template(self.text_template_name, self.context)
+        return strip_tags(html_content)
+
+    def build_message(self, to_email):
+        html_content = render_template(self.template_name, self.context)
+        text_content = self.render_text(html_content)
 
         email = EmailMultiAlternatives(
             subject=self.subject,
@@ -37,18 +92,38 @@ class EmailHelper:
         )
 
         # Attach all the inline images
-        image_files = ["logo.png"]
-        for image_file in image_files:
-            image_path = os.path.join("core/templates/emails/images", image_file)
-            with open(image_path, "rb") as img:
-                image = MIMEImage(img.read())
-                img.close()
-            image_name = os.path.splitext(image_file)[0]
-            image.add_header("Content-ID", f"<{image_name}>")
+        for image in get_inline_images():
             email.attach(image)
 
         # Attach the HTML content
         email.attach_alternative(html_content, "text/html")
+        return email
+
+    def send_email(self, to_email):
+        self.send_messages([to_email])
+
+    def send_messages(self, to_emails):
+        """
+        Sends one message per recipient over a single pooled connection.
+        """
+        return send_messages(self.build_message(to_email) for to_email in to_emails)
+
+    def queue_email(self, to_email):
+        """
+        Queues the email to be sent by the task worker and returns immediately.
+        """
+        from core.tasks import send_email
 
-        # Send the email
-        email.send()
+        send_email.delay(
+            self.subject, self.template_name, self.context, to_email, bcc=self.bcc
+        )
+
+    def queue_emails(self, to_emails):
+        """
+        Queues a single task sending one message per recipient in a batch.
+        """
+        from core.tasks import send_emails
+
+        send_emails.delay(
+            self.subject, self.template_name, self.context, to_emails, bcc=self.bcc
+        )
@@ -0,0 +1,72 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import csv
+import json
+from itertools import islice
+
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class Echo:
+    """
+    A file-like object handing back what is written to it, so csv.writer
+    output can be streamed.
+    """
+
+    def write(self, value):
+        return value
+
+
+def chunked(iterable, size):
+    """
+    Yields lists of up to `size` items.
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=JSONEncoder, ensure_ascii=False)
+    return value
+
+
+def stream_csv(chunks, field_names):
+    """
+    Streams chunks of rendered rows as CSV, one string per chunk.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(field_names)
+    for chunk in chunks:
+        yield "".join(
+            writer.writerow([csv_value(row.get(name)) for name in field_names])
+            for row in chunk
+        )
+
+
+def stream_ndjson(chunks, field_names):
+    """
+    Streams chunks of rendered rows as newline-delimited JSON, one string per
+    chunk.
+    """
+    encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    for chunk in chunks:
+        yield "".join(f"{encoder.encode(row)}\n" for row in chunk)
+
+
+# Export format: (stream function, content type, file extension)
+EXPORT_FORMATS = {
+    "csv": (stream_csv, "text/csv; charset=utf-8", "csv"),
+    "ndjson": (stream_ndjson, "application/x-ndjson; charset=utf-8", "ndjson"),
+}
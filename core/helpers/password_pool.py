@@ -0,0 +1,112 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+PASSWORD_POOL_DEFAULTS = {
+    "ENABLED": False,
+    "WORKERS": 2,
+    # Seconds to wait for a hashing job before giving up
+    "TIMEOUT": 30,
+}
+
+_executor = None
+_executor_pid = None
+_lock = threading.Lock()
+
+
+def get_password_pool_settings():
+    return {**PASSWORD_POOL_DEFAULTS, **getattr(settings, "PASSWORD_POOL", {})}
+
+
+def _init_worker():
+    import django
+
+    # Only needed when the workers are spawned rather than forked
+    django.setup()
+
+
+def _check_password(password, encoded):
+    """
+    Runs in a pool worker; the setter can't cross processes, so whether the
+    hash must be upgraded is returned instead.
+    """
+    must_update = []
+    is_correct = hashers.check_password(password, encoded, setter=must_update.append)
+    return is_correct, bool(must_update)
+
+
+def get_executor():
+    """
+    Returns the process pool used for password hashing, creating it on first
+    use and again in processes forked after it was created.
+    """
+    global _executor, _executor_pid
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(
+                max_workers=get_password_pool_settings()["WORKERS"],
+                initializer=_init_worker,
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def shutdown_executor():
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None and _executor_pid == os.getpid():
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+@receiver(setting_changed)
+def reset_executor(setting, **kwargs):
+    # Workers keep the hasher configuration they were started with
+    if setting in ("PASSWORD_HASHERS", "PASSWORD_POOL"):
+        shutdown_executor()
+
+
+def _run(func, *args):
+    config = get_password_pool_settings()
+    if not config["ENABLED"]:
+        return func(*args)
+    return get_executor().submit(func, *args).result(timeout=config["TIMEOUT"])
+
+
+def check_password(password, encoded, setter=None):
+    """
+    Same as django.contrib.auth.hashers.check_password, but runs the hasher
+    in the password pool when PASSWORD_POOL["ENABLED"] is set, which bounds
+    how many CPU cores hashing can take during login storms.
+    """
+    if password is None or not hashers.is_password_usable(encoded):
+        return False
+    is_correct, must_update = _run(_check_password, password, encoded)
+    if setter and is_correct and must_update:
+        setter(password)
+    return is_correct
+
+
+def make_password(password):
+    """
+    Same as django.contrib.auth.hashers.make_password, run in the password
+    pool when it is enabled.
+    """
+    if password is None:
+        return hashers.make_password(None)
+    return _run(hashers.make_password, password)
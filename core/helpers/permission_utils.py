@@ -0,0 +1,237 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import base64
+import binascii
+import hashlib
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db import transaction
+
+from core.helpers.cache_utils import LRUCache
+
+# Bump when the shape of the cached entries changes
+PERMISSION_CACHE_VERSION = 1
+
+
+def get_permission_cache_timeout():
+    return getattr(settings, "PERMISSION_CACHE_TIMEOUT", 3600)
+
+
+def _permissions_key(user_id):
+    return f"effective-perms:v{PERMISSION_CACHE_VERSION}:{user_id}"
+
+
+def load_user_permissions(user_ids):
+    """
+    Returns {user id: frozenset of "app_label.codename"} for many users from
+    the database, counting both their own permissions and those of their
+    groups.
+
+    Runs two queries whatever the number of users: one for the direct
+    permissions and one for the group permissions.
+    """
+    user_ids = list(user_ids)
+    permissions = {user_id: set() for user_id in user_ids}
+    if not user_ids:
+        return {}
+
+    User = get_user_model()
+    rows = User.user_permissions.through.objects.filter(
+        user_id__in=user_ids
+    ).values_list(
+        "user_id", "permission__content_type__app_label", "permission__codename"
+    )
+    for user_id, app_label, codename in rows:
+        permissions[user_id].add(f"{app_label}.{codename}")
+
+    rows = User.groups.through.objects.filter(
+        user_id__in=user_ids, group__permissions__isnull=False
+    ).values_list(
+        "user_id",
+        "group__permissions__content_type__app_label",
+        "group__permissions__codename",
+    )
+    for user_id, app_label, codename in rows:
+        permissions[user_id].add(f"{app_label}.{codename}")
+    return {user_id: frozenset(perms) for user_id, perms in permissions.items()}
+
+
+def get_users_effective_permissions(user_ids):
+    """
+    Returns {user id: frozenset of "app_label.codename"} for many users, read
+    from the cache and loaded in two queries for the users missing from it.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    keys = {_permissions_key(user_id): user_id for user_id in user_ids}
+    permissions = {
+        keys[key]: perms for key, perms in cache.get_many(list(keys)).items()
+    }
+
+    missing = [user_id for user_id in user_ids if user_id not in permissions]
+    if missing:
+        loaded = load_user_permissions(missing)
+        cache.set_many(
+            {_permissions_key(user_id): perms for user_id, perms in loaded.items()},
+            get_permission_cache_timeout(),
+        )
+        permissions.update(loaded)
+    return permissions
+
+
+def get_effective_permissions(user):
+    """
+    Returns the user's own and group permissions as "app_label.codename"
+    strings, from the cache once warm.
+    """
+    return get_users_effective_permissions([user.pk])[user.pk]
+
+
+def get_user_permission_codenames(user_ids):
+    """
+    Returns {user id: set of permission codenames} for many users.
+    """
+    return {
+        user_id: {perm.split(".", 1)[1] for perm in perms}
+        for user_id, perms in get_users_effective_permissions(user_ids).items()
+    }
+
+
+def invalidate_permissions(user_ids):
+    """
+    Drops the cached permissions of the given users.
+    """
+    keys = [_permissions_key(user_id) for user_id in user_ids]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    # Drop again once the transaction commits, so a concurrent request can't
+    # repopulate the cache with rows from before the change.
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_group_permissions(group_ids):
+    """
+    Drops the cached permissions of every member of the given groups.
+    """
+    User = get_user_model()
+    invalidate_permissions(
+        User.groups.through.objects.filter(group_id__in=list(group_ids))
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+
+
+def get_group_permission_codenames(group_ids):
+    """
+    Returns {group id: list of permission codenames} for many groups in a
+    single query.
+    """
+    group_ids = list(group_ids)
+    codenames = {group_id: [] for group_id in group_ids}
+    if not group_ids:
+        return codenames
+
+    rows = (
+        Group.permissions.through.objects.filter(group_id__in=group_ids)
+        .order_by("pk")
+        .values_list("group_id", "permission__codename")
+    )
+    for group_id, codename in rows:
+        codenames[group_id].append(codename)
+    return codenames
+
+
+PermissionCatalog = namedtuple("PermissionCatalog", ["version", "permissions", "index"])
+
+_catalog = None
+# Decoded permission masks, keyed by (catalog version, mask)
+permission_mask_cache = LRUCache(maxsize=1024)
+
+
+def get_permission_catalog():
+    """
+    Returns the sorted "app_label.codename" of every permission, with their
+    positions in permission masks. The version is a digest of the catalog, so
+    every process that sees the same permissions agrees on it.
+    """
+    global _catalog
+    if _catalog is None:
+        permissions = tuple(
+            sorted(
+                {
+                    f"{app_label}.{codename}"
+                    for app_label, codename in Permission.objects.values_list(
+                        "content_type__app_label", "codename"
+                    )
+                }
+            )
+        )
+        version = hashlib.sha256("\n".join(permissions).encode()).hexdigest()[:12]
+        index = {
+            permission: position for position, permission in enumerate(permissions)
+        }
+        _catalog = PermissionCatalog(version, permissions, index)
+    return _catalog
+
+
+def reset_permission_catalog():
+    global _catalog
+    _catalog = None
+    permission_mask_cache.clear()
+
+
+def encode_permission_mask(permissions, catalog=None):
+    """
+    Encodes permissions as a base64url bitmask over the catalog. Permissions
+    missing from the catalog are left out.
+    """
+    catalog = catalog or get_permission_catalog()
+    mask = 0
+    for permission in permissions:
+        position = catalog.index.get(permission)
+        if position is not None:
+            mask |= 1 << position
+    data = mask.to_bytes(max(1, (mask.bit_length() + 7) // 8), "little")
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def decode_permission_mask(encoded, version):
+    """
+    Returns the permissions of a mask encoded against the given catalog
+    version, or None if that isn't the current catalog or the mask is invalid.
+    """
+    catalog = get_permission_catalog()
+    if version != catalog.version or not isinstance(encoded, str):
+        return None
+
+    cache_key = (version, encoded)
+    permissions = permission_mask_cache.get(cache_key)
+    if permissions is None:
+        try:
+            data = base64.b64decode(
+                encoded + "=" * (-len(encoded) % 4), altchars=b"-_", validate=True
+            )
+        except (ValueError, binascii.Error):
+            return None
+        mask = int.from_bytes(data, "little")
+        if mask >> len(catalog.permissions):
+            return None
+        permissions = frozenset(
+            permission
+            for position, permission in enumerate(catalog.permissions)
+            if mask >> position & 1
+        )
+        permission_mask_cache.set(cache_key, permissions)
+    return permissions
@@ -0,0 +1,109 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from collections import namedtuple
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+QueryPlan = namedtuple("QueryPlan", ["only", "select_related", "prefetch_related"])
+
+
+def _reads_pk_only(field):
+    """
+    Tells whether a related field only reads the related primary keys, e.g.
+    PrimaryKeyRelatedField.
+    """
+    if isinstance(field, serializers.ManyRelatedField):
+        field = field.child_relation
+    return (
+        isinstance(field, serializers.RelatedField) and field.use_pk_only_optimization()
+    )
+
+
+def _plan_source(model, field, plan):
+    """
+    Adds what reading the serializer `field` from a `model` instance needs to
+    the plan. Returns False when the source isn't backed by model fields, or
+    is read by a nested serializer.
+    """
+    only, select_related, prefetch_related = plan
+    source_attrs = field.source_attrs
+    path = []
+    for position, attr in enumerate(source_attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return False
+        path.append(attr)
+        lookup = "__".join(path)
+        last = position == len(source_attrs) - 1
+
+        if last and model_field.is_relation:
+            if _reads_pk_only(field):
+                if model_field.many_to_many or model_field.one_to_many:
+                    prefetch_related[lookup] = Prefetch(
+                        lookup, queryset=model_field.related_model.objects.only("pk")
+                    )
+                else:
+                    # The foreign key is read as its raw value
+                    only.add(lookup)
+                return True
+            if isinstance(field, serializers.BaseSerializer):
+                # Nested serializers may follow relations of their own
+                return False
+
+        if model_field.many_to_many or model_field.one_to_many:
+            prefetch_related[lookup] = lookup
+            return True
+
+        if not model_field.is_relation:
+            only.add(lookup)
+            return True
+
+        select_related.add(lookup)
+        if last:
+            # The whole related instance is read, e.g. StringRelatedField
+            only.add(lookup)
+            return True
+        model = model_field.related_model
+    return True
+
+
+def plan_queryset(model, fields):
+    """
+    Maps serializer fields to the columns, joins and prefetches needed to
+    represent them. Returns None when a field needs the whole instance.
+
+    Method fields only get the primary key, they load what they need
+    themselves (e.g. in batches from a list serializer).
+    """
+    plan = QueryPlan({model._meta.pk.name}, set(), {})
+    for field in fields:
+        if field.write_only or isinstance(field, serializers.SerializerMethodField):
+            continue
+        if not field.source_attrs or not _plan_source(model, field, plan):
+            return None
+    return plan
+
+
+def apply_query_plan(queryset, plan):
+    """
+    Narrows the queryset to the plan, replacing the joins and prefetches it
+    was set up with.
+    """
+    return (
+        queryset.select_related(None)
+        .prefetch_related(None)
+        .only(*plan.only)
+        .select_related(*plan.select_related)
+        .prefetch_related(*plan.prefetch_related.values())
+    )
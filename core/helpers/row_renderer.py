@@ -0,0 +1,172 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import copy
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+from core.helpers.cache_utils import LRUCache
+
+# Fields whose representation only depends on the column value, never on the
+# instance or the serializer context
+PLAIN_FIELDS = {
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.DateField,
+    serializers.DateTimeField,
+    serializers.DecimalField,
+    serializers.DurationField,
+    serializers.EmailField,
+    serializers.FloatField,
+    serializers.IntegerField,
+    serializers.IPAddressField,
+    serializers.JSONField,
+    serializers.SlugField,
+    serializers.TimeField,
+    serializers.URLField,
+    serializers.UUIDField,
+}
+
+# Compiled renderers, keyed by (serializer class, requested fields)
+row_renderer_cache = LRUCache(maxsize=256)
+
+
+class RowRenderer:
+    """
+    Renders `.values_list()` rows as a serializer would render the instances,
+    with the per-field work resolved once at compile time.
+    """
+
+    def __init__(self, names, lookups, fields):
+        self.names = tuple(names)
+        self.lookups = tuple(lookups)
+        # Unbound field copies, None for columns rendered as they are
+        self.fields = tuple(fields)
+
+    def values(self, queryset):
+        """
+        Returns the queryset as rows of the columns this renderer reads.
+        """
+        return queryset.prefetch_related(None).values_list(*self.lookups)
+
+    def get_converters(self):
+        converters = []
+        for field in self.fields:
+            if isinstance(field, serializers.DateTimeField) and not hasattr(
+                field, "timezone"
+            ):
+                # Resolve the active timezone once per batch, not per value
+                field = copy.copy(field)
+                field.timezone = field.default_timezone()
+            converters.append(None if field is None else field.to_representation)
+        return converters
+
+    def iter_rows(self, rows):
+        names, converters = self.names, self.get_converters()
+        for row in rows:
+            yield {
+                name: value if value is None or convert is None else convert(value)
+                for name, convert, value in zip(names, converters, row)
+            }
+
+    def render_rows(self, rows):
+        return list(self.iter_rows(rows))
+
+
+def get_values_lookup(model, field):
+    """
+    Returns the `.values()` lookup a serializer field reads, following
+    forward foreign keys, or None when the field isn't a plain column.
+    """
+    source_attrs = field.source_attrs
+    if not source_attrs:
+        return None
+
+    for position, attr in enumerate(source_attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if position == len(source_attrs) - 1:
+            break
+        if not (model_field.many_to_one or model_field.one_to_one):
+            return None
+        if not model_field.concrete:
+            return None
+        model = model_field.related_model
+
+    if model_field.many_to_many or model_field.one_to_many:
+        return None
+    if model_field.is_relation != isinstance(field, serializers.RelatedField):
+        return None
+    if not model_field.concrete:
+        return None
+    return "__".join(source_attrs)
+
+
+def compile_row_renderer(serializer):
+    """
+    Compiles a bound model serializer into a RowRenderer. Returns None when a
+    readable field needs the model instance or the serializer context, or when
+    there is no readable field at all.
+    """
+    serializer_class = type(serializer)
+    if (
+        serializer_class.to_representation
+        is not serializers.Serializer.to_representation
+    ):
+        return None
+
+    model = serializer.Meta.model
+    names, lookups, fields = [], [], []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if type(field) is serializers.PrimaryKeyRelatedField:
+            if field.pk_field is not None:
+                return None
+            # The foreign key column already is the primary key
+            unbound = None
+        elif type(field) in PLAIN_FIELDS:
+            # An unbound copy, so the cached renderer doesn't keep the request
+            unbound = copy.deepcopy(field)
+        else:
+            return None
+
+        lookup = get_values_lookup(model, field)
+        if lookup is None:
+            return None
+        names.append(name)
+        lookups.append(lookup)
+        fields.append(unbound)
+    # values_list() without lookups would select every column
+    if not names:
+        return None
+    return RowRenderer(names, lookups, fields)
+
+
+def get_row_renderer(serializer_class, context):
+    """
+    Returns the cached RowRenderer for a serializer class and the fields the
+    request asked for, or None if that field set can't be compiled.
+    """
+    serializer = serializer_class(context=context)
+    requested_fields = None
+    if hasattr(serializer, "get_requested_fields"):
+        requested_fields = serializer.get_requested_fields(context)
+
+    key = (serializer_class, frozenset(requested_fields or ()))
+    renderer = row_renderer_cache.get(key)
+    if renderer is None:
+        renderer = compile_row_renderer(serializer) or False
+        row_renderer_cache.set(key, renderer)
+    return renderer or None
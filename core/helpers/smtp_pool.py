@@ -0,0 +1,132 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import logging
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+logger = logging.getLogger(__name__)
+
+EMAIL_POOL_DEFAULTS = {
+    # Idle connections kept open per process
+    "MAX_SIZE": 4,
+    # Seconds after which an idle connection is closed instead of reused
+    "IDLE_TIMEOUT": 30,
+}
+
+
+def get_email_pool_settings():
+    return {**EMAIL_POOL_DEFAULTS, **getattr(settings, "EMAIL_POOL", {})}
+
+
+class EmailConnectionPool:
+    """
+    A per-process pool of open email backend connections.
+
+    Checking out a connection reuses the most recently returned idle one,
+    after dropping connections that sat idle for longer than `idle_timeout`
+    or that fail a NOOP health check, so an SMTP/TLS session is set up once
+    and shared by many messages.
+    """
+
+    # Connections returned less than this many seconds ago skip the NOOP
+    health_check_after = 1
+
+    def __init__(self, max_size=None, idle_timeout=None, **connection_kwargs):
+        config = get_email_pool_settings()
+        self.max_size = config["MAX_SIZE"] if max_size is None else max_size
+        self.idle_timeout = (
+            config["IDLE_TIMEOUT"] if idle_timeout is None else idle_timeout
+        )
+        self.connection_kwargs = connection_kwargs
+        self._idle = []
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def _is_healthy(self, connection):
+        smtp = getattr(connection, "connection", None)
+        if smtp is None:
+            # Backends without a socket (console, locmem...) are always usable
+            return not hasattr(connection, "connection")
+        try:
+            return smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _close(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            logger.warning("Failed to close an email connection", exc_info=True)
+
+    def acquire(self):
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                connection, released_at = self._idle.pop()
+            idle_for = now - released_at
+            if idle_for <= self.idle_timeout and (
+                idle_for < self.health_check_after or self._is_healthy(connection)
+            ):
+                self.reused += 1
+                return connection
+            self._close(connection)
+
+        connection = get_connection(fail_silently=False, **self.connection_kwargs)
+        connection.open()
+        self.created += 1
+        return connection
+
+    def release(self, connection):
+        with self._lock:
+            if len(self._idle) < self.max_size:
+                self._idle.append((connection, time.monotonic()))
+                return
+        self._close(connection)
+
+    @contextmanager
+    def connection(self):
+        """
+        Yields a pooled connection, discarding it instead of returning it to
+        the pool if sending fails.
+        """
+        connection = self.acquire()
+        try:
+            yield connection
+        except Exception:
+            self._close(connection)
+            raise
+        self.release(connection)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._close(connection)
+
+
+email_pool = EmailConnectionPool()
+
+
+def send_messages(messages, pool=None):
+    """
+    Sends the email messages over a single pooled connection and returns the
+    number of messages sent.
+    """
+    with (pool or email_pool).connection() as connection:
+        return connection.send_messages(list(messages))
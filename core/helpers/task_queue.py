@@ -0,0 +1,182 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import logging
+import random
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from core.models import DeadLetterTask, Task
+
+logger = logging.getLogger(__name__)
+
+TASK_QUEUE_DEFAULTS = {
+    # Run tasks inline instead of queueing them, e.g. for local development
+    "EAGER": False,
+    "MAX_ATTEMPTS": 5,
+    # Retry delays grow as BACKOFF_BASE * 2 ** (attempt - 1) seconds
+    "BACKOFF_BASE": 10,
+    "BACKOFF_MAX": 60 * 60,
+    # Seconds an idle worker waits before polling the queue again
+    "POLL_INTERVAL": 1,
+    "CONCURRENCY": 4,
+    "POOL": "thread",
+}
+
+registry = {}
+
+
+def get_task_queue_settings():
+    return {**TASK_QUEUE_DEFAULTS, **getattr(settings, "TASK_QUEUE", {})}
+
+
+def task(func=None, *, name=None, max_attempts=None):
+    """
+    Registers a function as a background task.
+
+    The function gains a `delay(*args, **kwargs)` method that enqueues a call
+    and returns immediately; arguments must be JSON serializable. Only
+    registered tasks are ever run by the worker.
+    """
+
+    def decorator(func):
+        task_name = name or f"{func.__module__}.{func.__qualname__}"
+        registry[task_name] = func
+        func.task_name = task_name
+        func.delay = lambda *args, **kwargs: enqueue(
+            task_name, args=args, kwargs=kwargs, max_attempts=max_attempts
+        )
+        return func
+
+    return decorator(func) if func else decorator
+
+
+def enqueue(name, args=(), kwargs=None, run_at=None, max_attempts=None):
+    """
+    Queues a call to the registered task `name` and returns the Task row.
+
+    The row is written in the caller's transaction, so work queued by a
+    request that is rolled back is dropped with it.
+    """
+    config = get_task_queue_settings()
+    payload = {"args": list(args), "kwargs": kwargs or {}}
+    if config["EAGER"]:
+        registry[name](*payload["args"], **payload["kwargs"])
+        return None
+
+    return Task.objects.create(
+        name=name,
+        payload=payload,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or config["MAX_ATTEMPTS"],
+    )
+
+
+def get_retry_delay(attempts):
+    """
+    Returns the delay before the next attempt, with exponential backoff and
+    up to 10% jitter so failed batches don't retry in lockstep.
+    """
+    config = get_task_queue_settings()
+    delay = min(config["BACKOFF_BASE"] * 2 ** (attempts - 1), config["BACKOFF_MAX"])
+    return timedelta(seconds=delay * (1 + random.random() / 10))
+
+
+class Worker:
+    """
+    Runs queued tasks, claiming them with SELECT ... FOR UPDATE SKIP LOCKED.
+
+    Each task runs inside the transaction that holds its row lock, so any
+    number of workers can poll the same table without running a task twice,
+    and a task whose worker dies is simply picked up again.
+    """
+
+    def __init__(self, poll_interval=None):
+        config = get_task_queue_settings()
+        self.poll_interval = (
+            config["POLL_INTERVAL"] if poll_interval is None else poll_interval
+        )
+        self.stop_event = threading.Event()
+        autodiscover_modules("tasks")
+
+    def run_next(self):
+        """
+        Claims and runs the next due task. Returns False if there was none.
+        """
+        with transaction.atomic():
+            task_row = (
+                Task.objects.select_for_update(skip_locked=True)
+                .filter(run_at__lte=timezone.now())
+                .order_by("run_at", "id")
+                .first()
+            )
+            if task_row is None:
+                return False
+
+            try:
+                func = registry[task_row.name]
+                # Roll back the task's own writes if it fails
+                with transaction.atomic():
+                    func(*task_row.payload["args"], **task_row.payload["kwargs"])
+            except Exception:
+                self.handle_failure(task_row, traceback.format_exc())
+            else:
+                task_row.delete()
+        return True
+
+    def handle_failure(self, task_row, error):
+        task_row.attempts += 1
+        task_row.last_error = error
+        if task_row.attempts >= task_row.max_attempts:
+            logger.error("Task %s failed permanently:\n%s", task_row, error)
+            DeadLetterTask.objects.create(
+                name=task_row.name,
+                payload=task_row.payload,
+                attempts=task_row.attempts,
+                last_error=error,
+                created_at=task_row.created_at,
+            )
+            task_row.delete()
+            return
+
+        logger.warning("Task %s failed, retrying:\n%s", task_row, error)
+        task_row.run_at = timezone.now() + get_retry_delay(task_row.attempts)
+        task_row.save(update_fields=["attempts", "last_error", "run_at"])
+
+    def run_pending(self, limit=None):
+        """
+        Runs due tasks until the queue is drained (or `limit` tasks ran) and
+        returns how many ran.
+        """
+        count = 0
+        while (limit is None or count < limit) and self.run_next():
+            count += 1
+        return count
+
+    def run_forever(self):
+        """
+        Polls the queue until `stop_event` is set.
+        """
+        while not self.stop_event.is_set():
+            close_old_connections()
+            try:
+                ran = self.run_next()
+            except Exception:
+                logger.exception("Task worker failed to poll the queue")
+                ran = False
+            if not ran:
+                self.stop_event.wait(self.poll_interval)
+        close_old_connections()
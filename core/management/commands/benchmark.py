@@ -0,0 +1,49 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.helpers.benchmark import get_benchmarks, measure
+
+
+class Command(BaseCommand):
+    help = "Runs the registered micro-benchmarks and prints the per-call cost"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "names",
+            nargs="*",
+            help="Benchmarks to run (all of them by default), matched by prefix",
+        )
+        parser.add_argument("--iterations", type=int, default=1000)
+        parser.add_argument("--list", action="store_true", help="List benchmarks")
+
+    def handle(self, *args, **options):
+        benchmarks = get_benchmarks()
+        if options["list"]:
+            for name in benchmarks:
+                self.stdout.write(name)
+            return
+
+        names = options["names"]
+        selected = {
+            name: setup
+            for name, setup in benchmarks.items()
+            if not names or any(name.startswith(prefix) for prefix in names)
+        }
+        if not selected:
+            raise CommandError("No benchmark matches the given names.")
+
+        for name, setup in selected.items():
+            result = measure(name, setup(), iterations=options["iterations"])
+            self.stdout.write(
+                f"{name}: {result.mean * 1e6:.1f}us mean, "
+                f"{result.p50 * 1e6:.1f}us p50, {result.p95 * 1e6:.1f}us p95, "
+                f"{result.ops_per_second:.0f} ops/s"
+            )
@@ -0,0 +1,54 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+from django.core.management.base import BaseCommand
+
+from core.helpers.credential_reaper import reap_credentials
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes expired temporary and password reset tokens and idle user "
+        "devices, and clears expired OTP challenges, in batches"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the rows that would be reaped",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Rows per batch (defaults to CREDENTIAL_REAPER['BATCH_SIZE'])",
+        )
+        parser.add_argument(
+            "--only",
+            action="append",
+            help="Restrict the run to a target, e.g. expiring_tokens (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        results = reap_credentials(
+            dry_run=dry_run,
+            batch_size=options["batch_size"],
+            only=options["only"],
+        )
+
+        verb = "would reap" if dry_run else "reaped"
+        total = 0
+        for result in results:
+            total += result.rows
+            self.stdout.write(
+                f"{result.name}: {verb} {result.rows} rows in {result.batches} "
+                f"batches, {result.seconds:.2f}s ({result.rows_per_second:.0f} rows/s)"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Done, {verb} {total} rows."))
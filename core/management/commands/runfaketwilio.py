@@ -0,0 +1,56 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+from django.core.management.base import BaseCommand
+
+from authentication.helpers.fake_twilio import FakeTwilioServer
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs a local fake Twilio API; set TWILIO_API_BASE_URL to its URL to "
+        "send SMS to it"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8011)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0,
+            help="Seconds to wait before answering each request",
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0,
+            help="Share of requests (0 to 1) answered with a 500 error",
+        )
+
+    def handle(self, *args, **options):
+        server = FakeTwilioServer(
+            options["host"],
+            options["port"],
+            latency=options["latency"],
+            error_rate=options["error_rate"],
+            verbose=options["verbosity"] > 1,
+        )
+        self.stdout.write(f"Fake Twilio API listening on {server.url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Accepted {len(server.messages)} messages, failed {server.errors}."
+            )
+        )
@@ -0,0 +1,106 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+import multiprocessing
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.helpers.task_queue import Worker, get_task_queue_settings
+
+
+def run_worker_process(poll_interval):
+    worker = Worker(poll_interval=poll_interval)
+    signal.signal(signal.SIGTERM, lambda *args: worker.stop_event.set())
+    signal.signal(signal.SIGINT, lambda *args: worker.stop_event.set())
+    worker.run_forever()
+
+
+class Command(BaseCommand):
+    help = "Runs queued background tasks with a pool of threads or processes"
+
+    def add_arguments(self, parser):
+        config = get_task_queue_settings()
+        parser.add_argument(
+            "--pool",
+            choices=["thread", "process"],
+            default=config["POOL"],
+            help="Run the workers as threads or as processes",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=config["CONCURRENCY"],
+            help="Number of workers",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=config["POLL_INTERVAL"],
+            help="Seconds an idle worker waits before polling again",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Run the due tasks and exit instead of polling forever",
+        )
+
+    def handle(self, *args, **options):
+        if options["burst"]:
+            count = Worker().run_pending()
+            self.stdout.write(self.style.SUCCESS(f"Ran {count} tasks."))
+            return
+
+        if options["pool"] == "process":
+            self.run_processes(options["concurrency"], options["poll_interval"])
+        else:
+            self.run_threads(options["concurrency"], options["poll_interval"])
+
+    def run_threads(self, concurrency, poll_interval):
+        workers = [Worker(poll_interval=poll_interval) for _ in range(concurrency)]
+
+        def stop(*args):
+            for worker in workers:
+                worker.stop_event.set()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        threads = [threading.Thread(target=worker.run_forever) for worker in workers]
+        self.stdout.write(f"Starting {concurrency} worker threads...")
+        for thread in threads:
+            thread.start()
+        # Join with a timeout so the main thread keeps handling signals
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=1)
+        self.stdout.write(self.style.SUCCESS("Workers stopped."))
+
+    def run_processes(self, concurrency, poll_interval):
+        # Children must open their own database connections
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=run_worker_process, args=(poll_interval,))
+            for _ in range(concurrency)
+        ]
+        self.stdout.write(f"Starting {concurrency} worker processes...")
+        for process in processes:
+            process.start()
+
+        def stop(*args):
+            for process in processes:
+                process.terminate()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        for process in processes:
+            process.join()
+        self.stdout.write(self.style.SUCCESS("Workers stopped."))
@@ -0,0 +1,108 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+import copy
+import math
+import statistics
+import time
+
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+
+# Work factor attribute of each hasher family, and whether the cost grows
+# linearly with it or doubles with each step
+WORK_FACTORS = [
+    ("iterations", "linear"),  # PBKDF2
+    ("time_cost", "linear"),  # Argon2
+    ("work_factor", "power_of_two"),  # scrypt
+    ("rounds", "exponent"),  # bcrypt
+]
+
+
+def measure_hasher(hasher, samples):
+    salt = hasher.salt()
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.encode("correct horse battery staple", salt)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def recommend(value, scaling, ratio):
+    if scaling == "linear":
+        return max(1, round(value * ratio))
+    if scaling == "power_of_two":
+        return 2 ** max(1, round(math.log2(value * ratio)))
+    return max(4, value + round(math.log2(ratio)))
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the default password hasher on this machine and recommends "
+        "its work factor for a target hashing latency"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=250,
+            help="Target time to hash or verify one password, in milliseconds",
+        )
+        parser.add_argument("--samples", type=int, default=5)
+
+    def handle(self, *args, **options):
+        hasher = get_hasher("default")
+        samples = options["samples"]
+        target = options["target_ms"] / 1000
+
+        elapsed = measure_hasher(hasher, samples)
+        self.stdout.write(
+            f"{hasher.algorithm} ({type(hasher).__name__}): {elapsed * 1000:.1f}ms "
+            f"per hash"
+        )
+
+        attribute = next(
+            (item for item in WORK_FACTORS if hasattr(hasher, item[0])), None
+        )
+        if attribute is None:
+            self.stdout.write(
+                self.style.WARNING(
+                    "This hasher has no work factor to tune, use a slower one."
+                )
+            )
+            return
+
+        name, scaling = attribute
+        current = getattr(hasher, name)
+        recommended = recommend(current, scaling, target / elapsed)
+
+        tuned = copy.copy(hasher)
+        setattr(tuned, name, recommended)
+        tuned_elapsed = measure_hasher(tuned, samples)
+
+        self.stdout.write(
+            f"{name}: {current} -> {recommended} "
+            f"({tuned_elapsed * 1000:.1f}ms per hash, target "
+            f"{options['target_ms']:.0f}ms)"
+        )
+        if recommended < current:
+            self.stdout.write(
+                self.style.WARNING(
+                    "This weakens the current setting; prefer more password pool "
+                    "workers or a higher target if logins can afford it."
+                )
+            )
+        self.stdout.write(
+            "\nTo apply it, subclass the hasher and list it first in "
+            "PASSWORD_HASHERS:\n\n"
+            f"class Tuned{type(hasher).__name__}({type(hasher).__name__}):\n"
+            f"    {name} = {recommended}\n"
+        )
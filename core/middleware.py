@@ -7,25 +7,51 @@
 #           Rakan Farhouda
 #
 
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from django.http import JsonResponse
+from django.utils.functional import SimpleLazyObject
+from rest_framework.exceptions import APIException
+
+from authentication.backends import (
+    TOKEN_KIND_ACCESS,
+    authenticate_bearer_token,
+    peek_token_kind,
+)
+from authentication.helpers.user_agent import get_user_agent_string, parse_user_agent
 
 
 class JWTAuthenticationMiddleware:
+    """
+    Authenticates access tokens ahead of the views so that Django-level
+    consumers (e.g. auditlog) see the user. The result is memoized on the
+    request and reused by the DRF authenticators.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if peek_token_kind(request) == TOKEN_KIND_ACCESS:
+            try:
+                result = authenticate_bearer_token(request)
+            except APIException as e:
+                return JsonResponse(
+                    {"detail": str(e.detail), "code": e.get_codes()}, status=401
+                )
+            request.user = result.user
+        return self.get_response(request)
+
+
+class UserAgentMiddleware:
+    """
+    Attaches the parsed user agent to the request as ``request.user_agent``.
+    It is only parsed when used, through the process-wide user agent cache.
+    """
+
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        auth_header = request.META.get("HTTP_AUTHORIZATION", "")
-        if auth_header.startswith("Bearer"):
-            # Extract token
-            token = auth_header[7:]
-            if len(token) != 40:  # Replace 40 with the actual length of your temp token
-                try:
-                    result = JWTAuthentication().authenticate(request)
-                    if result is not None:
-                        user, _ = result
-                        request.user = user
-                except Exception as e:
-                    return JsonResponse(e.args[0], status=401)
+        request.user_agent = SimpleLazyObject(
+            lambda: parse_user_agent(get_user_agent_string(request))
+        )
         return self.get_response(request)
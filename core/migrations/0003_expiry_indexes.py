@@ -0,0 +1,23 @@
+# Generated by Django 4.2.4 on 2026-10-18 14:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='expiringtoken',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, verbose_name='Expires'),
+        ),
+        migrations.AlterField(
+            model_name='userdevice',
+            name='last_login',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.4 on 2026-10-18 14:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_task_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserAgentString',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('digest', models.CharField(max_length=32, unique=True)),
+                ('value', models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='userdevice',
+            name='fingerprint',
+            field=models.CharField(editable=False, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='userdevice',
+            name='user_agent_string',
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='devices',
+                to='core.useragentstring',
+            ),
+        ),
+    ]
@@ -0,0 +1,133 @@
+import hashlib
+import ipaddress
+
+from django.db import migrations, models, transaction
+from django.db.models import Count, Max
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+
+
+# Frozen copy of core.helpers.device_fingerprint as of this migration, so later
+# changes to the helper don't alter the backfilled values
+def _digest(value):
+    return hashlib.blake2b(value.encode(), digest_size=16).hexdigest()
+
+
+def normalize_user_agent(user_agent):
+    return " ".join(str(user_agent or "").split())[:255]
+
+
+def normalize_ip_address(ip_address):
+    try:
+        return ipaddress.ip_address(ip_address).compressed
+    except ValueError:
+        return str(ip_address or "")
+
+
+def get_user_agent_digest(user_agent):
+    return _digest(normalize_user_agent(user_agent))
+
+
+def get_device_fingerprint(user_agent, ip_address):
+    return _digest(
+        f"{normalize_user_agent(user_agent)}\0{normalize_ip_address(ip_address)}"
+    )
+
+
+def backfill_fingerprints(apps, schema_editor):
+    """
+    Moves the user agents of existing devices to the dictionary table and
+    fingerprints them, one batch per transaction so large tables aren't
+    locked for the whole run.
+    """
+    UserAgentString = apps.get_model("core", "UserAgentString")
+    UserDevice = apps.get_model("core", "UserDevice")
+
+    last_pk = 0
+    while True:
+        devices = list(
+            UserDevice.objects.filter(pk__gt=last_pk)
+            .only("pk", "user_agent", "ip_address")
+            .order_by("pk")[:BATCH_SIZE]
+        )
+        if not devices:
+            break
+        last_pk = devices[-1].pk
+
+        with transaction.atomic():
+            values = {
+                get_user_agent_digest(device.user_agent): normalize_user_agent(
+                    device.user_agent
+                )
+                for device in devices
+            }
+            UserAgentString.objects.bulk_create(
+                [
+                    UserAgentString(digest=digest, value=value)
+                    for digest, value in values.items()
+                ],
+                ignore_conflicts=True,
+            )
+            ids = dict(
+                UserAgentString.objects.filter(digest__in=values).values_list(
+                    "digest", "id"
+                )
+            )
+            for device in devices:
+                device.user_agent_string_id = ids[
+                    get_user_agent_digest(device.user_agent)
+                ]
+                device.fingerprint = get_device_fingerprint(
+                    device.user_agent, device.ip_address
+                )
+            UserDevice.objects.bulk_update(
+                devices, ["user_agent_string", "fingerprint"]
+            )
+
+    # Rows that only differed by whitespace now share a fingerprint, keep the
+    # most recently used one
+    duplicates = (
+        UserDevice.objects.values("user", "fingerprint")
+        .annotate(count=Count("pk"), last=Max("last_login"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates.iterator():
+        rows = UserDevice.objects.filter(
+            user=duplicate["user"], fingerprint=duplicate["fingerprint"]
+        ).order_by("-last_login", "-pk")
+        keep = rows.values_list("pk", flat=True).first()
+        rows.exclude(pk=keep).delete()
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('core', '0005_user_agent_strings'),
+    ]
+
+    operations = [
+        # The user agents are restored by the reverse of 0007
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+        # Replaces unique (user, user_agent, ip_address), whose columns are
+        # still filled when this is reversed
+        migrations.AlterUniqueTogether(
+            name='userdevice',
+            unique_together={('user', 'fingerprint')},
+        ),
+        migrations.AlterField(
+            model_name='userdevice',
+            name='fingerprint',
+            field=models.CharField(editable=False, max_length=32),
+        ),
+        migrations.AlterField(
+            model_name='userdevice',
+            name='user_agent_string',
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='devices',
+                to='core.useragentstring',
+            ),
+        ),
+    ]
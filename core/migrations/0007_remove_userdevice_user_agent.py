@@ -0,0 +1,50 @@
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 1000
+
+
+def restore_user_agents(apps, schema_editor):
+    """
+    Refills the re-added user_agent column from the dictionary table, before
+    0006 restores the unique constraint over it.
+    """
+    UserDevice = apps.get_model("core", "UserDevice")
+
+    last_pk = 0
+    while True:
+        devices = list(
+            UserDevice.objects.filter(pk__gt=last_pk)
+            .select_related("user_agent_string")
+            .order_by("pk")[:BATCH_SIZE]
+        )
+        if not devices:
+            break
+        last_pk = devices[-1].pk
+
+        for device in devices:
+            device.user_agent = device.user_agent_string.value
+        with transaction.atomic():
+            UserDevice.objects.bulk_update(devices, ["user_agent"])
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('core', '0006_backfill_device_fingerprints'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_user_agents),
+        # Gives the column a default, so it can be re-added to existing rows
+        # when this is reversed
+        migrations.AlterField(
+            model_name='userdevice',
+            name='user_agent',
+            field=models.CharField(default='', max_length=255),
+        ),
+        migrations.RemoveField(
+            model_name='userdevice',
+            name='user_agent',
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Backs the ("-timestamp", "-id") keyset pagination of the logs endpoint.
+    The audit log table belongs to django-auditlog, so the index is created
+    with raw SQL rather than through its model state.
+    """
+
+    dependencies = [
+        ('core', '0007_remove_userdevice_user_agent'),
+        ('auditlog', '0012_add_logentry_action_access'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX IF NOT EXISTS "core_logentry_timestamp_id_idx" '
+                'ON "auditlog_logentry" ("timestamp" DESC, "id" DESC)'
+            ),
+            reverse_sql='DROP INDEX IF EXISTS "core_logentry_timestamp_id_idx"',
+        ),
+    ]
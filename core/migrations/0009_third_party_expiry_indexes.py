@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Indexes the remaining columns the credential reaper filters on. Both
+    tables belong to third-party apps, so the indexes are created with raw SQL
+    rather than through their model state.
+    """
+
+    dependencies = [
+        ('core', '0008_logentry_timestamp_id_index'),
+        ('django_rest_passwordreset', '0004_alter_resetpasswordtoken_user_agent'),
+        ('otp_email', '0005_emaildevice_last_generated_timestamp'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX IF NOT EXISTS "core_resetpasswordtoken_created_at_idx" '
+                'ON "django_rest_passwordreset_resetpasswordtoken" ("created_at")'
+            ),
+            reverse_sql=(
+                'DROP INDEX IF EXISTS "core_resetpasswordtoken_created_at_idx"'
+            ),
+        ),
+        migrations.RunSQL(
+            sql=(
+                'CREATE INDEX IF NOT EXISTS "core_emaildevice_valid_until_idx" '
+                'ON "otp_email_emaildevice" ("valid_until")'
+            ),
+            reverse_sql='DROP INDEX IF EXISTS "core_emaildevice_valid_until_idx"',
+        ),
+    ]
@@ -10,15 +10,26 @@
 from auditlog.registry import auditlog
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import F
 from django.utils import timezone
 from django.utils.crypto import get_random_string
 from django.utils.translation import gettext as _
 from phonenumber_field.modelfields import PhoneNumberField
 from auditlog.context import disable_auditlog
 from accounts.models import Profile
+from core.helpers import password_pool
+from core.helpers.device_fingerprint import (
+    get_device_fingerprint,
+    get_user_agent_digest,
+    normalize_user_agent,
+)
 from core.validators import validate_image_file_extension
 
+# Temporary 2FA tokens carry this prefix so they can't be mistaken for JWTs.
+TEMPORARY_TOKEN_PREFIX = "tmp_"
+
 
 class CustomUserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
@@ -55,6 +66,8 @@ class User(AbstractUser):
     )
     enabled_2fa = models.BooleanField(default=False)
     default_2fa_method = models.CharField(max_length=10, null=True, blank=True)
+    # Embedded in issued tokens; bumping it revokes every token issued before
+    token_version = models.PositiveIntegerField(default=0)
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["phone_number"]  # email is default required field
 
@@ -65,41 +78,138 @@ class User(AbstractUser):
         verbose_name_plural = _("users")
         ordering = ["-id"]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_is_active = instance.__dict__.get("is_active")
+        return instance
+
+    def save(self, *args, **kwargs):
+        deactivated = not self.is_active and getattr(self, "_loaded_is_active", False)
+        super().save(*args, **kwargs)
+        self._loaded_is_active = self.is_active
+        if deactivated:
+            self.revoke_tokens()
+
     def delete(self, *args, **kwargs):
         with disable_auditlog():
             super().delete(*args, **kwargs)
 
+    def set_password(self, raw_password):
+        # Hashed in the password pool when PASSWORD_POOL["ENABLED"] is set
+        self.password = password_pool.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        def setter(raw_password):
+            self.set_password(raw_password)
+            # Password hash upgrades shouldn't be considered password changes.
+            self._password = None
+            self.save(update_fields=["password"])
+
+        return password_pool.check_password(raw_password, self.password, setter)
+
+    def revoke_tokens(self):
+        """
+        Revokes every access and refresh token issued to the user so far by
+        bumping the user's token version.
+        """
+        from authentication.helpers.user_cache import invalidate_user
+
+        User.objects.filter(pk=self.pk).update(token_version=F("token_version") + 1)
+        self.refresh_from_db(fields=["token_version"])
+        invalidate_user(self)
+
     def __str__(self):
         if self.first_name and self.last_name:
             return self.first_name + " " + self.last_name
         return "No Name"
 
     def generate_temporary_token(self):
-        ExpiringToken.objects.filter(user=self).delete()
-        token, _ = ExpiringToken.objects.get_or_create(user=self)
-        return token.key
+        from authentication.helpers.token_store import get_temporary_token_store
+
+        return get_temporary_token_store().issue(self)
 
     def delete_temporary_token(self):
-        ExpiringToken.objects.filter(user=self).delete()
+        from authentication.helpers.token_store import get_temporary_token_store
+
+        get_temporary_token_store().revoke(self)
 
 
 auditlog.register(User, exclude_fields=["password"])
 
 
+class UserAgentStringManager(models.Manager):
+    def get_for_value(self, user_agent):
+        """
+        Returns the dictionary row of a user agent, creating it if needed.
+        """
+        value = normalize_user_agent(user_agent)
+        return self.get_or_create(
+            digest=get_user_agent_digest(value), defaults={"value": value}
+        )[0]
+
+
+class UserAgentString(models.Model):
+    """
+    Deduplicated user agents, shared by every device that reports them.
+    """
+
+    digest = models.CharField(max_length=32, unique=True)
+    value = models.CharField(max_length=255)
+
+    objects = UserAgentStringManager()
+
+    def __str__(self):
+        return self.value
+
+
 class UserDevice(models.Model):
+    """
+    A device a user logged in from, identified by the fingerprint of its user
+    agent and IP address. Look devices up by (user, fingerprint), see
+    core.helpers.device_fingerprint.get_device_fingerprint.
+    """
+
     user = models.ForeignKey(User, on_delete=models.CASCADE)
-    user_agent = models.CharField(max_length=255)
+    user_agent_string = models.ForeignKey(
+        UserAgentString, on_delete=models.PROTECT, related_name="devices"
+    )
     ip_address = models.GenericIPAddressField()
-    last_login = models.DateTimeField(auto_now=True)
+    fingerprint = models.CharField(max_length=32, editable=False)
+    last_login = models.DateTimeField(auto_now=True, db_index=True)
     trusted = models.BooleanField(default=False)
 
     class Meta:
-        unique_together = ("user", "user_agent", "ip_address")
+        unique_together = ("user", "fingerprint")
         ordering = ["-last_login"]
 
     def __str__(self):
         return f"{self.user} - {self.user_agent} - {self.ip_address}"
 
+    @property
+    def user_agent(self):
+        if "_user_agent" in self.__dict__:
+            return self._user_agent
+        return self.user_agent_string.value if self.user_agent_string_id else ""
+
+    @user_agent.setter
+    def user_agent(self, value):
+        # Resolved to its dictionary row when the device is saved
+        self._user_agent = normalize_user_agent(value)
+
+    def save(self, *args, **kwargs):
+        user_agent = self.__dict__.pop("_user_agent", None)
+        if user_agent is not None or self.user_agent_string_id is None:
+            self.user_agent_string = UserAgentString.objects.get_for_value(user_agent)
+            self.fingerprint = ""
+        user_agent_field = self._meta.get_field("user_agent_string")
+        if not self.fingerprint or user_agent_field.is_cached(self):
+            self.fingerprint = get_device_fingerprint(
+                self.user_agent_string.value, self.ip_address
+            )
+        super().save(*args, **kwargs)
+
 
 auditlog.register(UserDevice)
 
@@ -110,14 +220,72 @@ class ExpiringToken(models.Model):
         User, related_name="expiring_token", on_delete=models.CASCADE
     )
     created_at = models.DateTimeField("Created", auto_now_add=True)
-    expires_at = models.DateTimeField("Expires")
+    expires_at = models.DateTimeField("Expires", db_index=True)
+
+    @staticmethod
+    def generate_key():
+        return TEMPORARY_TOKEN_PREFIX + get_random_string(
+            length=40 - len(TEMPORARY_TOKEN_PREFIX)
+        )
 
     def save(self, *args, **kwargs):
         if not self.key:
-            self.key = get_random_string(length=40)
+            self.key = self.generate_key()
         self.expires_at = timezone.now() + settings.TOKEN_EXPIRATION_TIME
         super().save(*args, **kwargs)
 
     @property
     def is_expired(self):
         return self.expires_at <= timezone.now()
+
+
+class TaskPayloadEncoder(DjangoJSONEncoder):
+    """
+    Serializes task arguments, falling back to `str` for values such as phone
+    numbers or parsed user agents.
+    """
+
+    def default(self, o):
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)
+
+
+class Task(models.Model):
+    """
+    A unit of background work waiting to be run by `runworker`.
+
+    Rows are deleted once the task succeeds, and moved to DeadLetterTask once
+    it has failed `max_attempts` times.
+    """
+
+    name = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict, encoder=TaskPayloadEncoder)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["run_at", "id"])]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk}"
+
+
+class DeadLetterTask(models.Model):
+    """
+    A task that exhausted its retries, kept for inspection and manual requeue.
+    """
+
+    name = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict, encoder=TaskPayloadEncoder)
+    attempts = models.PositiveIntegerField()
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    failed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} #{self.pk}"
@@ -8,27 +8,42 @@
 #
 
 
-from rest_framework.exceptions import ValidationError
-from rest_framework.pagination import PageNumberPagination
+import operator
+from functools import partial, reduce
 
+from django.core import signing
+from django.core.paginator import Paginator as DjangoPaginator
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from django.utils.encoding import force_str
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
-class GlobalPagination(PageNumberPagination):
-    """
-    A simple page number based style that supports page numbers as
-    query parameters. For example:
+from core.helpers.count_strategies import (
+    CACHED,
+    CAPPED,
+    ESTIMATE,
+    EXACT,
+    count_queryset,
+)
 
-    https://api.example.com/users/?page=4
-    https:/api.example.com/users/?page=4&page_size=100
-    """
+PAGE_MODE = "page"
+CURSOR_MODE = "cursor"
 
+
+class PageSizeMixin:
     # Setting the default page size to 10
     page_size = 10
     # Setting the maximum page size to 100
     max_page_size = 100
+    page_size_query_param = "page_size"
 
     # Overriding the get_page_size method to return the paginated response in the desired format
     def get_page_size(self, request):
-        page_size = request.query_params.get("page_size", self.page_size)
+        page_size = request.query_params.get(self.page_size_query_param, self.page_size)
         try:
             page_size = int(page_size)
         except ValueError:
@@ -40,3 +55,294 @@ class GlobalPagination(PageNumberPagination):
                 {"detail": f"Maximum page size is {self.max_page_size}"}
             )
         return page_size
+
+
+class KeysetPagination(PageSizeMixin, BasePagination):
+    """
+    A keyset (cursor) based style. Pages are found by filtering on the
+    ordering values of the previous page's edge row, so neither a COUNT(*) nor
+    an OFFSET is needed. For example:
+
+    https://api.example.com/logs/?cursor=<opaque>&page_size=100
+
+    The ordering should be unique and backed by an index, e.g.
+    ("-timestamp", "-id"), and its fields must not be nullable. Cursors are
+    signed, a tampered one is rejected.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_query_description = "The pagination cursor value."
+    ordering = ("-id",)
+    cursor_salt = "core.pagination.cursor"
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, "cursor_ordering", self.ordering))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(view)
+        self.fields = [field.lstrip("-") for field in self.ordering]
+        reverse, position = self.decode_cursor(request, queryset.model)
+
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position, reverse))
+        ordering = self.ordering
+        if reverse:
+            ordering = [self.invert(field) for field in ordering]
+
+        queryset, get_position = self.get_position_reader(queryset)
+        rows = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Coming back from either side means there is a page on that side
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = has_more if reverse else position is not None
+        self.first_position = get_position(rows[0]) if rows else None
+        self.last_position = get_position(rows[-1]) if rows else None
+        return rows
+
+    def invert(self, field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def get_position_filter(self, position, reverse):
+        """
+        Returns the rows after `position` in the ordering, or before it when
+        going back, as (a < x) | (a = x & b < y) | ...
+        """
+        conditions = []
+        for index, field in enumerate(self.ordering):
+            descending = field.startswith("-") != reverse
+            lookup = "lt" if descending else "gt"
+            equal = {name: value for name, value in zip(self.fields, position[:index])}
+            name = self.fields[index]
+            conditions.append(Q(**equal, **{f"{name}__{lookup}": position[index]}))
+        return reduce(operator.or_, conditions)
+
+    def get_position_reader(self, queryset):
+        """
+        Returns the queryset and a function reading the ordering values of one
+        of its rows, model instances or `.values_list()` tuples.
+        """
+        fields = getattr(queryset, "_fields", None)
+        if fields is None:
+            attnames = [
+                queryset.model._meta.get_field(name).attname for name in self.fields
+            ]
+            return queryset, lambda row: [getattr(row, name) for name in attnames]
+
+        # Trailing columns are added for the ordering values the rows lack
+        fields = list(fields)
+        missing = [name for name in self.fields if name not in fields]
+        indexes = [(fields + missing).index(name) for name in self.fields]
+        if missing:
+            queryset = queryset.values_list(*fields, *missing)
+        return queryset, lambda row: [row[index] for index in indexes]
+
+    def encode_cursor(self, position, reverse):
+        values = [
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in position
+        ]
+        cursor = signing.dumps(
+            {"p": values, "r": reverse}, salt=self.cursor_salt, compress=True
+        )
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model):
+        """
+        Returns (reverse, position) from the request's cursor, position being
+        None on the first page.
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return False, None
+        try:
+            data = signing.loads(cursor, salt=self.cursor_salt)
+            values = data["p"]
+            if len(values) != len(self.fields):
+                raise ValueError
+            position = [
+                model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.fields, values)
+            ]
+            return bool(data["r"]), position
+        except (
+            signing.BadSignature,
+            DjangoValidationError,
+            KeyError,
+            TypeError,
+            ValueError,
+        ):
+            raise NotFound("Invalid cursor")
+
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        return self.encode_cursor(self.last_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_position is None:
+            return None
+        return self.encode_cursor(self.first_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": force_str(self.cursor_query_description),
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+class CountingPaginator(DjangoPaginator):
+    """
+    A Django paginator counting its object list with a count strategy, see
+    core.helpers.count_strategies. Estimated or capped counts also bound the
+    reachable page numbers.
+    """
+
+    def __init__(self, *args, count_strategy=None, count_options=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_strategy = count_strategy
+        self.count_options = count_options
+
+    @cached_property
+    def counted(self):
+        return count_queryset(self.object_list, self.count_strategy, self.count_options)
+
+    @cached_property
+    def count(self):
+        return self.counted[0]
+
+    @property
+    def count_strategy_used(self):
+        return self.counted[1]
+
+
+class GlobalPagination(PageSizeMixin, PageNumberPagination):
+    """
+    A simple page number based style that supports page numbers as
+    query parameters. For example:
+
+    https://api.example.com/users/?page=4
+    https:/api.example.com/users/?page=4&page_size=100
+
+    Keyset pagination is used instead when the view sets
+    `pagination_mode = "cursor"`, or the request asks for it with
+    `?pagination=cursor` or passes a cursor. The view's `cursor_ordering`
+    picks the ordering, "-id" by default.
+
+    Page numbers come with a count produced by the view's `count_strategy`
+    (the COUNTING setting's by default), named in `count_strategy`.
+    """
+
+    mode_query_param = "pagination"
+    mode = PAGE_MODE
+    keyset_class = KeysetPagination
+
+    def get_mode(self, request, view):
+        mode = request.query_params.get(self.mode_query_param)
+        if mode is None and request.query_params.get(
+            self.keyset_class.cursor_query_param
+        ):
+            mode = CURSOR_MODE
+        if mode is None:
+            mode = getattr(view, "pagination_mode", self.mode)
+        if mode not in (PAGE_MODE, CURSOR_MODE):
+            raise ValidationError(
+                {"detail": f"Invalid pagination, use {PAGE_MODE} or {CURSOR_MODE}."}
+            )
+        return mode
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.get_mode(request, view) == CURSOR_MODE:
+            self.keyset = self.keyset_class()
+            self.keyset.page_size = self.page_size
+            self.keyset.max_page_size = self.max_page_size
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        self.django_paginator_class = partial(
+            CountingPaginator,
+            count_strategy=getattr(view, "count_strategy", None),
+            count_options=getattr(view, "count_options", None),
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return Response(
+            {
+                "count": self.page.paginator.count,
+                "count_strategy": self.page.paginator.count_strategy_used,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        properties = response_schema["properties"]
+        response_schema["properties"] = {
+            "count": properties.pop("count"),
+            "count_strategy": {
+                "type": "string",
+                "enum": [EXACT, ESTIMATE, CAPPED, CACHED],
+                "description": "How count was produced, only exact is exact.",
+            },
+            **properties,
+        }
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters += self.keyset_class().get_schema_operation_parameters(view)[:1]
+        parameters.append(
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Pagination style, page numbers or cursors.",
+                "schema": {"type": "string", "enum": [PAGE_MODE, CURSOR_MODE]},
+            }
+        )
+        return parameters
@@ -23,17 +23,17 @@ class CustomAutoSchema(AutoSchema):
         Override to provide custom tags for the API endpoints. Tags are determined
         based on the view's name or URL, with a fallback to the default logic.
         """
-        view_name = self._view.__class__.__name__.lower()
-        url_name = getattr(self._view, "url_name", "").lower()
+        view_name = self.view.__class__.__name__.lower()
+        url_name = getattr(self.view, "url_name", "").lower()
 
         if "password" in view_name or "password" in url_name:
             return ["Reset Password"]
 
         return [
             getattr(
-                self._view,
+                self.view,
                 "drf_tag",
-                self._view.__class__.__name__.replace("ViewSet", ""),
+                self.view.__class__.__name__.replace("ViewSet", ""),
             )
         ]
 
@@ -42,26 +42,24 @@ class CustomAutoSchema(AutoSchema):
         Override to extract and provide a custom description for the API endpoints.
         The description is extracted from the docstring of the view.
         """
-        doc = self._view.__doc__
+        doc = self.view.__doc__
         if doc:
             description_lines = [
                 line.strip() for line in doc.split("\n") if line.strip().startswith("*")
             ]
             return " ".join(description_lines).strip("*") if description_lines else None
-        return f"{self._view.__class__.__name__} operations"
+        return f"{self.view.__class__.__name__} operations"
 
     def get_filter_fields(self):
         """
         Generates a list of available filter, search, and ordering fields for the view.
         """
-        if hasattr(self._view, "filter_backends"):
-            filter_backends = self._view.filter_backends
+        if hasattr(self.view, "filter_backends"):
+            filter_backends = self.view.filter_backends
             fields = []
             for backend in filter_backends:
                 if hasattr(backend, "get_filterset_class"):
-                    filterset_class = backend.get_filterset_class(
-                        self._view, self._view
-                    )
+                    filterset_class = backend.get_filterset_class(self.view, self.view)
                     if filterset_class:
                         fields.extend(filterset_class().get_fields())
                 elif hasattr(backend, "search_fields"):
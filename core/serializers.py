@@ -11,22 +11,24 @@ from rest_framework import serializers
 
 
 class DynamicFieldsSerializer(serializers.ModelSerializer):
-    def __init__(self, *args, **kwargs):
-        super(DynamicFieldsSerializer, self).__init__(*args, **kwargs)
-
-        requested_fields = self.get_requested_fields(kwargs.get("context", {}))
+    def get_field_names(self, declared_fields, info):
+        """
+        Narrows the model fields to the requested ones, so fields that weren't
+        asked for are never built
+        """
+        field_names = super().get_field_names(declared_fields, info)
+        requested_fields = self.get_requested_fields(self.context)
 
         if requested_fields is not None:
-            valid_fields = set(self.fields.keys())
             # Keep only valid fields from requested fields
-            valid_requested_fields = set(
-                field for field in requested_fields if field in valid_fields
-            )
+            valid_requested_fields = [
+                field for field in field_names if field in requested_fields
+            ]
 
             # If no valid fields are requested, do not alter the fields
             if valid_requested_fields:
-                for field_name in valid_fields - valid_requested_fields:
-                    self.fields.pop(field_name)
+                return valid_requested_fields
+        return field_names
 
     def get_requested_fields(self, context):
         """
@@ -0,0 +1,22 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from core.helpers.email_utils import EmailHelper
+from core.helpers.task_queue import task
+
+
+@task
+def send_email(subject, template_name, context, to_email, bcc=None):
+    EmailHelper(subject, template_name, context, bcc).send_email(to_email)
+
+
+@task
+def send_emails(subject, template_name, context, to_emails, bcc=None):
+    EmailHelper(subject, template_name, context, bcc).send_messages(to_emails)
@@ -0,0 +1,67 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+
+from core.helpers.count_strategies import count_queryset
+
+
+class CountStrategiesTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        Group.objects.bulk_create(Group(name=f"group{index}") for index in range(5))
+
+    def test_exact(self):
+        self.assertEqual(count_queryset(Group.objects.all(), "exact"), (5, "exact"))
+
+    def test_capped(self):
+        queryset = Group.objects.all()
+        self.assertEqual(count_queryset(queryset, "capped", {"CAP": 3}), (3, "capped"))
+        self.assertEqual(count_queryset(queryset, "capped", {"CAP": 5}), (5, "exact"))
+
+    def test_cached(self):
+        queryset = Group.objects.filter(name__startswith="group")
+        self.assertEqual(count_queryset(queryset, "cached"), (5, "cached"))
+
+        Group.objects.create(name="group5")
+        with self.assertNumQueries(0):
+            self.assertEqual(count_queryset(queryset, "cached"), (5, "cached"))
+        # Another filter is another count
+        self.assertEqual(
+            count_queryset(Group.objects.filter(name__startswith="g"), "cached"),
+            (6, "cached"),
+        )
+
+    def test_estimate(self):
+        queryset = Group.objects.all()
+        # Counted exactly where there is no planner to ask
+        self.assertEqual(count_queryset(queryset, "estimate"), (5, "exact"))
+
+        with mock.patch.object(connection, "vendor", "postgresql"), mock.patch(
+            "core.helpers.count_strategies.get_planner_estimate"
+        ) as get_planner_estimate:
+            get_planner_estimate.return_value = 250000
+            self.assertEqual(count_queryset(queryset, "estimate"), (250000, "estimate"))
+
+            get_planner_estimate.return_value = 10
+            self.assertEqual(count_queryset(queryset, "estimate"), (5, "exact"))
+
+    def test_empty_filter(self):
+        queryset = Group.objects.filter(pk__in=[])
+        self.assertEqual(count_queryset(queryset, "cached"), (0, "exact"))
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            count_queryset(Group.objects.all(), "guess")
@@ -0,0 +1,130 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from datetime import timedelta
+from io import StringIO
+
+from auditlog.models import LogEntry
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django_rest_passwordreset.models import ResetPasswordToken
+
+from authentication.models import CustomEmailDevice
+from core.helpers.credential_reaper import reap_credentials, reap_in_batches
+from core.models import ExpiringToken, UserDevice
+
+User = get_user_model()
+
+
+class CredentialReaperTest(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.users = [
+            User.objects.create_user(
+                email=f"user{i}@test.com",
+                password="password",
+                phone_number=f"+90500000000{i}",
+            )
+            for i in range(5)
+        ]
+        for i, user in enumerate(self.users):
+            ExpiringToken.objects.create(user=user)
+            UserDevice.objects.create(
+                user=user, user_agent="Other / Other / Other", ip_address="127.0.0.1"
+            )
+            ResetPasswordToken.objects.create(user=user)
+        # The first three of each are expired
+        expired_users = self.users[:3]
+        ExpiringToken.objects.filter(user__in=expired_users).update(
+            expires_at=self.now - timedelta(minutes=1)
+        )
+        UserDevice.objects.filter(user__in=expired_users).update(
+            last_login=self.now - timedelta(days=365)
+        )
+        ResetPasswordToken.objects.filter(user__in=expired_users).update(
+            created_at=self.now - timedelta(days=2)
+        )
+        self.device = CustomEmailDevice.objects.create(
+            user=self.users[0],
+            name="email",
+            token="123456",
+            valid_until=self.now - timedelta(minutes=1),
+        )
+        self.live_device = CustomEmailDevice.objects.create(
+            user=self.users[1],
+            name="email",
+            token="654321",
+            valid_until=self.now + timedelta(minutes=5),
+        )
+
+    def _rows(self, results):
+        return {result.name.split(":")[0]: result.rows for result in results}
+
+    def test_reaps_only_expired_rows(self):
+        log_entries = LogEntry.objects.count()
+        results = reap_credentials(batch_size=2, now=self.now)
+
+        self.assertEqual(
+            self._rows(results),
+            {
+                "expiring_tokens": 3,
+                "password_reset_tokens": 3,
+                "otp_challenges": 1,
+                "idle_devices": 3,
+            },
+        )
+        self.assertEqual(ExpiringToken.objects.count(), 2)
+        self.assertEqual(ResetPasswordToken.objects.count(), 2)
+        self.assertEqual(UserDevice.objects.count(), 2)
+        self.device.refresh_from_db()
+        self.live_device.refresh_from_db()
+        self.assertIsNone(self.device.token)
+        self.assertEqual(self.live_device.token, "654321")
+        self.assertEqual(LogEntry.objects.count(), log_entries)
+
+    def test_dry_run_changes_nothing(self):
+        results = reap_credentials(dry_run=True, now=self.now)
+
+        self.assertEqual(self._rows(results)["expiring_tokens"], 3)
+        self.assertEqual(ExpiringToken.objects.count(), 5)
+        self.assertEqual(UserDevice.objects.count(), 5)
+        self.device.refresh_from_db()
+        self.assertEqual(self.device.token, "123456")
+
+    def test_batches_are_bounded(self):
+        queryset = ExpiringToken.objects.filter(expires_at__lte=self.now)
+        with CaptureQueriesContext(connection) as context:
+            rows, batches = reap_in_batches(
+                queryset, lambda qs: qs.delete()[0], batch_size=2
+            )
+
+        self.assertEqual((rows, batches), (3, 2))
+        deletes = [q["sql"] for q in context.captured_queries if "DELETE" in q["sql"]]
+        self.assertEqual(len(deletes), 2)
+        for sql in deletes:
+            self.assertIn('"core_expiringtoken"."key" >=', sql)
+            self.assertIn('"core_expiringtoken"."key" <=', sql)
+
+    def test_only_restricts_targets(self):
+        results = reap_credentials(only=["idle_devices"], now=self.now)
+
+        self.assertEqual(self._rows(results), {"idle_devices": 3})
+        self.assertEqual(ExpiringToken.objects.count(), 5)
+
+    def test_command_reports_throughput(self):
+        out = StringIO()
+        call_command("reap_credentials", "--dry-run", stdout=out)
+
+        self.assertIn("expiring_tokens: would reap 3 rows", out.getvalue())
+        self.assertIn("rows/s", out.getvalue())
@@ -0,0 +1,64 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from io import StringIO
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core.helpers.email_utils import EmailHelper, get_inline_images
+
+
+@override_settings(EMAIL_HOST_USER="noreply@test.com")
+class EmailHelperTest(TestCase):
+    def test_text_part_comes_from_text_template(self):
+        EmailHelper(
+            "Welcome",
+            "emails/welcome.html",
+            {"name": "O'Brien", "email": "user@test.com"},
+        ).send_email("user@test.com")
+
+        message = mail.outbox[0]
+        # The text template doesn't escape, and drops the HTML comment
+        self.assertIn("O'Brien", message.body)
+        self.assertNotIn("cid:logo", message.body)
+        self.assertEqual(message.alternatives[0][1], "text/html")
+        self.assertIn("O&#x27;Brien", message.alternatives[0][0])
+
+    def test_falls_back_to_stripping_tags(self):
+        helper = EmailHelper("OTP", "emails/auth/sms_otp.html", {"token": "123456"})
+        message = helper.build_message("user@test.com")
+        self.assertIn("123456", message.body)
+
+    def test_inline_images_are_built_once(self):
+        get_inline_images.cache_clear()
+        with patch("builtins.open", wraps=open) as mock_open:
+            first = EmailHelper("Reset", "emails/password_reset.html").build_message(
+                "a@test.com"
+            )
+            second = EmailHelper("Reset", "emails/password_reset.html").build_message(
+                "b@test.com"
+            )
+
+        image_reads = [
+            call for call in mock_open.call_args_list if "logo.png" in str(call.args[0])
+        ]
+        self.assertEqual(len(image_reads), 1)
+        self.assertIs(first.attachments[0], second.attachments[0])
+        self.assertIn(b"Content-ID: <logo>", first.message().as_bytes())
+        self.assertIn(b"Content-ID: <logo>", second.message().as_bytes())
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command("benchmark", "email.build", "sms", "--iterations", "3", stdout=out)
+        self.assertIn("email.build:", out.getvalue())
+        self.assertIn("sms.render:", out.getvalue())
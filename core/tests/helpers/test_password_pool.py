@@ -0,0 +1,84 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import os
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core.helpers import password_pool
+
+User = get_user_model()
+
+MD5 = "django.contrib.auth.hashers.MD5PasswordHasher"
+PBKDF2 = "django.contrib.auth.hashers.PBKDF2PasswordHasher"
+
+
+def worker_pid():
+    return os.getpid()
+
+
+@override_settings(
+    PASSWORD_POOL={"ENABLED": True, "WORKERS": 1},
+    PASSWORD_HASHERS=[MD5],
+)
+class PasswordPoolTest(TestCase):
+    def tearDown(self):
+        password_pool.shutdown_executor()
+
+    def test_hashing_runs_in_the_pool(self):
+        pool_pid = password_pool._run(worker_pid)
+        self.assertNotEqual(pool_pid, os.getpid())
+
+        user = User.objects.create_user(email="testuser@test.com", password="secret")
+        self.assertTrue(user.password.startswith("md5$"))
+        self.assertTrue(user.check_password("secret"))
+        self.assertFalse(user.check_password("wrong"))
+        self.assertFalse(user.check_password(None))
+
+    def test_outdated_hashes_are_upgraded(self):
+        user = User.objects.create_user(email="testuser@test.com")
+        with self.settings(PASSWORD_HASHERS=[PBKDF2, MD5]):
+            User.objects.filter(pk=user.pk).update(password=make_password("secret"))
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$"))
+
+        # The pool workers are restarted with the new hasher configuration
+        with self.settings(PASSWORD_HASHERS=[MD5, PBKDF2]):
+            self.assertTrue(user.check_password("secret"))
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("md5$"))
+
+    def test_disabled_pool_hashes_inline(self):
+        with self.settings(PASSWORD_POOL={"ENABLED": False}):
+            with patch.object(password_pool, "get_executor") as get_executor:
+                user = User.objects.create_user(
+                    email="testuser@test.com", password="secret"
+                )
+                self.assertTrue(user.check_password("secret"))
+        get_executor.assert_not_called()
+
+
+class TuneHasherCommandTest(TestCase):
+    @override_settings(PASSWORD_HASHERS=[PBKDF2])
+    def test_recommends_iterations(self):
+        out = StringIO()
+        with patch(
+            "core.management.commands.tune_hasher.measure_hasher",
+            side_effect=[0.5, 0.1],
+        ):
+            call_command("tune_hasher", "--target-ms", "100", stdout=out)
+
+        self.assertIn("iterations: 600000 -> 120000", out.getvalue())
+        self.assertIn("iterations = 120000", out.getvalue())
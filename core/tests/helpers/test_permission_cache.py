@@ -0,0 +1,94 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from accounts.serializers import UserSerializer
+from accounts.views import UsersViewSet
+from core.permissions import DynamicAccessPermission
+
+User = get_user_model()
+
+
+class EffectivePermissionCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="user@test.com", password="password", phone_number="+905000000001"
+        )
+        self.group = Group.objects.create(name="viewers")
+        self.view_user = Permission.objects.get(codename="view_user")
+        self.add_user = Permission.objects.get(codename="add_user")
+        self.group.permissions.add(self.view_user)
+        self.user.groups.add(self.group)
+
+    def fresh_user(self):
+        # A new instance, as each request gets
+        return User.objects.get(pk=self.user.pk)
+
+    def test_checks_are_free_once_warm(self):
+        self.assertTrue(self.fresh_user().has_perm("core.view_user"))
+
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perms(["core.view_user"]))
+            self.assertFalse(user.has_perm("core.add_user"))
+
+    def test_dynamic_access_permission_is_free_once_warm(self):
+        self.fresh_user().has_perm("core.view_user")
+        request = Request(APIRequestFactory().get("/accounts/users/"))
+        request.user = self.fresh_user()
+        request.auth = None
+        view = UsersViewSet(action="list", request=request, format_kwarg=None)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(DynamicAccessPermission().has_permission(request, view))
+
+    def test_serializer_reads_the_cache(self):
+        self.fresh_user().has_perm("core.view_user")
+
+        with CaptureQueriesContext(connection) as queries:
+            data = UserSerializer(self.fresh_user()).data
+        self.assertEqual(data["user_permissions"], ["view_user"])
+        self.assertFalse(
+            [q for q in queries.captured_queries if "permission" in q["sql"].lower()]
+        )
+
+    def test_group_permission_change_invalidates(self):
+        self.assertFalse(self.fresh_user().has_perm("core.add_user"))
+        self.group.permissions.add(self.add_user)
+        self.assertTrue(self.fresh_user().has_perm("core.add_user"))
+
+        # From the permission's side of the relation
+        self.add_user.group_set.remove(self.group)
+        self.assertFalse(self.fresh_user().has_perm("core.add_user"))
+
+    def test_user_access_change_invalidates(self):
+        self.assertTrue(self.fresh_user().has_perm("core.view_user"))
+        self.user.groups.remove(self.group)
+        self.assertFalse(self.fresh_user().has_perm("core.view_user"))
+
+        self.user.user_permissions.add(self.view_user)
+        self.assertTrue(self.fresh_user().has_perm("core.view_user"))
+
+        self.view_user.user_set.clear()
+        self.assertFalse(self.fresh_user().has_perm("core.view_user"))
+
+    def test_group_delete_invalidates(self):
+        self.assertTrue(self.fresh_user().has_perm("core.view_user"))
+        self.group.delete()
+        self.assertFalse(self.fresh_user().has_perm("core.view_user"))
@@ -0,0 +1,109 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from auditlog.models import LogEntry
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from accounts.serializers import (
+    LogsSerializer,
+    ProfileSerializer,
+    UserDeviceSerializer,
+    UserSerializer,
+)
+from core.helpers.row_renderer import (
+    compile_row_renderer,
+    get_row_renderer,
+    row_renderer_cache,
+)
+from core.models import UserDevice
+
+User = get_user_model()
+
+
+def request_context(query=""):
+    return {"request": Request(APIRequestFactory().get(f"/?{query}"))}
+
+
+class RowRendererTest(TestCase):
+    def setUp(self):
+        row_renderer_cache.clear()
+        self.user = User.objects.create_user(
+            email="user@test.com", password="password", phone_number="+905000000001"
+        )
+        LogEntry.objects.create(
+            actor=self.user,
+            content_type=ContentType.objects.get_for_model(User),
+            object_pk=str(self.user.pk),
+            object_id=self.user.pk,
+            object_repr=str(self.user),
+            action=LogEntry.Action.UPDATE,
+            changes='{"email": ["old@test.com", "user@test.com"]}',
+            remote_addr="127.0.0.1",
+        )
+        UserDevice.objects.create(
+            user=self.user, user_agent="Mozilla/5.0", ip_address="10.0.0.1"
+        )
+
+    def assertRendersLikeSerializer(self, serializer_class, queryset, query=""):
+        context = request_context(query)
+        renderer = get_row_renderer(serializer_class, context)
+        self.assertIsNotNone(renderer)
+        self.assertEqual(
+            renderer.render_rows(renderer.values(queryset)),
+            serializer_class(queryset, many=True, context=context).data,
+        )
+
+    def test_logs(self):
+        self.assertRendersLikeSerializer(LogsSerializer, LogEntry.objects.all())
+
+    @override_settings(TIME_ZONE="Europe/Istanbul")
+    def test_devices_follow_relations(self):
+        self.assertRendersLikeSerializer(UserDeviceSerializer, UserDevice.objects.all())
+
+    def test_requested_plain_fields(self):
+        self.assertRendersLikeSerializer(
+            UserSerializer,
+            User.objects.all(),
+            "fields=id,email,phone_number,date_joined,is_active",
+        )
+
+    def test_falls_back_for_instance_fields(self):
+        # Many-to-many, method and file fields need the model instance
+        self.assertIsNone(get_row_renderer(UserSerializer, request_context()))
+        self.assertIsNone(
+            get_row_renderer(UserSerializer, request_context("fields=id,groups"))
+        )
+        self.assertIsNone(get_row_renderer(ProfileSerializer, request_context()))
+        self.assertIsNotNone(
+            get_row_renderer(ProfileSerializer, request_context("fields=id,user,city"))
+        )
+
+    def test_falls_back_without_readable_fields(self):
+        # The password is write only, nothing is left to select
+        self.assertIsNone(
+            get_row_renderer(UserSerializer, request_context("fields=password"))
+        )
+
+    def test_compiled_once_per_field_set(self):
+        get_row_renderer(LogsSerializer, request_context())
+        get_row_renderer(LogsSerializer, request_context("fields=id"))
+        get_row_renderer(LogsSerializer, request_context())
+        self.assertEqual(row_renderer_cache.stats()["hits"], 1)
+        self.assertEqual(len(row_renderer_cache), 2)
+
+    def test_renderer_does_not_keep_the_request(self):
+        renderer = compile_row_renderer(LogsSerializer(context=request_context()))
+        self.assertTrue(
+            all(field is None or field.parent is None for field in renderer.fields)
+        )
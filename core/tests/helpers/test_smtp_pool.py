@@ -0,0 +1,91 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import socket
+
+from django.test import SimpleTestCase, override_settings
+
+from core.helpers.email_utils import EmailHelper
+from core.helpers.fake_smtp import SMTPSink
+from core.helpers.smtp_pool import EmailConnectionPool, email_pool
+
+
+class EmailConnectionPoolTest(SimpleTestCase):
+    def setUp(self):
+        self.sink = SMTPSink().start()
+        self.settings_override = override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=self.sink.port,
+            EMAIL_HOST_USER="noreply@test.com",
+            EMAIL_HOST_PASSWORD="",
+            EMAIL_USE_TLS=False,
+        )
+        self.settings_override.enable()
+        email_pool.close_all()
+
+    def tearDown(self):
+        email_pool.close_all()
+        self.settings_override.disable()
+        self.sink.stop()
+
+    def test_batch_uses_one_connection(self):
+        helper = EmailHelper("Reset Password", "emails/password_reset.html")
+        sent = helper.send_messages([f"user{i}@test.com" for i in range(5)])
+
+        self.assertEqual(sent, 5)
+        self.assertEqual(self.sink.messages, 5)
+        self.assertEqual(self.sink.connections, 1)
+
+    def test_connections_are_reused_across_sends(self):
+        created, reused = email_pool.created, email_pool.reused
+        helper = EmailHelper("Reset Password", "emails/password_reset.html")
+        helper.send_email("a@test.com")
+        helper.send_email("b@test.com")
+
+        self.assertEqual(self.sink.messages, 2)
+        self.assertEqual(self.sink.connections, 1)
+        self.assertEqual(email_pool.created - created, 1)
+        self.assertEqual(email_pool.reused - reused, 1)
+
+    def test_idle_connections_expire(self):
+        pool = EmailConnectionPool(idle_timeout=-1)
+        with pool.connection():
+            pass
+        with pool.connection():
+            pass
+        pool.close_all()
+
+        self.assertEqual(pool.created, 2)
+        self.assertEqual(pool.reused, 0)
+
+    def test_broken_connections_are_replaced(self):
+        pool = EmailConnectionPool()
+        pool.health_check_after = 0
+        with pool.connection() as connection:
+            broken = connection
+        # Simulate the server dropping the idle session
+        broken.connection.sock.shutdown(socket.SHUT_RDWR)
+
+        with pool.connection() as connection:
+            self.assertIsNot(connection, broken)
+            self.assertEqual(connection.connection.noop()[0], 250)
+        pool.close_all()
+        self.assertEqual(pool.created, 2)
+
+    def test_pool_is_bounded(self):
+        pool = EmailConnectionPool(max_size=1)
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        pool.release(second)
+
+        self.assertEqual(len(pool._idle), 1)
+        self.assertIsNone(second.connection)
+        pool.close_all()
@@ -0,0 +1,168 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django_rest_passwordreset.models import ResetPasswordToken
+from django_rest_passwordreset.signals import reset_password_token_created
+from two_factor.plugins.phonenumber.models import PhoneDevice
+
+from authentication.models import CustomEmailDevice
+
+from core.helpers.email_utils import EmailHelper
+from core.helpers.task_queue import Worker, enqueue, task
+from core.models import DeadLetterTask, Task
+
+User = get_user_model()
+calls = []
+
+
+@task
+def record(value, suffix=""):
+    calls.append(f"{value}{suffix}")
+
+
+@task(max_attempts=2)
+def explode():
+    raise RuntimeError("boom")
+
+
+class TaskQueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+        self.worker = Worker(poll_interval=0)
+
+    def test_delay_queues_and_worker_runs(self):
+        record.delay("a", suffix="!")
+        self.assertEqual(calls, [])
+        self.assertEqual(
+            Task.objects.get().payload, {"args": ["a"], "kwargs": {"suffix": "!"}}
+        )
+
+        self.assertEqual(self.worker.run_pending(), 1)
+        self.assertEqual(calls, ["a!"])
+        self.assertFalse(Task.objects.exists())
+
+    def test_future_tasks_wait(self):
+        enqueue(
+            record.task_name, args=["later"], run_at=timezone.now() + timedelta(hours=1)
+        )
+
+        self.assertEqual(self.worker.run_pending(), 0)
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_retries_with_backoff_then_dead_letters(self):
+        explode.delay()
+
+        self.assertEqual(self.worker.run_pending(), 1)
+        task_row = Task.objects.get()
+        self.assertEqual(task_row.attempts, 1)
+        self.assertIn("RuntimeError: boom", task_row.last_error)
+        self.assertGreaterEqual(task_row.run_at, timezone.now() + timedelta(seconds=9))
+
+        Task.objects.update(run_at=timezone.now())
+        self.worker.run_pending()
+        self.assertFalse(Task.objects.exists())
+        dead = DeadLetterTask.objects.get()
+        self.assertEqual((dead.name, dead.attempts), (explode.task_name, 2))
+
+    def test_unregistered_tasks_are_not_run(self):
+        Task.objects.create(name="os.system", payload={"args": ["true"], "kwargs": {}})
+        self.worker.run_pending()
+        self.assertIn("KeyError", Task.objects.get().last_error)
+
+    @override_settings(TASK_QUEUE={"EAGER": True})
+    def test_eager_mode(self):
+        record.delay("now")
+        self.assertEqual(calls, ["now"])
+        self.assertFalse(Task.objects.exists())
+
+    def test_queued_email_is_sent_by_worker(self):
+        EmailHelper(
+            "Reset Password",
+            "emails/password_reset.html",
+            {"reset_password_url": "http://localhost/reset/"},
+        ).queue_email("testuser@test.com")
+        self.assertEqual(len(mail.outbox), 0)
+
+        with self.settings(EMAIL_HOST_USER="noreply@test.com"):
+            call_command("runworker", "--burst", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["testuser@test.com"])
+
+    @patch("authentication.gateways.CustomTwilioGateWay.deliver_sms")
+    def test_sms_is_delivered_by_worker(self, mock_deliver_sms):
+        from authentication.gateways import CustomTwilioGateWay
+
+        user = User.objects.create_user(
+            email="testuser@test.com", password="testpass", phone_number="+905000000000"
+        )
+        device = PhoneDevice.objects.create(
+            user=user, name="sms", number=user.phone_number, method="sms"
+        )
+        with patch("authentication.gateways.Twilio.__init__", return_value=None):
+            CustomTwilioGateWay().send_sms(device, "123456")
+        mock_deliver_sms.assert_not_called()
+
+        self.worker.run_pending()
+        mock_deliver_sms.assert_called_once()
+        self.assertEqual(mock_deliver_sms.call_args.args[0], "+905000000000")
+
+
+class SecretPayloadTest(TestCase):
+    """
+    Mail carrying a secret only queues the pk of the row holding it.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="testuser@test.com", password="testpass", phone_number="+905000000000"
+        )
+        self.settings_override = override_settings(EMAIL_HOST_USER="noreply@test.com")
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def assert_payload_is_pk(self, pk):
+        self.assertEqual(Task.objects.get().payload, {"args": [pk], "kwargs": {}})
+
+    def test_otp_email(self):
+        device = CustomEmailDevice.objects.create(user=self.user, name="email")
+        device.generate_challenge()
+        self.assert_payload_is_pk(device.pk)
+
+        Worker().run_pending()
+        device.refresh_from_db()
+        self.assertIn(device.token, mail.outbox[0].body)
+
+    def test_expired_otp_email_is_not_sent(self):
+        device = CustomEmailDevice.objects.create(user=self.user, name="email")
+        device.generate_challenge()
+        CustomEmailDevice.objects.update(valid_until=timezone.now())
+
+        Worker().run_pending()
+        self.assertEqual(mail.outbox, [])
+        self.assertFalse(Task.objects.exists())
+
+    def test_password_reset_email(self):
+        token = ResetPasswordToken.objects.create(user=self.user)
+        reset_password_token_created.send(
+            sender=None, instance=None, reset_password_token=token
+        )
+        self.assert_payload_is_pk(token.pk)
+
+        Worker().run_pending()
+        self.assertIn(token.key, mail.outbox[0].body)
@@ -0,0 +1,99 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+from core.helpers.device_fingerprint import get_device_fingerprint
+
+
+class DeviceFingerprintBackfillTest(TransactionTestCase):
+    before = [("core", "0005_user_agent_strings")]
+    after = [("core", "0007_remove_userdevice_user_agent")]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_backfill(self):
+        apps = self.migrate(self.before)
+        User = apps.get_model("core", "User")
+        UserDevice = apps.get_model("core", "UserDevice")
+        users = [
+            User.objects.create(
+                email=f"user{i}@test.com", phone_number=f"+90500000000{i}"
+            )
+            for i in range(3)
+        ]
+        for index, user in enumerate(users):
+            UserDevice.objects.create(
+                user=user,
+                user_agent="Firefox 120 / Linux / Other",
+                ip_address="10.0.0.1",
+            )
+            UserDevice.objects.create(
+                user=user,
+                user_agent=f"Safari 17.{index} / iOS / iPhone",
+                ip_address="10.0.0.2",
+            )
+        # Only differs from the first device by whitespace
+        UserDevice.objects.create(
+            user=users[0],
+            user_agent="Firefox 120 /  Linux / Other",
+            ip_address="10.0.0.1",
+        )
+
+        apps = self.migrate(self.after)
+        UserAgentString = apps.get_model("core", "UserAgentString")
+        UserDevice = apps.get_model("core", "UserDevice")
+
+        self.assertEqual(UserAgentString.objects.count(), 4)
+        self.assertEqual(UserDevice.objects.count(), 6)
+        device = UserDevice.objects.get(
+            user_id=users[1].pk,
+            fingerprint=get_device_fingerprint(
+                "Safari 17.1 / iOS / iPhone", "10.0.0.2"
+            ),
+        )
+        self.assertEqual(device.user_agent_string.value, "Safari 17.1 / iOS / iPhone")
+
+    def test_reverse(self):
+        apps = self.migrate(self.before)
+        User = apps.get_model("core", "User")
+        UserDevice = apps.get_model("core", "UserDevice")
+        for index in range(2):
+            user = User.objects.create(
+                email=f"user{index}@test.com", phone_number=f"+90500000000{index}"
+            )
+            # Same IP address, told apart by the user agent only
+            for browser in ("Firefox 120", "Safari 17"):
+                UserDevice.objects.create(
+                    user=user, user_agent=f"{browser} / Linux", ip_address="10.0.0.1"
+                )
+
+        self.migrate(self.after)
+        apps = self.migrate(self.before)
+        UserDevice = apps.get_model("core", "UserDevice")
+
+        self.assertEqual(
+            sorted(UserDevice.objects.values_list("user__email", "user_agent")),
+            [
+                ("user0@test.com", "Firefox 120 / Linux"),
+                ("user0@test.com", "Safari 17 / Linux"),
+                ("user1@test.com", "Firefox 120 / Linux"),
+                ("user1@test.com", "Safari 17 / Linux"),
+            ],
+        )
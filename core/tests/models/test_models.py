@@ -13,7 +13,8 @@ from django.contrib.auth import get_user_model
 from django.db.utils import IntegrityError
 from django.utils import timezone
 from datetime import timedelta
-from core.models import UserDevice, ExpiringToken
+from core.helpers.device_fingerprint import get_device_fingerprint
+from core.models import UserAgentString, UserDevice, ExpiringToken
 
 User = get_user_model()
 
@@ -74,6 +75,29 @@ class UserDeviceModelTest(TestCase):
                 user=self.user, user_agent="test_agent", ip_address="127.0.0.1"
             )
 
+    def test_user_agents_are_deduplicated(self):
+        other_user = User.objects.create_user(
+            email="other@test.com", password="testpass", phone_number="+905000000001"
+        )
+        device = UserDevice.objects.create(
+            user=other_user, user_agent="  test_agent ", ip_address="127.0.0.2"
+        )
+
+        self.assertEqual(UserAgentString.objects.count(), 1)
+        self.assertEqual(device.user_agent_string_id, self.device.user_agent_string_id)
+        self.assertEqual(UserDevice.objects.get(pk=device.pk).user_agent, "test_agent")
+
+    def test_fingerprint_lookup(self):
+        fingerprint = get_device_fingerprint("test_agent", "127.0.0.1")
+        self.assertEqual(len(fingerprint), 32)
+        self.assertEqual(self.device.fingerprint, fingerprint)
+        self.assertEqual(
+            UserDevice.objects.get(user=self.user, fingerprint=fingerprint), self.device
+        )
+        self.assertNotEqual(
+            get_device_fingerprint("test_agent", "127.0.0.2"), fingerprint
+        )
+
 
 class ExpiringTokenModelTest(TestCase):
     def setUp(self):
@@ -0,0 +1,133 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import csv
+import io
+import json
+
+from auditlog.models import LogEntry
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.views import UsersViewSet
+
+User = get_user_model()
+
+
+class ExportTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            email="admin@test.com",
+            password="testpassword",
+            phone_number="+905000000000",
+            is_superuser=True,
+        )
+        self.group = Group.objects.create(name="staff")
+        for index in range(4):
+            user = User.objects.create_user(
+                email=f"user{index}@test.com",
+                password="testpassword",
+                phone_number=f"+90500000001{index}",
+            )
+            user.groups.add(self.group)
+        self.login(self.admin)
+
+    def login(self, user):
+        refresh = RefreshToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+    def export(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_csv_with_fields_and_filters(self):
+        response, content = self.export(
+            reverse("accounts:users-export"), fields="id,email", search="user"
+        )
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn('filename="users.csv"', response["Content-Disposition"])
+
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(
+            sorted(row["email"] for row in rows),
+            [f"user{index}@test.com" for index in range(4)],
+        )
+        self.assertEqual(set(rows[0]), {"id", "email"})
+
+    def test_ndjson_through_serializer(self):
+        _, content = self.export(
+            reverse("accounts:users-export"),
+            fields="email,groups,user_permissions",
+            export_format="ndjson",
+        )
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(len(rows), 5)
+        user = next(row for row in rows if row["email"] == "user0@test.com")
+        self.assertEqual(
+            user,
+            {
+                "email": "user0@test.com",
+                "groups": [self.group.pk],
+                "user_permissions": [],
+            },
+        )
+
+    def test_reads_in_chunks(self):
+        UsersViewSet.export_chunk_size = 2
+        self.addCleanup(delattr, UsersViewSet, "export_chunk_size")
+
+        with CaptureQueriesContext(connection) as queries:
+            _, content = self.export(
+                reverse("accounts:users-export"),
+                fields="id,groups",
+                export_format="ndjson",
+            )
+        self.assertEqual(len(content.splitlines()), 5)
+        group_queries = [
+            query
+            for query in queries.captured_queries
+            if 'FROM "auth_group"' in query["sql"]
+        ]
+        # Groups are prefetched once per chunk of 2 users
+        self.assertEqual(len(group_queries), 3)
+
+    def test_logs(self):
+        LogEntry.objects.log_create(
+            self.admin, action=LogEntry.Action.UPDATE, changes='{"a": [1, 2]}'
+        )
+        expected = LogEntry.objects.count()
+        _, content = self.export(
+            reverse("accounts:logs-export"), export_format="ndjson"
+        )
+        self.assertEqual(len(content.splitlines()), expected)
+
+    def test_invalid_format(self):
+        response = self.client.get(
+            reverse("accounts:users-export"), {"export_format": "xml"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_needs_list_permission(self):
+        user = User.objects.get(email="user0@test.com")
+        self.login(user)
+        response = self.client.get(reverse("accounts:users-export"))
+        self.assertEqual(response.status_code, 403)
+
+        user.user_permissions.add(Permission.objects.get(codename="view_user"))
+        self.export(reverse("accounts:users-export"))
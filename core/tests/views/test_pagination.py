@@ -0,0 +1,174 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from datetime import timedelta
+
+from auditlog.models import LogEntry
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+from rest_framework.utils.urls import remove_query_param
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.views import LogsViewSet, UsersViewSet
+
+User = get_user_model()
+
+
+class KeysetPaginationTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="admin@test.com",
+            password="testpassword",
+            phone_number="+905000000000",
+            is_superuser=True,
+        )
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+        content_type = ContentType.objects.get_for_model(User)
+        now = timezone.now()
+        LogEntry.objects.all().delete()
+        # Pairs of entries sharing a timestamp, tied on the first ordering field
+        LogEntry.objects.bulk_create(
+            LogEntry(
+                content_type=content_type,
+                object_pk=str(index),
+                object_id=index,
+                object_repr=f"entry {index}",
+                action=LogEntry.Action.UPDATE,
+                actor=self.user,
+                timestamp=now - timedelta(seconds=index // 2),
+            )
+            for index in range(7)
+        )
+        self.expected = list(
+            LogEntry.objects.order_by("-timestamp", "-id").values_list("id", flat=True)
+        )
+        self.url = reverse("accounts:logs-list")
+
+    def walk(self, url, params=None, key="next"):
+        ids = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            ids.append([row["id"] for row in response.data["results"]])
+            if not response.data[key]:
+                return ids, response
+            response = self.client.get(response.data[key])
+
+    def test_walks_forward_and_back(self):
+        pages, last = self.walk(self.url, {"pagination": "cursor", "page_size": 3})
+        self.assertEqual(
+            pages, [self.expected[0:3], self.expected[3:6], self.expected[6:]]
+        )
+
+        back, first = self.walk(last.data["previous"], key="previous")
+        self.assertEqual(back, [self.expected[3:6], self.expected[0:3]])
+        self.assertIsNone(first.data["previous"])
+
+    def test_cursor_implies_cursor_mode_and_keeps_fields(self):
+        response = self.client.get(
+            self.url, {"pagination": "cursor", "page_size": 2, "fields": "id"}
+        )
+        response = self.client.get(
+            remove_query_param(response.data["next"], "pagination")
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["results"], [{"id": pk} for pk in self.expected[2:4]]
+        )
+
+    def test_no_count_or_offset(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.walk(self.url, {"pagination": "cursor", "page_size": 3})
+        sql = " ".join(query["sql"] for query in queries.captured_queries).upper()
+        self.assertNotIn("COUNT(", sql)
+        self.assertNotIn("OFFSET", sql)
+
+    def test_tampered_cursor(self):
+        response = self.client.get(self.url, {"pagination": "cursor", "page_size": 3})
+        cursor = response.data["next"].split("cursor=")[1].split("&")[0]
+        response = self.client.get(self.url, {"cursor": cursor[:-2] + "xx"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_size_validation(self):
+        response = self.client.get(self.url, {"pagination": "cursor", "page_size": 101})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.url, {"pagination": "offset"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_page_mode_by_default(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["count"], len(self.expected))
+
+    def test_viewset_default(self):
+        LogsViewSet.pagination_mode = "cursor"
+        self.addCleanup(delattr, LogsViewSet, "pagination_mode")
+        response = self.client.get(self.url, {"page_size": 3})
+        self.assertNotIn("count", response.data)
+        self.assertEqual(
+            [row["id"] for row in response.data["results"]], self.expected[:3]
+        )
+
+    def test_users_by_id(self):
+        for index in range(3):
+            User.objects.create_user(
+                email=f"user{index}@test.com",
+                password="testpassword",
+                phone_number=f"+90500000001{index}",
+            )
+        expected = list(User.objects.order_by("-id").values_list("id", flat=True))
+        pages, _ = self.walk(
+            reverse("accounts:users-list"), {"pagination": "cursor", "page_size": 2}
+        )
+        self.assertEqual(sum(pages, []), expected)
+
+
+class CountStrategyTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="admin@test.com",
+            password="testpassword",
+            phone_number="+905000000000",
+            is_superuser=True,
+        )
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        for index in range(3):
+            User.objects.create_user(
+                email=f"user{index}@test.com",
+                password="testpassword",
+                phone_number=f"+90500000001{index}",
+            )
+        self.url = reverse("accounts:users-list")
+
+    def test_names_the_strategy(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual(response.data["count_strategy"], "exact")
+
+    def test_view_strategy(self):
+        UsersViewSet.count_strategy = "capped"
+        UsersViewSet.count_options = {"CAP": 2}
+        self.addCleanup(delattr, UsersViewSet, "count_strategy")
+        self.addCleanup(delattr, UsersViewSet, "count_options")
+
+        response = self.client.get(self.url, {"page_size": 1})
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(response.data["count_strategy"], "capped")
+        self.assertIsNotNone(response.data["next"])
@@ -0,0 +1,151 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.serializers import UserDeviceSerializer, UserSerializer
+from core.helpers.query_planner import apply_query_plan, plan_queryset
+from core.models import UserDevice
+
+User = get_user_model()
+
+
+class PlanQuerysetTest(TestCase):
+    def test_columns_and_method_fields(self):
+        fields = UserSerializer().fields
+        plan = plan_queryset(
+            User, [fields["email"], fields["user_permissions"], fields["password"]]
+        )
+        self.assertEqual(plan.only, {"id", "email"})
+        self.assertFalse(plan.select_related)
+        self.assertFalse(plan.prefetch_related)
+
+    def test_many_to_many_is_prefetched(self):
+        plan = plan_queryset(User, [UserSerializer().fields["groups"]])
+        self.assertEqual(plan.only, {"id"})
+        self.assertEqual(list(plan.prefetch_related), ["groups"])
+
+    def test_related_attribute_is_joined(self):
+        fields = UserDeviceSerializer().fields
+        plan = plan_queryset(UserDevice, [fields["user_agent"], fields["user"]])
+        self.assertEqual(plan.only, {"id", "user_agent_string__value", "user"})
+        self.assertEqual(plan.select_related, {"user_agent_string"})
+
+    def test_related_instances_are_joined(self):
+        class DeviceSerializer(serializers.ModelSerializer):
+            user = serializers.StringRelatedField()
+
+            class Meta:
+                model = UserDevice
+                fields = ["id", "user"]
+
+        class GroupsSerializer(serializers.ModelSerializer):
+            groups = serializers.SlugRelatedField(
+                slug_field="name", many=True, read_only=True
+            )
+
+            class Meta:
+                model = User
+                fields = ["id", "groups"]
+
+        for index in range(3):
+            user = User.objects.create_user(
+                email=f"user{index}@test.com", phone_number=f"+90500000000{index}"
+            )
+            user.groups.add(Group.objects.create(name=f"group{index}"))
+            UserDevice.objects.create(
+                user=user, user_agent="Mozilla/5.0", ip_address="10.0.0.1"
+            )
+
+        plan = plan_queryset(UserDevice, DeviceSerializer().fields.values())
+        self.assertEqual(plan.select_related, {"user"})
+        queryset = apply_query_plan(UserDevice.objects.all(), plan)
+        with self.assertNumQueries(1):
+            self.assertEqual(len(DeviceSerializer(queryset, many=True).data), 3)
+
+        plan = plan_queryset(User, GroupsSerializer().fields.values())
+        queryset = apply_query_plan(User.objects.all(), plan)
+        with self.assertNumQueries(2):
+            data = GroupsSerializer(queryset, many=True).data
+        self.assertEqual(
+            sorted(row["groups"] for row in data), [["group0"], ["group1"], ["group2"]]
+        )
+
+    def test_nested_serializer_needs_whole_instance(self):
+        class DeviceSerializer(serializers.ModelSerializer):
+            user = UserSerializer()
+
+            class Meta:
+                model = UserDevice
+                fields = ["id", "user"]
+
+        self.assertIsNone(plan_queryset(UserDevice, DeviceSerializer().fields.values()))
+
+    def test_non_model_source_needs_whole_instance(self):
+        field = serializers.CharField(source="get_full_name")
+        field.bind("full_name", serializers.Serializer())
+        self.assertIsNone(plan_queryset(User, [field]))
+
+
+class SparseFieldsetQueryTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="testuser@test.com",
+            password="testpassword",
+            phone_number="+905000000000",
+            is_superuser=True,
+        )
+        self.group = Group.objects.create(name="testgroup")
+        self.user.groups.add(self.group)
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+        self.url = reverse("accounts:users-list")
+
+    def get(self, fields):
+        # Warm up the per-process caches (authenticated user, content types)
+        self.client.get(self.url, {"fields": fields})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {"fields": fields})
+        self.assertEqual(response.status_code, 200)
+        return response.data["results"], queries
+
+    def user_queries(self, queries):
+        table = User._meta.db_table
+        return [
+            query["sql"]
+            for query in queries.captured_queries
+            if f'FROM "{table}"' in query["sql"] and "COUNT(" not in query["sql"]
+        ]
+
+    def test_narrow_select(self):
+        results, queries = self.get("id,email")
+        self.assertEqual(results, [{"id": self.user.pk, "email": self.user.email}])
+
+        select = self.user_queries(queries)[-1]
+        self.assertIn('"email"', select)
+        self.assertNotIn('"phone_number"', select)
+        self.assertNotIn('"password"', select)
+
+        # No permission, device or group lookups for fields not asked for
+        _, full = self.get("")
+        self.assertLess(len(queries), len(full))
+
+    def test_many_to_many_field(self):
+        results, _ = self.get("id,groups")
+        self.assertEqual(results, [{"id": self.user.pk, "groups": [self.group.pk]}])
@@ -0,0 +1,152 @@
+# Project: drf-internal-cookiecutter
+#       |\      _,,,---,,_
+# ZZZzz /,`.-'`'    -.  ;-;;,_
+#      |,4-  ) )-,_. ,\ (  `'-'
+#     '---''(_/--'  `-'\_)
+#           @Rakanhf
+#           Rakan Farhouda
+#
+
+
+import datetime
+import io
+import json
+import unittest
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.renderers import (
+    MessagePackParser,
+    MessagePackRenderer,
+    ORJSONParser,
+    ORJSONRenderer,
+    msgpack,
+)
+
+User = get_user_model()
+
+PAYLOAD = {
+    "id": 1,
+    "email": "user@test.com",
+    "joined": datetime.datetime(2024, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc),
+    "balance": Decimal("10.50"),
+    "token": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "detail": gettext_lazy("Not found."),
+    "groups": (1, 2),
+    3: "non string key",
+    "name": "Rakan Farhouda ü",
+}
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    def test_matches_stock_renderer(self):
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(PAYLOAD)),
+            json.loads(JSONRenderer().render(PAYLOAD)),
+        )
+
+    def test_escapes_line_terminators(self):
+        data = {"text": "a\u2028b\u2029c"}
+        rendered = ORJSONRenderer().render(data)
+        self.assertEqual(rendered, b'{"text":"a\\u2028b\\u2029c"}')
+        self.assertEqual(rendered, JSONRenderer().render(data))
+
+    def test_indent(self):
+        rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=2", {})
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+        # orjson only indents by 2, other widths are left to DRF's renderer
+        rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=4", {})
+        self.assertEqual(rendered, b'{\n    "a": 1\n}')
+        rendered = ORJSONRenderer().render({"a": 1}, None, {"indent": 4})
+        self.assertEqual(rendered, b'{\n    "a": 1\n}')
+
+    def test_rejects_non_finite_floats(self):
+        for value in (float("nan"), float("inf"), -float("inf")):
+            with self.assertRaises(ValueError):
+                ORJSONRenderer().render({"results": [{"score": value}], "next": None})
+
+        renderer = ORJSONRenderer()
+        renderer.strict = False
+        self.assertEqual(renderer.render([float("nan")]), b"[NaN]")
+        self.assertEqual(ORJSONRenderer().render([1.5, None]), b"[1.5,null]")
+
+    def test_falls_back_for_big_integers(self):
+        self.assertEqual(ORJSONRenderer().render({"n": 2**70}), b'{"n":%d}' % 2**70)
+
+    def test_parser(self):
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(b'{"a": [1, "\xc3\xbc"]}')), {"a": [1, "ü"]}
+        )
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b"{not json"))
+
+
+@unittest.skipUnless(msgpack, "msgpack is not installed")
+class MessagePackTest(SimpleTestCase):
+    def test_round_trip(self):
+        rendered = MessagePackRenderer().render(
+            {key: value for key, value in PAYLOAD.items() if key != 3}
+        )
+        data = MessagePackParser().parse(io.BytesIO(rendered))
+        self.assertEqual(data["joined"], "2024-01-01T12:00:00.123456Z")
+        self.assertEqual(data["detail"], "Not found.")
+        self.assertEqual(data["groups"], [1, 2])
+
+    def test_parse_error(self):
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(io.BytesIO(b"\xc1"))
+
+
+class NegotiationTest(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email="admin@test.com",
+            password="testpassword",
+            phone_number="+905000000000",
+            is_superuser=True,
+        )
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+
+    def test_json_responses(self):
+        response = self.client.get(reverse("accounts:users-list"))
+        self.assertIsInstance(response.accepted_renderer, ORJSONRenderer)
+        self.assertEqual(json.loads(response.content)["count"], 1)
+
+    def test_standardized_errors(self):
+        response = self.client.get(reverse("accounts:users-detail", args=[0]))
+        self.assertEqual(response.status_code, 404)
+        body = json.loads(response.content)
+        self.assertEqual(body["type"], "client_error")
+        self.assertEqual(body["errors"][0]["code"], "not_found")
+
+    def test_invalid_json_body(self):
+        response = self.client.post(
+            reverse("authentication:token_obtain_pair"),
+            data=b"{not json",
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            json.loads(response.content)["errors"][0]["code"], "parse_error"
+        )
+
+    @unittest.skipUnless(msgpack, "msgpack is not installed")
+    def test_msgpack(self):
+        response = self.client.get(
+            reverse("accounts:users-list"), HTTP_ACCEPT="application/msgpack"
+        )
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content)["count"], 1)
@@ -8,15 +8,120 @@
 #
 
 
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import OrderingFilter, SearchFilter
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from authentication.backends import JWTAuthentication
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiTypes
+from core.helpers.export import EXPORT_FORMATS, chunked
+from core.helpers.query_planner import apply_query_plan, plan_queryset
+from core.helpers.row_renderer import get_row_renderer
 from core.pagination import GlobalPagination
-from core.permissions import DynamicAccessPermission
+from core.permissions import LIST_ACTIONS, DynamicAccessPermission
+
+
+class CompiledListMixin:
+    """
+    Renders list pages through a compiled row renderer when every requested
+    field is a plain column, reading `.values_list()` rows instead of
+    building model instances. Other field sets go through the serializer.
+    """
+
+    def get_row_renderer(self):
+        if not hasattr(self, "_row_renderer"):
+            self._row_renderer = get_row_renderer(
+                self.get_serializer_class(), self.get_serializer_context()
+            )
+        return self._row_renderer
+
+    def list(self, request, *args, **kwargs):
+        renderer = self.get_row_renderer()
+        if renderer is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = renderer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(renderer.render_rows(page))
+        return Response(renderer.render_rows(queryset))
+
+
+class ExportMixin:
+    """
+    Adds an `export` action streaming every row of the filtered list as CSV
+    or NDJSON (`?export_format=`), honouring `?fields=`. Rows are read with
+    `.iterator()` in chunks of `export_chunk_size`, server-side cursors where
+    the database has them, so memory stays flat whatever the result size.
+    """
+
+    export_chunk_size = getattr(settings, "EXPORT_CHUNK_SIZE", 2000)
+
+    def iter_export_chunks(self, queryset):
+        """
+        Yields lists of rendered rows, through the compiled row renderer when
+        there is one, otherwise serializing a chunk of instances at a time so
+        list serializers can batch their lookups.
+        """
+        renderer = self.get_row_renderer()
+        if renderer is not None:
+            rows = renderer.values(queryset).iterator(chunk_size=self.export_chunk_size)
+            yield from chunked(renderer.iter_rows(rows), self.export_chunk_size)
+            return
+
+        instances = queryset.iterator(chunk_size=self.export_chunk_size)
+        for chunk in chunked(instances, self.export_chunk_size):
+            yield self.get_serializer(chunk, many=True).data
+
+    def get_export_field_names(self):
+        renderer = self.get_row_renderer()
+        if renderer is not None:
+            return list(renderer.names)
+        fields = self.get_serializer().fields
+        return [name for name, field in fields.items() if not field.write_only]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="export_format",
+                type=OpenApiTypes.STR,
+                enum=list(EXPORT_FORMATS),
+                description="Export format, csv by default",
+                required=False,
+            )
+        ],
+        responses={
+            (200, "text/csv"): OpenApiTypes.STR,
+            (200, "application/x-ndjson"): OpenApiTypes.STR,
+        },
+    )
+    @action(detail=False, methods=["get"])
+    def export(self, request, *args, **kwargs):
+        """
+        Streams the filtered list as CSV or NDJSON.
+        """
+        export_format = request.query_params.get("export_format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                {"detail": f"Export format must be one of {', '.join(EXPORT_FORMATS)}."}
+            )
+        stream, content_type, extension = EXPORT_FORMATS[export_format]
+
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            stream(self.iter_export_chunks(queryset), self.get_export_field_names()),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self.basename}.{extension}"'
+        )
+        return response
 
 
 @extend_schema(
@@ -29,7 +134,7 @@ from core.permissions import DynamicAccessPermission
         )
     ]
 )
-class DynamicFieldsModelViewSet(viewsets.ModelViewSet):
+class DynamicFieldsModelViewSet(ExportMixin, CompiledListMixin, viewsets.ModelViewSet):
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, DynamicAccessPermission]
     filter_backends = [SearchFilter, OrderingFilter, DjangoFilterBackend]
@@ -44,16 +149,16 @@ class DynamicFieldsModelViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
         fields = self.request.query_params.get("fields")
 
-        if fields:
-            requested_fields = set(fields.split(","))
-            valid_fields = {
-                field.name
-                for field in self.serializer_class.Meta.model._meta.get_fields()
-            }
-
-            # Only apply 'only' if there are valid fields requested
-            if requested_fields & valid_fields:
-                queryset = queryset.only(*requested_fields & valid_fields)
+        # Writes keep whole instances, saving a deferred one would only
+        # update the loaded fields. Compiled lists pick their own columns.
+        if (
+            fields
+            and self.request.method in SAFE_METHODS
+            and not (self.action in LIST_ACTIONS and self.get_row_renderer())
+        ):
+            plan = plan_queryset(queryset.model, self.get_serializer().fields.values())
+            if plan is not None:
+                queryset = apply_query_plan(queryset, plan)
 
         return queryset
 
@@ -69,6 +174,8 @@ class DynamicFieldsModelViewSet(viewsets.ModelViewSet):
 
 
 class ListUpdateViewSet(
+    ExportMixin,
+    CompiledListMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
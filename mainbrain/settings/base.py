@@ -7,6 +7,7 @@
 #           Rakan Farhouda
 #
 
+import importlib.util
 import os
 from datetime import timedelta
 from pathlib import Path
@@ -64,8 +65,12 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django.middleware.gzip.GZipMiddleware",
-    "django_user_agents.middleware.UserAgentMiddleware",
+    "core.middleware.UserAgentMiddleware",
 ]
+# Max number of parsed user agents kept per process
+USER_AGENT_CACHE_SIZE = 1024
+# Rows read and streamed at a time by the export endpoints
+EXPORT_CHUNK_SIZE = 2000
 
 ROOT_URLCONF = "mainbrain.urls"
 LOGIN_URL = "two_factor:login"
@@ -93,8 +98,7 @@ REST_FRAMEWORK = {
         "authentication.backends.TemporaryTokenAuthentication",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.UserRateThrottle",
-        "authentication.throttling.LoginThrottle",
+        "authentication.throttling.DefaultRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "user": "9999/minute",
@@ -108,6 +112,41 @@ REST_FRAMEWORK = {
         "rest_framework.filters.OrderingFilter",
     ],
     "DEFAULT_PAGINATION_CLASS": "core.pagination.GlobalPagination",
+    # orjson backed JSON, see core.renderers
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# MessagePack for internal service-to-service callers, negotiated through
+# Accept / Content-Type: application/msgpack when msgpack is installed
+if importlib.util.find_spec("msgpack"):
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].append(
+        "core.renderers.MessagePackRenderer"
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"].append("core.renderers.MessagePackParser")
+
+# Counter based throttles, see authentication.throttling. Point CACHE at a
+# cache shared by all workers (e.g. Redis) for the limits to be global.
+THROTTLING = {
+    "CACHE": "default",
+    "ALGORITHM": "sliding_window",
+}
+
+# How paginated list counts are produced, see core.helpers.count_strategies.
+# Views pick another strategy with `count_strategy`.
+COUNTING = {
+    "STRATEGY": "exact",
+    "ESTIMATE_THRESHOLD": 10000,
+    "CAP": 10000,
+    "CACHE": "default",
+    "CACHE_TIMEOUT": 60,
 }
 
 
@@ -155,6 +194,10 @@ DATABASES = {
 }
 
 AUTH_USER_MODEL = "core.User"
+AUTHENTICATION_BACKENDS = ["authentication.backends.CachedModelBackend"]
+# Seconds a user's effective permissions stay cached, they are also dropped
+# whenever the user's groups or permissions change
+PERMISSION_CACHE_TIMEOUT = 3600
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -170,6 +213,13 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Run password hashing in a dedicated process pool, see core.helpers.password_pool
+PASSWORD_POOL = {
+    "ENABLED": config("PASSWORD_POOL_ENABLED", default=False, cast=bool),
+    "WORKERS": 2,
+    "TIMEOUT": 30,
+}
+
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=3),
@@ -180,7 +230,16 @@ SIMPLE_JWT = {
     "ALGORITHM": "HS256",
     "AUTH_HEADER_TYPES": ("Bearer",),
     "TOKEN_LIFETIME_HOURS": 3,
+    # Max number of verified tokens kept per process by JWTAuthentication
+    "VERIFIED_TOKEN_CACHE_SIZE": 1024,
+    # Seconds a user snapshot stays in the cache for JWT user resolution
+    "USER_CACHE_TIMEOUT": 300,
+    # Embed the user's permissions in access tokens as a bitmask, so
+    # permission checks don't need the cache. Permission changes then apply
+    # once the user's current access token expires.
+    "PERMISSION_CLAIMS": config("JWT_PERMISSION_CLAIMS", default=False, cast=bool),
     "TOKEN_OBTAIN_SERIALIZER": "authentication.serializers.CustomTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "authentication.serializers.CustomTokenRefreshSerializer",
 }
 
 
@@ -200,9 +259,30 @@ DJANGO_REST_PASSWORDRESET_TOKEN_CONFIG = {
 
 RESET_PASSWORD_URL = "http://localhost:3000/auth/reset-password/"
 
+# Background tasks, see core.helpers.task_queue and the runworker command
+TASK_QUEUE = {
+    "EAGER": False,
+    "MAX_ATTEMPTS": 5,
+    "BACKOFF_BASE": 10,
+    "BACKOFF_MAX": 60 * 60,
+    "POLL_INTERVAL": 1,
+    "CONCURRENCY": 4,
+    "POOL": "thread",
+}
+
+# Cleanup of expired credentials, see the reap_credentials command
+CREDENTIAL_REAPER = {
+    "BATCH_SIZE": 1000,
+    "BATCH_PAUSE": 0,
+    "DEVICE_IDLE_DAYS": 90,
+}
+
 # ------------------------ OTP --------------------------
 OTP_EMAIL_TOKEN_VALIDITY = 60 * 10  # 5 minutes
 TOKEN_EXPIRATION_TIME = timedelta(minutes=5)
+# Where temporary 2FA tokens live; use CacheTemporaryTokenStore with a shared cache
+# to keep them out of the database
+TEMPORARY_TOKEN_STORE = "authentication.helpers.token_store.DatabaseTemporaryTokenStore"
 OTP_EMAIL_BODY_TEMPLATE = os.path.join(
     BASE_DIR, "core/templates/emails/auth/email_otp.html"
 )
@@ -223,6 +303,11 @@ EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD")
 EMAIL_PORT = config("EMAIL_PORT", cast=int)
 EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=True, cast=bool)
 DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL")
+# Per-process pool of open SMTP connections, see core.helpers.smtp_pool
+EMAIL_POOL = {
+    "MAX_SIZE": 4,
+    "IDLE_TIMEOUT": 30,
+}
 # ------------------------ Email ------------------------
 
 
@@ -230,6 +315,10 @@ DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL")
 TWILIO_ACCOUNT_SID = config("TWILIO_ACCOUNT_SID")
 TWILIO_AUTH_TOKEN = config("TWILIO_AUTH_TOKEN")
 TWILIO_PHONE_NUMBER = config("TWILIO_PHONE_NUMBER")
+TWILIO_HTTP_TIMEOUT = 10
+# Point at a local fake Twilio server (see the runfaketwilio command) to
+# exercise the SMS path without network access
+TWILIO_API_BASE_URL = config("TWILIO_API_BASE_URL", default="")
 # ------------------------ SMS --------------------------------
 
 STATICFILES_DIRS = [os.path.join(BASE_DIR, "core/static")]